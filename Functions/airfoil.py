@@ -1,52 +1,535 @@
+import os
 import numpy as np
-import plotly.graph_objects as go
 import logging
+from customfunctions import cumulative_arc_length, interp_rows, points_at_arc_length_fractions
+from instrumentation import count, instrumented
 logger = logging.getLogger(__name__)
-logging.basicConfig(filename='airfoil.log',
-                    encoding='utf-8', level=logging.DEBUG)
+
+
+def as_surface_array(points) -> np.ndarray:
+    """Converts a surface given as an (N, 2) array or a list of points into a contiguous (N, 2) float array.
+
+    Args:
+        points: (N, 2) array, list of 2-element points or None
+
+    Returns:
+        np.ndarray: Contiguous (N, 2) float64 array (shape (0, 2) for None or an empty list)
+    """
+    if points is None:
+        return np.empty((0, 2), dtype=np.float64)
+    surface = np.ascontiguousarray(points, dtype=np.float64)
+    if surface.size == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    if surface.ndim != 2 or surface.shape[1] != 2:
+        raise ValueError(f"Surface must have shape (N, 2), got {surface.shape}")
+    return surface
+
+
+class AirfoilFileError(ValueError):
+    """Raised when an airfoil .dat file cannot be parsed"""
+
+
+def _is_coordinate_line(line: str) -> bool:
+    tokens = line.split()
+    if len(tokens) != 2:
+        return False
+    try:
+        float(tokens[0])
+        float(tokens[1])
+    except ValueError:
+        return False
+    return True
+
+
+def read_dat_file(filepath: str) -> tuple[str, np.ndarray]:
+    """Parses a Selig or Lednicer .dat airfoil file into a single (N, 2) array.
+
+    Lednicer files (a point count line followed by the upper and lower surfaces, both running from the leading edge
+    to the trailing edge) are reordered into Selig order: trailing edge over the upper surface to the leading edge and
+    back along the lower surface.
+
+    Args:
+        filepath (str): Path to the .dat file
+
+    Raises:
+        AirfoilFileError: If the file does not contain a valid list of coordinates
+
+    Returns:
+        tuple[str, np.ndarray]: The airfoil name and the (N, 2) points in Selig order
+    """
+    with open(filepath, "r") as file:
+        content = file.read()
+
+    name_line, _, body = content.partition("\n")
+    if _is_coordinate_line(name_line):
+        # Some files omit the name line and start directly with coordinates
+        name_line, body = os.path.splitext(os.path.basename(filepath))[0], content
+
+    try:
+        values = np.array(body.split(), dtype=np.float64)
+    except ValueError as e:
+        raise AirfoilFileError(f"{filepath}: non-numeric coordinate data ({e})") from None
+    if values.size % 2:
+        raise AirfoilFileError(f"{filepath}: odd number of coordinate values ({values.size})")
+    points = values.reshape(-1, 2)
+
+    num_upper, num_lower = points[0] if len(points) else (0.0, 0.0)
+    if num_upper >= 2 and num_lower >= 2 and num_upper.is_integer() and num_lower.is_integer():
+        # Lednicer layout
+        num_upper, num_lower = int(num_upper), int(num_lower)
+        if num_upper + num_lower != len(points) - 1:
+            raise AirfoilFileError(f"{filepath}: Lednicer header declares {num_upper} + {num_lower} points "
+                                   f"but the file contains {len(points) - 1}")
+        upper_surface = points[num_upper:0:-1]
+        lower_surface = points[num_upper+1:]
+        if np.array_equal(upper_surface[-1], lower_surface[0]):
+            lower_surface = lower_surface[1:]
+        points = np.concatenate((upper_surface, lower_surface))
+
+    if len(points) < 3:
+        raise AirfoilFileError(f"{filepath}: at least 3 points are required, found {len(points)}")
+
+    return name_line.strip(), np.ascontiguousarray(points)
+
+
+def split_at_leading_edge(points: np.ndarray, tolerance: float = 1e-9) -> tuple[np.ndarray, np.ndarray]:
+    """Splits Selig-ordered points into upper and lower surfaces at the leading edge.
+
+    The leading edge is the first point whose x coordinate lies within tolerance of the minimum x. It is shared by
+    both surfaces.
+
+    Args:
+        points (np.ndarray): (N, 2) points in Selig order
+        tolerance (float): Tolerance on x when locating the leading edge
+
+    Raises:
+        AirfoilFileError: If the leading edge is at either end of the point list
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Copies of the upper (trailing to leading edge) and lower (leading to trailing
+            edge) surfaces
+    """
+    x = points[:, 0]
+    leading_edge_index = int(np.argmax(x <= x.min() + tolerance))
+    if leading_edge_index == 0 or leading_edge_index == len(points) - 1:
+        raise AirfoilFileError("Leading edge found at an end point, points are not in Selig order")
+
+    return points[:leading_edge_index+1].copy(), points[leading_edge_index:].copy()
+
+
+def surfaces_from_points(points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Splits Selig-ordered points into upper and lower surfaces and pins both trailing edges to (1.0, 0.0).
+
+    Args:
+        points (np.ndarray): (N, 2) points in Selig order, as returned by read_dat_file
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The upper and lower surfaces
+    """
+    upper_surface, lower_surface = split_at_leading_edge(points)
+
+    # Ensure that airfoil end points
+    upper_surface[0] = (1.0, 0.0)
+    lower_surface[-1] = (1.0, 0.0)
+
+    return upper_surface, lower_surface
+
+
+class SectionProperties:
+    """Derived geometry of one airfoil or of a stack of airfoils
+
+    Every attribute carries the batch shape of the surfaces it was computed from as leading dimensions, e.g. area is
+    a float for one airfoil and a (K,) array for a (K, N, 2) morph stack.
+    """
+
+    __slots__ = ("stations", "camber", "thickness", "area", "centroid", "max_thickness", "max_thickness_location",
+                 "max_camber", "max_camber_location")
+
+    def __init__(self, stations, camber, thickness, area, centroid, max_thickness, max_thickness_location, max_camber,
+                 max_camber_location) -> None:
+        self.stations: np.ndarray = stations
+        self.camber: np.ndarray = camber
+        self.thickness: np.ndarray = thickness
+        self.area: np.ndarray = area
+        self.centroid: np.ndarray = centroid
+        self.max_thickness: np.ndarray = max_thickness
+        self.max_thickness_location: np.ndarray = max_thickness_location
+        self.max_camber: np.ndarray = max_camber
+        self.max_camber_location: np.ndarray = max_camber_location
+
+
+def compute_section_properties(upper_surfaces, lower_surfaces, num_stations: int = 101) -> SectionProperties:
+    """Computes camber, thickness, area and centroid of one airfoil or of a stack of airfoils in one pass.
+
+    Camber and thickness are sampled at cosine spaced stations between the leading and trailing edge of each
+    airfoil. Area and centroid are those of the closed polygon formed by both surfaces.
+
+    Args:
+        upper_surfaces (array_like): (N, 2) upper surface or (..., N, 2) stack of upper surfaces
+        lower_surfaces (array_like): (N, 2) lower surface or (..., N, 2) stack of lower surfaces
+        num_stations (int): Number of stations for the camber and thickness distributions
+
+    Returns:
+        SectionProperties: The derived geometry
+    """
+    upper_surfaces = np.asarray(upper_surfaces, dtype=np.float64)
+    lower_surfaces = np.asarray(lower_surfaces, dtype=np.float64)
+    batch_shape = upper_surfaces.shape[:-2]
+    upper = upper_surfaces.reshape(-1, upper_surfaces.shape[-2], 2)
+    lower = lower_surfaces.reshape(-1, lower_surfaces.shape[-2], 2)
+    if len(upper) != len(lower):
+        raise ValueError("Upper and lower surface stacks must have the same batch shape")
+
+    # Shoelace area and centroid of the closed contour
+    contour = np.concatenate((upper, lower), axis=1)
+    x, y = contour[..., 0], contour[..., 1]
+    next_x, next_y = np.roll(x, -1, axis=1), np.roll(y, -1, axis=1)
+    cross = x * next_y - next_x * y
+    signed_area = 0.5 * cross.sum(axis=1)
+    centroid = np.stack((((x + next_x) * cross).sum(axis=1), ((y + next_y) * cross).sum(axis=1)), axis=1)
+    centroid = np.divide(centroid, 6.0 * signed_area[:, None], out=np.zeros_like(centroid),
+                         where=signed_area[:, None] != 0)
+
+    # Camber and thickness distributions at cosine spaced stations
+    leading_edge_x = x.min(axis=1, keepdims=True)
+    trailing_edge_x = x.max(axis=1, keepdims=True)
+    stations = leading_edge_x + (trailing_edge_x - leading_edge_x) * 0.5 * (1.0 - np.cos(np.pi * np.linspace(0.0, 1.0, num_stations)))
+    upper_order = np.argsort(upper[..., 0], axis=1, kind="stable")
+    lower_order = np.argsort(lower[..., 0], axis=1, kind="stable")
+    upper_y = interp_rows(stations, np.take_along_axis(upper[..., 0], upper_order, axis=1),
+                          np.take_along_axis(upper[..., 1], upper_order, axis=1))
+    lower_y = interp_rows(stations, np.take_along_axis(lower[..., 0], lower_order, axis=1),
+                          np.take_along_axis(lower[..., 1], lower_order, axis=1))
+    thickness = upper_y - lower_y
+    camber = 0.5 * (upper_y + lower_y)
+
+    rows = np.arange(len(upper))
+    max_thickness_index = np.argmax(thickness, axis=1)
+    max_camber_index = np.argmax(np.abs(camber), axis=1)
+
+    return SectionProperties(
+        stations=stations.reshape(batch_shape + (num_stations,)),
+        camber=camber.reshape(batch_shape + (num_stations,)),
+        thickness=thickness.reshape(batch_shape + (num_stations,)),
+        area=np.abs(signed_area).reshape(batch_shape),
+        centroid=centroid.reshape(batch_shape + (2,)),
+        max_thickness=thickness[rows, max_thickness_index].reshape(batch_shape),
+        max_thickness_location=stations[rows, max_thickness_index].reshape(batch_shape),
+        max_camber=camber[rows, max_camber_index].reshape(batch_shape),
+        max_camber_location=stations[rows, max_camber_index].reshape(batch_shape),
+    )
+
+
+def _apply_affine_in_place(points: np.ndarray, matrix: np.ndarray) -> None:
+    """Applies a (3, 3) homogeneous 2D transform to (N, 2) points in place.
+
+    Scalar operations on whole columns are several times faster than a (N, 2) @ (2, 2) product, and uniform scaling,
+    the common case, is a single multiply.
+    """
+    (a, b, offset_x), (c, d, offset_y) = matrix[:2]
+    if b == 0.0 and c == 0.0 and a == d:
+        if a != 1.0:
+            points *= a
+    else:
+        x, y = points[:, 0].copy(), points[:, 1]
+        points[:, 0] *= a
+        points[:, 0] += b * y
+        y *= d
+        y += c * x
+    if offset_x:
+        points[:, 0] += offset_x
+    if offset_y:
+        points[:, 1] += offset_y
 
 
 class Airfoil:
-    """A glider airfoil representation"""
+    """A glider airfoil representation
+
+    Each surface is stored as one contiguous (N, 2) float array running from the trailing edge to the leading edge
+    (upper) or from the leading edge to the trailing edge (lower).
+
+    Arc length tables, the query index and section properties are computed on first use and cached. Assigning a surface clears the caches; code that edits
+    surface arrays in place must call invalidate_cache() afterwards.
+
+    scale(), rotate(), translate() and flip() only record a 2D affine matrix, composed with any edits already pending.
+    The points are transformed once, when a surface or anything derived from it is next read, so a chain of edits costs
+    a single matrix application. Arrays the airfoil produced itself are transformed in place; arrays it was given are
+    copied once, so the caller's data (e.g. a view into a morph stack) is never modified.
+    """
+
+    __slots__ = ("airfoil_name", "chord_length", "_upper_surface", "_lower_surface", "_upper_arc_length",
+                 "_lower_arc_length", "_query_index", "_section_properties", "_pending_transform", "_owns_surfaces")
 
     def __init__(self, airfoil_name="Generic Airfoil", chord_length=1.0, upper_surface=None, lower_surface=None) -> None:
         self.airfoil_name: str = airfoil_name
         self.chord_length: float = chord_length
-        self.upper_surface: list[np.ndarray] | None = upper_surface
-        self.lower_surface: list[np.ndarray] | None = lower_surface
+        self._pending_transform: np.ndarray | None = None
+        self._owns_surfaces: bool = False
+        self.upper_surface = upper_surface
+        self.lower_surface = lower_surface
 
-        if self.lower_surface is None:
-            self.lower_surface = []
+    @property
+    def upper_surface(self) -> np.ndarray:
+        """(N, 2) array of upper surface points"""
+        if self._pending_transform is not None:
+            self._apply_pending_transform()
+        return self._upper_surface
 
-        if self.upper_surface is None:
-            self.upper_surface = []
+    @upper_surface.setter
+    def upper_surface(self, points) -> None:
+        if self._pending_transform is not None:
+            # Pending edits belong to the points they were recorded on, not to the new ones
+            self._apply_pending_transform()
+        self._owns_surfaces = False
+        self._upper_surface = as_surface_array(points)
+        self._upper_arc_length = None
+        self._query_index = None
+        self._section_properties = None
 
-    def generate_upper_lower_surfaces(self, filepath: str):
-        try:
-            converted_string_array = self._read_xflr_file(filepath)
+    @property
+    def lower_surface(self) -> np.ndarray:
+        """(N, 2) array of lower surface points"""
+        if self._pending_transform is not None:
+            self._apply_pending_transform()
+        return self._lower_surface
+
+    @lower_surface.setter
+    def lower_surface(self, points) -> None:
+        if self._pending_transform is not None:
+            self._apply_pending_transform()
+        self._owns_surfaces = False
+        self._lower_surface = as_surface_array(points)
+        self._lower_arc_length = None
+        self._query_index = None
+        self._section_properties = None
+
+    @property
+    def upper_surface_list(self) -> list[np.ndarray]:
+        """Compatibility view of the upper surface as a list of per-point arrays"""
+        return list(self.upper_surface)
+
+    @property
+    def lower_surface_list(self) -> list[np.ndarray]:
+        """Compatibility view of the lower surface as a list of per-point arrays"""
+        return list(self.lower_surface)
+
+    @property
+    def upper_arc_length(self) -> np.ndarray:
+        """(N,) cumulative arc length along the upper surface, from the trailing edge"""
+        if self._upper_arc_length is None:
+            self._upper_arc_length = cumulative_arc_length(self.upper_surface)
+        return self._upper_arc_length
+
+    @property
+    def lower_arc_length(self) -> np.ndarray:
+        """(N,) cumulative arc length along the lower surface, from the leading edge"""
+        if self._lower_arc_length is None:
+            self._lower_arc_length = cumulative_arc_length(self.lower_surface)
+        return self._lower_arc_length
+
+    def invalidate_cache(self) -> None:
+        """Clears cached geometry after the surface arrays were edited in place"""
+        self._upper_arc_length = None
+        self._lower_arc_length = None
+        self._query_index = None
+        self._section_properties = None
+
+    @property
+    def pending_transform(self) -> np.ndarray:
+        """(3, 3) homogeneous matrix of the edits recorded but not yet applied to the points"""
+        return np.eye(3) if self._pending_transform is None else self._pending_transform.copy()
+
+    def apply_transform(self, matrix) -> "Airfoil":
+        """Records a 2D affine transform after any pending ones, without touching the points.
+
+        Args:
+            matrix (array_like): (3, 3) homogeneous or (2, 3) affine matrix acting on column vectors (x, y, 1)
+
+        Returns:
+            Airfoil: self, so edits can be chained
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.shape == (2, 3):
+            matrix = np.vstack((matrix, [0.0, 0.0, 1.0]))
+        if matrix.shape != (3, 3):
+            raise ValueError(f"Expected a (3, 3) or (2, 3) affine matrix, got shape {matrix.shape}")
+        self._pending_transform = matrix if self._pending_transform is None else matrix @ self._pending_transform
+        self.invalidate_cache()
+        return self
+
+    def scale(self, factor: float, origin=(0.0, 0.0)) -> "Airfoil":
+        """Records a uniform scaling about origin (the leading edge of a normalised airfoil), updating chord_length."""
+        self.chord_length *= abs(factor)
+        origin_x, origin_y = origin
+        return self.apply_transform([[factor, 0.0, origin_x * (1.0 - factor)],
+                                     [0.0, factor, origin_y * (1.0 - factor)]])
+
+    def rotate(self, angle: float, origin=(0.0, 0.0)) -> "Airfoil":
+        """Records a rotation by angle degrees about origin, positive nose up (clockwise) like rib twist."""
+        theta = np.radians(angle)
+        cos_angle, sin_angle = np.cos(theta), np.sin(theta)
+        origin_x, origin_y = origin
+        return self.apply_transform([[cos_angle, sin_angle, origin_x - cos_angle * origin_x - sin_angle * origin_y],
+                                     [-sin_angle, cos_angle, origin_y + sin_angle * origin_x - cos_angle * origin_y]])
+
+    def translate(self, dx: float, dy: float) -> "Airfoil":
+        """Records a translation."""
+        return self.apply_transform([[1.0, 0.0, dx], [0.0, 1.0, dy]])
+
+    def flip(self, axis: str = "x") -> "Airfoil":
+        """Records a mirror image, "x" across the chord line (y to -y) or "y" across the vertical axis (x to -x).
+
+        The surfaces keep their names and point order, so after flipping across the chord line the upper surface is
+        the one below.
+        """
+        if axis == "x":
+            return self.apply_transform([[1.0, 0.0, 0.0], [0.0, -1.0, 0.0]])
+        if axis == "y":
+            return self.apply_transform([[-1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+        raise ValueError(f"Axis must be 'x' or 'y', got {axis!r}")
+
+    def _apply_pending_transform(self) -> None:
+        matrix, self._pending_transform = self._pending_transform, None
+        if not self._owns_surfaces:
+            # Arrays the airfoil was given may be shared, so they are copied once; later edits reuse the copies
+            self._upper_surface = self._upper_surface.copy()
+            self._lower_surface = self._lower_surface.copy()
+            self._owns_surfaces = True
+        for surface in (self._upper_surface, self._lower_surface):
+            _apply_affine_in_place(surface, matrix)
+
+    @property
+    def query_index(self):
+        """AirfoilQueryIndex over both surfaces, built on first use"""
+        if self._query_index is None:
+            from airfoilquery import AirfoilQueryIndex
+            self._query_index = AirfoilQueryIndex(self.upper_surface, self.lower_surface)
+        return self._query_index
 
-            upper_to_lower_threshold = [i for i, arr in enumerate(
-                converted_string_array) if np.array_equal(arr, np.array([0.0, 0.0]))][0]
-            self.upper_surface = converted_string_array[0:upper_to_lower_threshold+1]
-            self.lower_surface = converted_string_array[upper_to_lower_threshold:]
+    @property
+    def section_properties(self) -> SectionProperties:
+        """Camber, thickness, area and centroid, computed on first use"""
+        if self._section_properties is None:
+            self._section_properties = compute_section_properties(self.upper_surface, self.lower_surface)
+        return self._section_properties
 
-            # Ensure that airfoil end points
-            if not np.array_equal(self.upper_surface[0], np.array([1.0, 0.0])):
-                self.upper_surface[0] = np.array([1.0, 0.0])
+    @property
+    def area(self) -> float:
+        """Cross-sectional area enclosed by the surfaces"""
+        return float(self.section_properties.area)
 
-            if not np.array_equal(self.lower_surface[-1], np.array([1.0, 0.0])):
-                self.lower_surface[-1] = np.array([1.0, 0.0])
+    @property
+    def centroid(self) -> np.ndarray:
+        """(2,) centroid of the cross-sectional area"""
+        return self.section_properties.centroid
 
+    @property
+    def max_thickness(self) -> float:
+        """Largest vertical distance between the surfaces"""
+        return float(self.section_properties.max_thickness)
+
+    @property
+    def max_camber(self) -> float:
+        """Largest deviation of the camber line from y = 0"""
+        return float(self.section_properties.max_camber)
+
+    @property
+    def camber_line(self) -> np.ndarray:
+        """(S, 2) points of the camber line at cosine spaced stations"""
+        properties = self.section_properties
+        return np.stack((properties.stations, properties.camber), axis=1)
+
+    @property
+    def thickness_distribution(self) -> np.ndarray:
+        """(S, 2) array of station x and thickness at that station"""
+        properties = self.section_properties
+        return np.stack((properties.stations, properties.thickness), axis=1)
+
+    def y_at_x(self, x, surface: str = "upper") -> np.ndarray:
+        """Returns the height of a surface at each x, e.g. the upper surface at 25% chord.
+
+        Args:
+            x (array_like): x positions
+            surface (str): "upper" or "lower"
+
+        Returns:
+            np.ndarray: y positions with the shape of x
+        """
+        return self.query_index.y_at_x(x, surface)
+
+    def thickness_at_x(self, x) -> np.ndarray:
+        """Returns the thickness of the airfoil at each x.
+
+        Args:
+            x (array_like): x positions
+
+        Returns:
+            np.ndarray: Upper minus lower surface height with the shape of x
+        """
+        return self.query_index.thickness_at_x(x)
+
+    def nearest_surface_points(self, points) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Finds the closest point on the airfoil outline to each query point.
+
+        Args:
+            points (array_like): (Q, 2) query points
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: (Q, 2) closest surface points, (Q,) distances and (Q,) surface
+                ids (0 for upper, 1 for lower)
+        """
+        return self.query_index.nearest_points(points)
+
+    def points_at_fractions(self, fractions, surface: str = "upper") -> np.ndarray:
+        """Returns the points at arc length fractions along a surface using the cached arc length table.
+
+        Args:
+            fractions (array_like): (K,) fractions between 0 and 1, measured in the direction the surface is stored
+            surface (str): "upper" or "lower"
+
+        Returns:
+            np.ndarray: (K, 2) array of points
+        """
+        if surface == "upper":
+            return points_at_arc_length_fractions(self.upper_surface, fractions, self.upper_arc_length)
+        if surface == "lower":
+            return points_at_arc_length_fractions(self.lower_surface, fractions, self.lower_arc_length)
+        raise ValueError(f"Surface must be 'upper' or 'lower', got {surface!r}")
+
+    def point_at_fraction(self, fraction: float, surface: str = "upper") -> np.ndarray:
+        """Returns the point at an arc length fraction along a surface.
+
+        Args:
+            fraction (float): Fraction between 0 and 1, measured in the direction the surface is stored
+            surface (str): "upper" or "lower"
+
+        Returns:
+            np.ndarray: The (2,) point
+        """
+        return self.points_at_fractions([fraction], surface)[0]
+
+    @instrumented("airfoil.generate_upper_lower_surfaces")
+    def generate_upper_lower_surfaces(self, filepath: str):
+        try:
+            upper_surface, lower_surface = surfaces_from_points(self._read_xflr_file(filepath))
         except FileNotFoundError:
-            logger.error("File not found")
-        except Exception as e:
-            logger.error(f"An error occurred: {e}")
+            logger.error(f"File not found: {filepath}")
+            raise
+        except AirfoilFileError as e:
+            logger.error(f"Malformed airfoil file: {e}")
+            raise
 
-    def adjust_chord_length(self, new_chord_length: float) -> None:
-        self.upper_surface = [point * new_chord_length /
-                              self.chord_length for point in self.upper_surface]
-        self.lower_surface = [point * new_chord_length /
-                              self.chord_length for point in self.lower_surface]
+        # The loaded points replace the current ones, so edits recorded on those are dropped and the chord is the unit
+        # chord of the file again
+        self._pending_transform = None
+        self.chord_length = 1.0
+        self.upper_surface = upper_surface
+        self.lower_surface = lower_surface
+        count("airfoil.points_read", len(upper_surface) + len(lower_surface))
+
+    def adjust_chord_length(self, new_chord_length: float) -> "Airfoil":
+        """Scales the airfoil about the leading edge to a new chord, recorded lazily like scale()."""
+        return self.scale(new_chord_length / self.chord_length)
 
     def _print_points(self) -> None:
         for point in self.upper_surface:
@@ -54,36 +537,17 @@ class Airfoil:
         for point in self.lower_surface:
             print(f"Lower: {point}")
 
-    def _plot_airfoil(self, title="") -> None:
-        fig = go.Figure()
-        # fig.add_trace(go.Scatter(x=[point[0] for point in self.points], y=[point[1] for point in self.points], mode="lines"))
-        fig.add_trace(go.Scatter(x=[point[0] for point in self.upper_surface], y=[
-                      point[1] for point in self.upper_surface], mode="lines"))
-        fig.add_trace(go.Scatter(x=[point[0] for point in self.lower_surface], y=[
-                      point[1] for point in self.lower_surface], mode="lines"))
-
-        x_figure_range = np.array([-0.5, 1.5])
-        y_figure_range = np.array([-1, 1])*9/16
-        fig.update_layout(xaxis_range=x_figure_range,
-                          yaxis_range=y_figure_range*9/16,
-                          title=title)
-        fig.show()
-
-    def _read_xflr_file(self, filepath: str) -> list[np.ndarray]:
-        with open(filepath, "r") as file:
-            content: list[str] = file.readlines()
-            self.airfoil_name: str = content[0].strip()
-            converted_string_array: list[str] = []
-
-            for line in content[1:]:
-                split_line = line.strip().split()
-                point = np.array(
-                    [float(split_line[0]), float(split_line[1])])
-                converted_string_array.append(point)
-
-        return converted_string_array
+    def _plot_airfoil(self, title="", max_points: int | None = None) -> None:
+        from plotting import plot_airfoil
+        plot_airfoil(self, title, max_points).show()
+
+    def _read_xflr_file(self, filepath: str) -> np.ndarray:
+        self.airfoil_name, points = read_dat_file(filepath)
+
+        return points
 
 if __name__ == "__main__":
+    logging.basicConfig(filename='airfoil.log', encoding='utf-8', level=logging.DEBUG)
     airfoil = Airfoil()
     airfoil.generate_upper_lower_surfaces(
         "/home/christian/Documents/Python_Projects/PGLineTrim/Airfoils/NACA 2412.dat")
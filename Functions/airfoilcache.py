@@ -0,0 +1,242 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import numpy as np
+from airfoil import Airfoil, read_dat_file, surfaces_from_points
+
+logger = logging.getLogger(__name__)
+
+
+class AirfoilCache:
+    """An on-disk binary cache of parsed airfoil surfaces
+
+    All cached surfaces live in one memory-mapped (P, 2) float64 .npy store next to a JSON index. The index maps each
+    source file path to its slice of the store together with the source size, modification time and a SHA-256 hash
+    of its contents. A changed size or mtime triggers a rehash, and a changed hash triggers a reparse, so edited files
+    are never served stale.
+
+    New and refreshed entries are held in memory until flush() (or leaving a with block) rewrites the store. At that
+    point the least recently used entries are evicted until the store fits in max_bytes. The cache assumes a single
+    writer per cache directory.
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 2**20) -> None:
+        self.cache_dir: str = cache_dir
+        self.max_bytes: int = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._entries: dict[str, dict] = {}
+        self._pending: dict[str, np.ndarray] = {}
+        self._points: np.ndarray = np.empty((0, 2))
+        self._points_file: str | None = None
+        self._access_clock: int = 0
+        self._generation: int = 0
+        self._dirty: bool = False
+        self._accessed: bool = False
+        self._open_store()
+
+    def __enter__(self) -> "AirfoilCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.flush()
+
+    def load(self, filepath: str) -> Airfoil:
+        """Loads an airfoil through the cache.
+
+        Args:
+            filepath (str): Path to the .dat file
+
+        Returns:
+            Airfoil: The parsed airfoil, with surfaces copied out of the store
+        """
+        airfoil_name, upper_surface, lower_surface = self.get_surfaces(filepath)
+
+        return Airfoil(airfoil_name=airfoil_name, upper_surface=upper_surface.copy(), lower_surface=lower_surface.copy())
+
+    def get_surfaces(self, filepath: str) -> tuple[str, np.ndarray, np.ndarray]:
+        """Returns the name and surfaces of an airfoil file, parsing it only when no valid cache entry exists.
+
+        Args:
+            filepath (str): Path to the .dat file
+
+        Returns:
+            tuple[str, np.ndarray, np.ndarray]: The airfoil name and read-only upper and lower surfaces
+        """
+        filepath = os.path.abspath(filepath)
+        source_stat = os.stat(filepath)
+        entry = self._entries.get(filepath)
+
+        if entry is not None:
+            if entry["source_size"] != source_stat.st_size or entry["source_mtime_ns"] != source_stat.st_mtime_ns:
+                # The file was touched or replaced, only reparse if its contents actually changed
+                if entry["content_hash"] != self._hash_file(filepath):
+                    entry = None
+                else:
+                    entry["source_size"] = source_stat.st_size
+                    entry["source_mtime_ns"] = source_stat.st_mtime_ns
+                    self._dirty = True
+
+        if entry is None:
+            entry = self._store(filepath, source_stat)
+
+        self._access_clock += 1
+        entry["last_access"] = self._access_clock
+        self._accessed = True
+        points = self._entry_points(filepath, entry)
+        upper_surface = points[:entry["num_upper"]]
+        lower_surface = points[entry["num_upper"]:]
+
+        return entry["airfoil_name"], upper_surface, lower_surface
+
+    def invalidate(self, filepath: str) -> None:
+        """Drops the cache entry of a file if one exists.
+
+        Args:
+            filepath (str): Path to the .dat file
+        """
+        filepath = os.path.abspath(filepath)
+        if self._entries.pop(filepath, None) is not None:
+            self._pending.pop(filepath, None)
+            self._dirty = True
+
+    def clear(self) -> None:
+        """Removes every entry from the cache"""
+        self._entries.clear()
+        self._pending.clear()
+        self._dirty = True
+        self.flush()
+
+    def size_bytes(self) -> int:
+        """Returns the size of all cached points in bytes, including entries not yet flushed"""
+        return sum(16 * (entry["num_upper"] + entry["num_lower"]) for entry in self._entries.values())
+
+    def flush(self) -> None:
+        """Evicts least recently used entries down to max_bytes and writes the store and index to disk
+
+        When only cache hits happened since the last flush, just the index is rewritten to keep their access times for
+        eviction in later sessions.
+        """
+        if not self._dirty:
+            if self._accessed:
+                self._write_index()
+                self._accessed = False
+            return
+
+        # Keep the most recently used entries that fit in the byte budget
+        kept_entries: dict[str, dict] = {}
+        total_bytes = 0
+        for filepath, entry in sorted(self._entries.items(), key=lambda item: item[1]["last_access"], reverse=True):
+            entry_bytes = 16 * (entry["num_upper"] + entry["num_lower"])
+            if total_bytes + entry_bytes > self.max_bytes:
+                logger.debug(f"Evicted cache entry {filepath}")
+                continue
+            kept_entries[filepath] = entry
+            total_bytes += entry_bytes
+
+        # Pack the kept entries into a fresh store
+        point_blocks: list[np.ndarray] = []
+        offset = 0
+        for filepath, entry in kept_entries.items():
+            points = self._entry_points(filepath, entry)
+            point_blocks.append(points)
+            entry["offset"] = offset
+            offset += len(points)
+        packed_points = np.concatenate(point_blocks) if point_blocks else np.empty((0, 2))
+
+        # A new generation of the store is written each time so that views handed out earlier stay valid
+        previous_points_file = self._points_file
+        self._generation += 1
+        points_file = f"points-{self._generation}.npy"
+        self._write_atomic(points_file, lambda file: np.save(file, packed_points))
+
+        self._entries = kept_entries
+        self._points_file = points_file
+        self._write_index()
+        self._pending.clear()
+        self._dirty = False
+        self._accessed = False
+        self._points = np.load(os.path.join(self.cache_dir, points_file), mmap_mode="r")
+
+        if previous_points_file is not None and previous_points_file != points_file:
+            try:
+                os.remove(os.path.join(self.cache_dir, previous_points_file))
+            except OSError as e:
+                # Still mapped on platforms that lock mapped files; it is replaced on the next flush
+                logger.debug(f"Could not remove old cache store {previous_points_file}: {e}")
+
+    def _open_store(self) -> None:
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILENAME)
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                index = json.load(file)
+            points = np.load(os.path.join(self.cache_dir, index["points_file"]), mmap_mode="r")
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError) as e:
+            # A truncated or foreign index is treated as an empty cache and rewritten on the next flush
+            logger.warning(f"Discarding unreadable airfoil cache in {self.cache_dir}: {e}")
+            self._dirty = True
+            return
+
+        self._entries = index["entries"]
+        self._access_clock = index["access_clock"]
+        self._generation = index["generation"]
+        self._points_file = index["points_file"]
+        self._points = points
+
+    def _store(self, filepath: str, source_stat: os.stat_result) -> dict:
+        logger.debug(f"Cache miss for {filepath}")
+        content_hash = self._hash_file(filepath)
+        airfoil_name, points = read_dat_file(filepath)
+        upper_surface, lower_surface = surfaces_from_points(points)
+
+        packed_points = np.concatenate((upper_surface, lower_surface))
+        packed_points.flags.writeable = False
+        entry = {
+            "airfoil_name": airfoil_name,
+            "offset": -1,
+            "num_upper": len(upper_surface),
+            "num_lower": len(lower_surface),
+            "content_hash": content_hash,
+            "source_size": source_stat.st_size,
+            "source_mtime_ns": source_stat.st_mtime_ns,
+            "last_access": self._access_clock,
+        }
+        self._entries[filepath] = entry
+        self._pending[filepath] = packed_points
+        self._dirty = True
+
+        return entry
+
+    def _write_index(self) -> None:
+        index = {"points_file": self._points_file, "generation": self._generation, "access_clock": self._access_clock,
+                 "entries": self._entries}
+        self._write_atomic(self.INDEX_FILENAME, lambda file: file.write(json.dumps(index).encode("utf-8")))
+
+    def _entry_points(self, filepath: str, entry: dict) -> np.ndarray:
+        pending_points = self._pending.get(filepath)
+        if pending_points is not None:
+            return pending_points
+        offset = entry["offset"]
+        return self._points[offset:offset + entry["num_upper"] + entry["num_lower"]]
+
+    @staticmethod
+    def _hash_file(filepath: str) -> str:
+        with open(filepath, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+
+    def _write_atomic(self, filename: str, write) -> None:
+        # Write to a temporary file first so that readers never observe a partial file
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                write(file)
+            os.replace(temporary_path, os.path.join(self.cache_dir, filename))
+        except BaseException:
+            os.remove(temporary_path)
+            raise
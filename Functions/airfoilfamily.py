@@ -0,0 +1,137 @@
+import logging
+from collections import OrderedDict
+import numpy as np
+from airfoil import Airfoil
+from airfoiltools import AirfoilTools
+from instrumentation import count, instrumented
+
+logger = logging.getLogger(__name__)
+
+
+class AirfoilFamily:
+    """A set of key airfoils at stations along the span, blended into the profile at any position in between
+
+    The key airfoils are resampled once to num_points per surface, so every profile shares one parameterisation and
+    is stored like AirfoilLibrary.profiles: (2 * num_points, 2) with the upper surface (trailing edge to leading edge)
+    first. Between stations the points are interpolated piecewise, either linearly or with a cubic spline through all
+    stations, and the polynomial coefficients of every interval are computed up front. A profile lookup is then one
+    Horner evaluation on the interval's coefficients, whatever the number of key airfoils, so a root, mid and tip
+    wing costs the same as a two airfoil morph.
+
+    Single lookups through profile_at() are kept in an LRU cache bounded by max_cache_bytes. profiles_at() evaluates
+    many positions in one batch without touching the cache.
+    """
+
+    INTERPOLATIONS = ("linear", "cubic")
+
+    def __init__(self, airfoils: list[Airfoil], stations, num_points: int = 100, interpolation: str = "linear",
+                 max_cache_bytes: int = 16 * 2**20) -> None:
+        """
+        Args:
+            airfoils (list[Airfoil]): Key airfoils, at least 2
+            stations (array_like): Strictly increasing position of every key airfoil, e.g. the Glider blend value
+            num_points (int): Number of points per surface of the shared parameterisation
+            interpolation (str): "linear" or "cubic" between stations
+            max_cache_bytes (int): Memory allowed for cached profiles
+        """
+        stations = np.asarray(stations, dtype=np.float64)
+        if len(airfoils) < 2 or len(airfoils) != len(stations):
+            raise ValueError("An airfoil family needs at least 2 airfoils and one station per airfoil")
+        if np.any(np.diff(stations) <= 0.0):
+            raise ValueError("Stations must be strictly increasing")
+        if interpolation not in self.INTERPOLATIONS:
+            raise ValueError(f"Interpolation must be one of {self.INTERPOLATIONS}, got {interpolation!r}")
+
+        self.airfoils: list[Airfoil] = list(airfoils)
+        self.stations: np.ndarray = stations
+        self.num_points: int = num_points
+        self.interpolation: str = interpolation
+
+        airfoil_tools = AirfoilTools()
+        resampled_airfoils = [airfoil_tools._arc_length_resample(airfoil, num_points) for airfoil in airfoils]
+        self.key_profiles: np.ndarray = np.stack([np.concatenate((airfoil.upper_surface, airfoil.lower_surface))
+                                                  for airfoil in resampled_airfoils])
+        self.coefficients: np.ndarray = self._interval_coefficients()
+
+        self.max_cache_bytes: int = max_cache_bytes
+        self.cache_capacity: int = max(1, max_cache_bytes // self.key_profiles[0].nbytes)
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self._cache: OrderedDict[float, np.ndarray] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def _interval_coefficients(self) -> np.ndarray:
+        """Returns (degree + 1, intervals, 2 * num_points, 2) polynomial coefficients in the offset from the interval
+        start, highest power first."""
+        if self.interpolation == "linear":
+            intervals = np.diff(self.stations)[:, None, None]
+            slopes = np.diff(self.key_profiles, axis=0) / intervals
+            return np.stack((slopes, self.key_profiles[:-1]))
+
+        # scipy is only loaded for cubic families
+        from scipy.interpolate import CubicSpline
+        return CubicSpline(self.stations, self.key_profiles, axis=0).c
+
+    @instrumented("airfoilfamily.profiles_at")
+    def profiles_at(self, positions) -> np.ndarray:
+        """Returns the blended profiles at many span positions in one batch.
+
+        Args:
+            positions (array_like): (S,) positions within the station range
+
+        Raises:
+            ValueError: If a position lies outside the stations
+
+        Returns:
+            np.ndarray: (S, 2 * num_points, 2) profiles, upper surface first
+        """
+        positions = np.atleast_1d(np.asarray(positions, dtype=np.float64))
+        if np.any((positions < self.stations[0]) | (positions > self.stations[-1])):
+            raise ValueError(f"Positions must lie between {self.stations[0]} and {self.stations[-1]}")
+
+        intervals = np.clip(np.searchsorted(self.stations, positions, side="right") - 1, 0, len(self.stations) - 2)
+        offsets = (positions - self.stations[intervals])[:, None, None]
+        profiles = self.coefficients[0, intervals]
+        for coefficients in self.coefficients[1:]:
+            profiles *= offsets
+            profiles += coefficients[intervals]
+        count("airfoilfamily.profiles_evaluated", len(positions))
+        return profiles
+
+    def profile_at(self, position: float) -> np.ndarray:
+        """Returns the blended (2 * num_points, 2) profile at one position, from the LRU cache when possible.
+
+        The returned array is shared with the cache and read only.
+        """
+        key = float(position)
+        profile = self._cache.get(key)
+        if profile is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return profile
+
+        self.cache_misses += 1
+        profile = self.profiles_at([key])[0]
+        profile.flags.writeable = False
+        self._cache[key] = profile
+        if len(self._cache) > self.cache_capacity:
+            self._cache.popitem(last=False)
+        return profile
+
+    def airfoil_at(self, position: float, airfoil_name: str | None = None) -> Airfoil:
+        """Returns the blended profile at one position as an Airfoil whose surfaces are views of the cached profile."""
+        profile = self.profile_at(position)
+        return Airfoil(airfoil_name=airfoil_name or f"Family profile at {position:g}",
+                       upper_surface=profile[:self.num_points], lower_surface=profile[self.num_points:])
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def cache_bytes(self) -> int:
+        """Memory held by cached profiles"""
+        return sum(profile.nbytes for profile in self._cache.values())
@@ -0,0 +1,117 @@
+import glob
+import logging
+import os
+import numpy as np
+from airfoil import Airfoil, AirfoilFileError
+from airfoiltools import AirfoilTools
+
+logger = logging.getLogger(__name__)
+
+
+def _load_resampled(filepath: str, num_points: int) -> tuple[str, str, np.ndarray | None, str | None]:
+    """Parses and resamples one airfoil file. Runs inside the worker processes.
+
+    Returns:
+        tuple: The file path, airfoil name, (2 * num_points, 2) upper then lower surface points and an error
+            message (the points are None when the file could not be loaded)
+    """
+    airfoil = Airfoil()
+    try:
+        airfoil.generate_upper_lower_surfaces(filepath)
+    except (OSError, AirfoilFileError) as e:
+        return filepath, "", None, str(e)
+
+    resampled_airfoil = AirfoilTools()._arc_length_resample(airfoil, num_points)
+    points = np.concatenate((resampled_airfoil.upper_surface, resampled_airfoil.lower_surface))
+
+    return filepath, airfoil.airfoil_name, points, None
+
+
+class AirfoilLibrary:
+    """A library of airfoils resampled to a common point count and stacked into one matrix
+
+    profiles has shape (M, 2 * num_points, 2): the first num_points rows of each profile are its upper surface
+    (trailing edge to leading edge) and the remaining rows its lower surface (leading edge to trailing edge).
+    """
+
+    def __init__(self, num_points: int = 100) -> None:
+        if num_points < 2:
+            raise ValueError("Number of points must be at least 2")
+        self.num_points: int = num_points
+        self.profiles: np.ndarray = np.empty((0, 2 * num_points, 2))
+        self.names: list[str] = []
+        self.airfoil_names: list[str] = []
+        self.filepaths: list[str] = []
+        self.index: dict[str, int] = {}
+        self.failed: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __getitem__(self, name: str) -> Airfoil:
+        """Returns a library profile as an Airfoil whose surfaces are views into the profile matrix"""
+        i = self.index[name]
+        return Airfoil(airfoil_name=self.airfoil_names[i], upper_surface=self.upper_surfaces[i],
+                       lower_surface=self.lower_surfaces[i])
+
+    @property
+    def upper_surfaces(self) -> np.ndarray:
+        """(M, num_points, 2) view of every upper surface"""
+        return self.profiles[:, :self.num_points]
+
+    @property
+    def lower_surfaces(self) -> np.ndarray:
+        """(M, num_points, 2) view of every lower surface"""
+        return self.profiles[:, self.num_points:]
+
+    def load_directory(self, directory: str, pattern: str = "*.dat", max_workers: int | None = None) -> None:
+        """Parses and resamples every matching file in a directory and adds them to the library.
+
+        Files are spread over a process pool. Files that cannot be parsed are logged and recorded in failed instead
+        of aborting the load. A file whose name is already in the library replaces the existing profile.
+
+        Args:
+            directory (str): Directory to scan
+            pattern (str): Glob pattern of the files to load
+            max_workers (int | None): Number of worker processes, 1 loads serially in this process
+        """
+        filepaths = sorted(glob.glob(os.path.join(directory, pattern)))
+        if not filepaths:
+            logger.warning(f"No files matching {pattern} in {directory}")
+            return
+
+        max_workers = min(max_workers or os.cpu_count() or 1, len(filepaths))
+        if max_workers == 1:
+            results = [_load_resampled(filepath, self.num_points) for filepath in filepaths]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            chunksize = max(1, len(filepaths) // (4 * max_workers))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(_load_resampled, filepaths, [self.num_points] * len(filepaths),
+                                            chunksize=chunksize))
+
+        new_profiles: list[np.ndarray] = []
+        for filepath, airfoil_name, points, error in results:
+            if points is None:
+                logger.error(f"Skipping {filepath}: {error}")
+                self.failed[filepath] = error
+                continue
+
+            name = os.path.splitext(os.path.basename(filepath))[0]
+            if name in self.index:
+                self.profiles[self.index[name]] = points
+                self.airfoil_names[self.index[name]] = airfoil_name
+                self.filepaths[self.index[name]] = filepath
+                continue
+
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            self.airfoil_names.append(airfoil_name)
+            self.filepaths.append(filepath)
+            new_profiles.append(points)
+
+        if new_profiles:
+            self.profiles = np.concatenate((self.profiles, np.stack(new_profiles)))
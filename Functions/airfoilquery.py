@@ -0,0 +1,150 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class SegmentIndex:
+    """Exact nearest point queries over a set of line segments
+
+    A KD-tree holds the segment midpoints. A segment whose midpoint lies further from a query than the best distance
+    found so far plus the largest half segment length cannot be closer, so each query refines its k nearest segments
+    and only the queries whose k-th midpoint is still within that bound look at more, k doubling every round.
+    Segments longer than twice the median are split into equal pieces first, so that a few coarse segments next to a
+    densely sampled outline do not loosen the bound for every query. The result is exact whatever the sampling.
+    """
+
+    INITIAL_CANDIDATES = 4
+
+    def __init__(self, starts, ends) -> None:
+        """
+        Args:
+            starts (array_like): (S, 2) segment start points
+            ends (array_like): (S, 2) segment end points
+        """
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        vectors = np.asarray(ends, dtype=np.float64).reshape(-1, 2) - starts
+        if len(starts) == 0:
+            raise ValueError("A segment index needs at least one segment")
+        lengths = np.linalg.norm(vectors, axis=1)
+        nonzero_lengths = lengths[lengths > 0.0]
+        max_piece_length = 2.0 * np.median(nonzero_lengths) if len(nonzero_lengths) else np.inf
+        num_pieces = np.maximum(np.ceil(lengths / max_piece_length), 1).astype(np.intp)
+
+        # Piece k of a segment split in n covers the fraction [k / n, (k + 1) / n] of it
+        self.piece_segments: np.ndarray = np.repeat(np.arange(len(starts)), num_pieces)
+        piece_numbers = np.arange(len(self.piece_segments)) - np.repeat(np.cumsum(num_pieces) - num_pieces, num_pieces)
+        piece_fractions = 1.0 / num_pieces[self.piece_segments][:, None]
+        self.vectors: np.ndarray = vectors[self.piece_segments] * piece_fractions
+        self.starts: np.ndarray = starts[self.piece_segments] + piece_numbers[:, None] * self.vectors
+        self.lengths_squared: np.ndarray = np.einsum("sd,sd->s", self.vectors, self.vectors)
+        self.max_half_length: float = 0.5 * float(np.sqrt(self.lengths_squared.max()))
+        self.tree: cKDTree = cKDTree(self.starts + 0.5 * self.vectors)
+
+    def _closest_points(self, points: np.ndarray, segments: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the closest points on the (Q, C) candidate segments of (Q, 2) points and their (Q, C) distances."""
+        segment_starts = self.starts[segments]
+        segment_vectors = self.vectors[segments]
+        lengths_squared = self.lengths_squared[segments]
+        offsets = points[:, None, :] - segment_starts
+        projections = np.divide(np.einsum("qcd,qcd->qc", offsets, segment_vectors), lengths_squared,
+                                out=np.zeros(lengths_squared.shape), where=lengths_squared > 0)
+        closest = segment_starts + np.clip(projections, 0.0, 1.0)[..., None] * segment_vectors
+        return closest, np.linalg.norm(points[:, None, :] - closest, axis=2)
+
+    def nearest(self, points, workers: int = 1) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Finds the closest point on any segment to each query point.
+
+        Args:
+            points (array_like): (Q, 2) query points
+            workers (int): Threads of the KD-tree queries, -1 for every core
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: (Q, 2) closest points, (Q,) distances and (Q,) indices of the
+                closest segments
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        closest_points = np.empty_like(points)
+        distances = np.full(len(points), np.inf)
+        segments = np.zeros(len(points), dtype=np.intp)
+
+        pending = np.arange(len(points))
+        num_refined, num_candidates = 0, self.INITIAL_CANDIDATES
+        while len(pending):
+            num_candidates = min(num_candidates, len(self.starts))
+            midpoint_distances, candidates = self.tree.query(points[pending], k=num_candidates, workers=workers)
+            midpoint_distances = midpoint_distances.reshape(len(pending), -1)
+            # The nearer candidates were refined in the previous rounds
+            candidates = candidates.reshape(len(pending), -1)[:, num_refined:]
+            candidate_points, candidate_distances = self._closest_points(points[pending], candidates)
+
+            rows = np.arange(len(pending))
+            best = np.argmin(candidate_distances, axis=1)
+            improved = candidate_distances[rows, best] < distances[pending]
+            closest_points[pending[improved]] = candidate_points[rows[improved], best[improved]]
+            distances[pending[improved]] = candidate_distances[rows[improved], best[improved]]
+            segments[pending[improved]] = candidates[rows[improved], best[improved]]
+
+            if num_candidates == len(self.starts):
+                break
+            # Segments beyond the k-th midpoint are at least its distance minus their half length away
+            pending = pending[midpoint_distances[:, -1] - self.max_half_length <= distances[pending]]
+            num_refined, num_candidates = num_candidates, 2 * num_candidates
+
+        return closest_points, distances, self.piece_segments[segments]
+
+
+class AirfoilQueryIndex:
+    """A precomputed lookup structure over the two surfaces of an airfoil
+
+    Each surface is stored sorted by x so height queries are a single np.interp call. Nearest point queries go through
+    a SegmentIndex over the segments of both surfaces, exact however unevenly the surfaces are sampled. Build it once
+    per geometry (Airfoil.query_index caches it) and query it with arrays.
+    """
+
+    def __init__(self, upper_surface: np.ndarray, lower_surface: np.ndarray) -> None:
+        if len(upper_surface) < 2 or len(lower_surface) < 2:
+            raise ValueError("Both surfaces need at least 2 points to build a query index")
+
+        upper_order = np.argsort(upper_surface[:, 0], kind="stable")
+        lower_order = np.argsort(lower_surface[:, 0], kind="stable")
+        self.upper_x: np.ndarray = upper_surface[upper_order, 0]
+        self.upper_y: np.ndarray = upper_surface[upper_order, 1]
+        self.lower_x: np.ndarray = lower_surface[lower_order, 0]
+        self.lower_y: np.ndarray = lower_surface[lower_order, 1]
+
+        # One index over the segments of both surfaces, with the surface id (0 upper, 1 lower) of every segment
+        self.segment_index: SegmentIndex = SegmentIndex(np.concatenate((upper_surface[:-1], lower_surface[:-1])),
+                                                        np.concatenate((upper_surface[1:], lower_surface[1:])))
+        self.segment_surface: np.ndarray = np.repeat([0, 1], [len(upper_surface) - 1, len(lower_surface) - 1])
+
+    def y_at_x(self, x, surface: str = "upper") -> np.ndarray:
+        """Returns the surface height at each x by linear interpolation.
+
+        Args:
+            x (array_like): x positions, values outside the surface are clamped to its end points
+            surface (str): "upper" or "lower"
+
+        Returns:
+            np.ndarray: y positions with the shape of x
+        """
+        if surface == "upper":
+            return np.interp(x, self.upper_x, self.upper_y)
+        if surface == "lower":
+            return np.interp(x, self.lower_x, self.lower_y)
+        raise ValueError(f"Surface must be 'upper' or 'lower', got {surface!r}")
+
+    def thickness_at_x(self, x) -> np.ndarray:
+        """Returns the distance between the surfaces, measured vertically, at each x."""
+        return self.y_at_x(x, "upper") - self.y_at_x(x, "lower")
+
+    def nearest_points(self, points) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Finds the closest point on either surface to each query point.
+
+        Args:
+            points (array_like): (Q, 2) query points
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: (Q, 2) closest surface points, (Q,) distances and (Q,) surface
+                ids (0 for upper, 1 for lower)
+        """
+        closest_points, distances, segments = self.segment_index.nearest(points)
+        return closest_points, distances, self.segment_surface[segments]
@@ -0,0 +1,132 @@
+import logging
+import numpy as np
+from airfoil import Airfoil, compute_section_properties
+from airfoillibrary import AirfoilLibrary
+from airfoiltools import AirfoilTools
+from instrumentation import count, instrumented
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_chords(profiles) -> np.ndarray:
+    """Moves, rotates and scales profiles so the leading edge sits at (0, 0) and the trailing edge at (1, 0).
+
+    Args:
+        profiles (array_like): (2 * N, 2) profile or (..., 2 * N, 2) stack, upper surface (trailing to leading edge)
+            first, both surfaces sharing the leading edge point as AirfoilLibrary stores them
+
+    Returns:
+        np.ndarray: Normalised copies with the same shape
+    """
+    profiles = np.asarray(profiles, dtype=np.float64)
+    num_points = profiles.shape[-2] // 2
+    leading_edges = profiles[..., num_points - 1, :]
+    chords = 0.5 * (profiles[..., 0, :] + profiles[..., -1, :]) - leading_edges
+    chord_lengths = np.linalg.norm(chords, axis=-1)
+    if np.any(chord_lengths == 0.0):
+        raise ValueError("A profile has its trailing edge on its leading edge")
+
+    # Complex division by the chord vector rotates and scales in one step
+    points = profiles[..., 0] + 1j * profiles[..., 1]
+    points -= (leading_edges[..., 0] + 1j * leading_edges[..., 1])[..., None]
+    points /= (chords[..., 0] + 1j * chords[..., 1])[..., None]
+    return np.stack((points.real, points.imag), axis=-1)
+
+
+class AirfoilSearchIndex:
+    """Nearest airfoil search over every profile of an AirfoilLibrary in one matrix product
+
+    Each library profile is chord normalised (normalize_chords) and flattened into a row of one dense feature matrix.
+    Thickness and camber distributions at num_stations cosine spaced stations can be appended to the row with their
+    own weights. The squared distance between two rows is then
+
+        mean squared point distance + thickness_weight * mean squared thickness difference
+                                    + camber_weight * mean squared camber difference
+
+    and the distances from a batch of queries to every library profile come from one matrix product using the
+    precomputed squared row norms. The index is a snapshot, build a new one after loading more airfoils.
+    """
+
+    def __init__(self, library: AirfoilLibrary, thickness_weight: float = 0.0, camber_weight: float = 0.0,
+                 num_stations: int = 51) -> None:
+        """
+        Args:
+            library (AirfoilLibrary): The profiles to search
+            thickness_weight (float): Weight of the thickness distribution, 0 leaves it out
+            camber_weight (float): Weight of the camber distribution, 0 leaves it out
+            num_stations (int): Stations of the thickness and camber distributions
+        """
+        if len(library) == 0:
+            raise ValueError("Cannot index an empty airfoil library")
+        if thickness_weight < 0.0 or camber_weight < 0.0:
+            raise ValueError("Feature weights must not be negative")
+        self.names: list[str] = list(library.names)
+        self.num_points: int = library.num_points
+        self.thickness_weight: float = thickness_weight
+        self.camber_weight: float = camber_weight
+        self.num_stations: int = num_stations
+
+        self.features: np.ndarray = self._features(library.profiles)
+        self.squared_norms: np.ndarray = np.einsum("ij,ij->i", self.features, self.features)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _features(self, profiles: np.ndarray) -> np.ndarray:
+        """Returns the (K, F) feature rows of (K, 2 * num_points, 2) profiles."""
+        normalized = normalize_chords(profiles)
+        # Scaled so that squared row distances are mean squared point and station differences
+        parts = [normalized.reshape(len(normalized), -1) / np.sqrt(normalized.shape[1])]
+        if self.thickness_weight > 0.0 or self.camber_weight > 0.0:
+            properties = compute_section_properties(normalized[:, :self.num_points], normalized[:, self.num_points:],
+                                                    self.num_stations)
+            station_scale = 1.0 / np.sqrt(self.num_stations)
+            if self.thickness_weight > 0.0:
+                parts.append(properties.thickness * (np.sqrt(self.thickness_weight) * station_scale))
+            if self.camber_weight > 0.0:
+                parts.append(properties.camber * (np.sqrt(self.camber_weight) * station_scale))
+        return np.ascontiguousarray(np.concatenate(parts, axis=1))
+
+    @instrumented("airfoilsearch.search_profiles")
+    def search_profiles(self, profiles, k: int = 5) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the k closest library profiles to every query profile.
+
+        Args:
+            profiles (array_like): (2 * num_points, 2) profile or (Q, 2 * num_points, 2) stack in the library layout,
+                e.g. from resampling with AirfoilTools()._arc_length_resample. Position, rotation and chord do not
+                matter.
+            k (int): Number of matches per query
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (Q, k) library indices and (Q, k) distances, closest first
+        """
+        profiles = np.asarray(profiles, dtype=np.float64)
+        if profiles.ndim == 2:
+            profiles = profiles[None]
+        if profiles.shape[1] != 2 * self.num_points:
+            raise ValueError(f"Query profiles need {2 * self.num_points} points like the library, "
+                             f"got {profiles.shape[1]}")
+        k = min(k, len(self.names))
+
+        queries = self._features(profiles)
+        squared_distances = self.squared_norms[None, :] - 2.0 * (queries @ self.features.T)
+        squared_distances += np.einsum("ij,ij->i", queries, queries)[:, None]
+
+        if k < len(self.names):
+            candidates = np.argpartition(squared_distances, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(len(self.names)), squared_distances.shape)
+        candidate_distances = np.take_along_axis(squared_distances, candidates, axis=1)
+        order = np.argsort(candidate_distances, axis=1)
+        indices = np.take_along_axis(candidates, order, axis=1)
+        # Rounding in the expanded product can leave tiny negative squares for identical profiles
+        distances = np.sqrt(np.maximum(np.take_along_axis(candidate_distances, order, axis=1), 0.0))
+        count("airfoilsearch.queries", len(profiles))
+        return indices, distances
+
+    def closest(self, airfoil: Airfoil, k: int = 5) -> list[tuple[str, float]]:
+        """Resamples an airfoil like the library does and returns the names and distances of its k closest matches."""
+        resampled_airfoil = AirfoilTools()._arc_length_resample(airfoil, self.num_points)
+        indices, distances = self.search_profiles(
+            np.concatenate((resampled_airfoil.upper_surface, resampled_airfoil.lower_surface)), k)
+        return [(self.names[i], float(distance)) for i, distance in zip(indices[0], distances[0])]
@@ -1,14 +1,13 @@
-from airfoil import Airfoil
+from airfoil import Airfoil, SectionProperties, compute_section_properties
 import numpy as np
 import logging
-from scipy.spatial.distance import euclidean
-from customfunctions import resample_path_with_endpoints
-import plotly.graph_objects as go
+from customfunctions import cumulative_arc_length, distance_to_polyline, resample_path_with_endpoints
+from instrumentation import count, instrumented
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(filename='airfoiltools.log', encoding='utf-8', level=logging.DEBUG)
 
 class AirfoilTools: 
+    @instrumented("airfoiltools.morph_profile")
     def morph_profile(self, airfoil1: Airfoil, airfoil2: Airfoil, percentage: float) -> Airfoil:
         """Morphs two airfoils together based on a percentage. The percentage is the percentage of the first airfoil in the final airfoil.
 
@@ -33,21 +32,79 @@ class AirfoilTools:
         if len(airfoil1.upper_surface) != len(airfoil2.upper_surface) or len(airfoil1.lower_surface) != len(airfoil2.lower_surface):
             raise ValueError("Airfoils must have the same number of points")
         
-        # Morph upper surface
-        morphed_upper_surface = []
-        for airfoil1_point, airfoil2_point in zip(airfoil1.upper_surface, airfoil2.upper_surface):
-            morphed_upper_surface.append(airfoil1_point + (airfoil2_point - airfoil1_point) * percentage)
-            
-        # Morph lower surface
-        morphed_lower_surface = []
-        for airfoil1_point, airfoil2_point in zip(airfoil1.lower_surface, airfoil2.lower_surface):
-            morphed_lower_surface.append(airfoil1_point + (airfoil2_point - airfoil1_point)  * percentage)
+        # Morph upper and lower surfaces
+        morphed_upper_surface = airfoil1.upper_surface + (airfoil2.upper_surface - airfoil1.upper_surface) * percentage
+        morphed_lower_surface = airfoil1.lower_surface + (airfoil2.lower_surface - airfoil1.lower_surface) * percentage
     
         # Instantiate morphed profile
         morphed_airfoil = Airfoil(upper_surface=morphed_upper_surface, lower_surface=morphed_lower_surface)
+        count("airfoiltools.points_morphed", len(morphed_upper_surface) + len(morphed_lower_surface))
 
         return morphed_airfoil
 
+    @instrumented("airfoiltools.morph_profiles")
+    def morph_profiles(self, airfoil1: Airfoil, airfoil2: Airfoil, percentages) -> tuple[np.ndarray, np.ndarray]:
+        """Morphs two airfoils together at K percentages in one broadcast operation.
+
+        Args:
+            airfoil1 (Airfoil): The starting airfoil
+            airfoil2 (Airfoil): The airfoil to morph into
+            percentages (array_like): K percentages of morph between the starting and final airfoil
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (K, N, 2) stacks of the morphed upper and lower surfaces
+        """
+
+        # Generate any errors if exist
+        if not isinstance(airfoil1, Airfoil):
+            raise TypeError("Airfoil1 must be an instance of Airfoil")
+        if not isinstance(airfoil2, Airfoil):
+            raise TypeError("Airfoil2 must be an instance of Airfoil")
+        percentages = np.asarray(percentages, dtype=np.float64)
+        if percentages.ndim != 1:
+            raise ValueError("Percentages must be a 1D sequence of numbers")
+        if np.any((percentages < 0.0) | (percentages > 1.0)):
+            raise ValueError("Percentages must be between 0.0 and 1.0")
+        if len(airfoil1.upper_surface) != len(airfoil2.upper_surface) or len(airfoil1.lower_surface) != len(airfoil2.lower_surface):
+            raise ValueError("Airfoils must have the same number of points")
+
+        weights = percentages[:, None, None]
+        morphed_upper_surfaces = airfoil1.upper_surface + (airfoil2.upper_surface - airfoil1.upper_surface) * weights
+        morphed_lower_surfaces = airfoil1.lower_surface + (airfoil2.lower_surface - airfoil1.lower_surface) * weights
+        count("airfoiltools.profiles_morphed", len(percentages))
+
+        return morphed_upper_surfaces, morphed_lower_surfaces
+
+    @staticmethod
+    def airfoil_from_stack(upper_surfaces: np.ndarray, lower_surfaces: np.ndarray, index: int, airfoil_name="Generic Airfoil") -> Airfoil:
+        """Wraps one slice of a morph stack as an Airfoil without copying the points.
+
+        Args:
+            upper_surfaces (np.ndarray): (K, N, 2) stack of upper surfaces
+            lower_surfaces (np.ndarray): (K, N, 2) stack of lower surfaces
+            index (int): The slice of the stack to wrap
+            airfoil_name (str): Name given to the wrapped airfoil
+
+        Returns:
+            Airfoil: Airfoil whose surfaces are views into the stacks
+        """
+
+        return Airfoil(airfoil_name=airfoil_name, upper_surface=upper_surfaces[index], lower_surface=lower_surfaces[index])
+
+    def section_properties(self, upper_surfaces: np.ndarray, lower_surfaces: np.ndarray, num_stations: int = 101) -> SectionProperties:
+        """Computes camber, thickness, area and centroid for a whole morph stack at once.
+
+        Args:
+            upper_surfaces (np.ndarray): (K, N, 2) stack of upper surfaces, e.g. from morph_profiles
+            lower_surfaces (np.ndarray): (K, N, 2) stack of lower surfaces
+            num_stations (int): Number of stations for the camber and thickness distributions
+
+        Returns:
+            SectionProperties: Derived geometry with a leading dimension of K on every attribute
+        """
+        return compute_section_properties(upper_surfaces, lower_surfaces, num_stations)
+
+    @instrumented("airfoiltools.arc_length_resample")
     def _arc_length_resample(self, airfoil_to_resample: Airfoil, numpoints: int) -> Airfoil:
         """Applies arc length resampling to an airfoil.
 
@@ -59,17 +116,146 @@ class AirfoilTools:
             resampled_airfoil (Airfoil): _description_
         """
 
-        resampled_upper_surface: list[np.ndarray] = []
-        resampled_lower_surface: list[np.ndarray] = []
-
-        resampled_upper_surface = resample_path_with_endpoints(airfoil_to_resample.upper_surface, numpoints)
-        resampled_lower_surface = resample_path_with_endpoints(airfoil_to_resample.lower_surface, numpoints)
+        resampled_upper_surface = resample_path_with_endpoints(airfoil_to_resample.upper_surface, numpoints, airfoil_to_resample.upper_arc_length)
+        resampled_lower_surface = resample_path_with_endpoints(airfoil_to_resample.lower_surface, numpoints, airfoil_to_resample.lower_arc_length)
         
         resampled_airfoil = Airfoil(airfoil_name=airfoil_to_resample.airfoil_name, upper_surface=resampled_upper_surface, lower_surface=resampled_lower_surface)
+        count("airfoiltools.points_resampled", 2 * numpoints)
 
         return resampled_airfoil
 
+    def _spline_resample(self, airfoil_to_resample: Airfoil, numpoints: int, spacing: str = "cosine", method: str = "cubic") -> Airfoil:
+        """Resamples an airfoil from a smooth parametric curve fitted through both surfaces.
+
+        The curve is parameterised by arc length over the whole contour, trailing edge to leading edge to trailing
+        edge, so it stays smooth through the leading edge. Each surface then receives numpoints points, spaced by:
+
+        - "uniform": equal arc length steps
+        - "cosine": full cosine spacing, clustered at the leading and trailing edges
+        - "curvature": point density proportional to the square root of curvature, which equidistributes the
+          chordal error of the resulting polyline
+
+        Args:
+            airfoil_to_resample (Airfoil): The airfoil to resample
+            numpoints (int): Number of points per surface
+            spacing (str): "uniform", "cosine" or "curvature"
+            method (str): Interpolant through the original points, "linear", "cubic" or "pchip"
+
+        Returns:
+            Airfoil: The resampled airfoil
+        """
+        if numpoints < 2:
+            raise ValueError("Number of points must be at least 2")
+
+        contour_curve, contour_distances, leading_edge_distance = self._fit_contour_curve(airfoil_to_resample, method)
+        total_distance = contour_distances[-1]
+
+        # Curvature always comes from a cubic fit so that it is defined for every interpolation method
+        curvature_curve = None
+        if spacing == "curvature":
+            curvature_curve = contour_curve if method == "cubic" else self._fit_contour_curve(airfoil_to_resample, "cubic")[0]
+
+        upper_distances = self._spacing_distances(spacing, 0.0, leading_edge_distance, numpoints, curvature_curve)
+        lower_distances = self._spacing_distances(spacing, leading_edge_distance, total_distance, numpoints, curvature_curve)
+        resampled_upper_surface = contour_curve(upper_distances)
+        resampled_lower_surface = contour_curve(lower_distances)
+
+        # Pin the end points exactly rather than relying on the interpolation round trip
+        resampled_upper_surface[[0, -1]] = airfoil_to_resample.upper_surface[[0, -1]]
+        resampled_lower_surface[[0, -1]] = airfoil_to_resample.lower_surface[[0, -1]]
+
+        return Airfoil(airfoil_name=airfoil_to_resample.airfoil_name, upper_surface=resampled_upper_surface, lower_surface=resampled_lower_surface)
+
+    def resampling_error(self, reference_airfoil: Airfoil, resampled_airfoil: Airfoil, num_reference_points: int = 2000) -> float:
+        """Measures how far a resampled airfoil deviates from the shape of its source.
+
+        The source shape is a cubic spline through the reference points, sampled densely. The error is the largest
+        distance from any sample to the polyline of the resampled airfoil, in chord units of the reference.
+
+        Args:
+            reference_airfoil (Airfoil): The original airfoil
+            resampled_airfoil (Airfoil): The resampled airfoil
+            num_reference_points (int): Number of samples taken along the reference shape
+
+        Returns:
+            float: The maximum deviation
+        """
+        contour_curve, contour_distances, _ = self._fit_contour_curve(reference_airfoil, "cubic")
+        reference_points = contour_curve(np.linspace(0.0, contour_distances[-1], num_reference_points))
+        resampled_contour = np.concatenate((resampled_airfoil.upper_surface, resampled_airfoil.lower_surface))
+
+        return float(distance_to_polyline(reference_points, resampled_contour).max())
+
+    def resampling_error_curve(self, airfoil: Airfoil, point_counts, spacing: str = "uniform", method: str = "linear") -> np.ndarray:
+        """Measures the resampling error of one spacing and interpolation method over a range of point counts.
+
+        Args:
+            airfoil (Airfoil): The airfoil to resample
+            point_counts (array_like): Numbers of points per surface to evaluate
+            spacing (str): "uniform", "cosine" or "curvature"
+            method (str): "linear", "cubic" or "pchip"
+
+        Returns:
+            np.ndarray: The maximum deviation for each point count
+        """
+        return np.array([self.resampling_error(airfoil, self._spline_resample(airfoil, int(numpoints), spacing, method))
+                         for numpoints in point_counts])
+
+    @staticmethod
+    def _fit_contour_curve(airfoil: Airfoil, method: str):
+        # scipy.interpolate is only needed by the spline resamplers, so it is not loaded with the module
+        from scipy.interpolate import CubicSpline, PchipInterpolator, make_interp_spline
+
+        # Join both surfaces into one contour, sharing the leading edge point when the surfaces meet there
+        if np.array_equal(airfoil.upper_surface[-1], airfoil.lower_surface[0]):
+            contour = np.concatenate((airfoil.upper_surface, airfoil.lower_surface[1:]))
+        else:
+            contour = np.concatenate((airfoil.upper_surface, airfoil.lower_surface))
+        contour_distances = cumulative_arc_length(contour)
+        leading_edge_distance = contour_distances[len(airfoil.upper_surface) - 1]
+
+        # Repeated points have zero arc length between them and would break the interpolants
+        distinct = np.concatenate(([True], np.diff(contour_distances) > 0))
+        contour, contour_distances = contour[distinct], contour_distances[distinct]
+
+        if method == "linear":
+            contour_curve = make_interp_spline(contour_distances, contour, k=1, axis=0)
+        elif method == "cubic":
+            contour_curve = CubicSpline(contour_distances, contour, axis=0)
+        elif method == "pchip":
+            contour_curve = PchipInterpolator(contour_distances, contour, axis=0)
+        else:
+            raise ValueError(f"Method must be 'linear', 'cubic' or 'pchip', got {method!r}")
+
+        return contour_curve, contour_distances, leading_edge_distance
+
+    @staticmethod
+    def _spacing_distances(spacing: str, start: float, end: float, numpoints: int, curvature_curve=None) -> np.ndarray:
+        parameters = np.linspace(0.0, 1.0, numpoints)
+        if spacing == "uniform":
+            return start + (end - start) * parameters
+        if spacing == "cosine":
+            return start + (end - start) * 0.5 * (1.0 - np.cos(np.pi * parameters))
+        if spacing != "curvature":
+            raise ValueError(f"Spacing must be 'uniform', 'cosine' or 'curvature', got {spacing!r}")
+
+        fine_distances = np.linspace(start, end, max(20 * numpoints, 1000))
+        first_derivative = curvature_curve(fine_distances, 1)
+        second_derivative = curvature_curve(fine_distances, 2)
+        cross = first_derivative[:, 0] * second_derivative[:, 1] - first_derivative[:, 1] * second_derivative[:, 0]
+        curvature = np.abs(cross) / np.maximum(np.linalg.norm(first_derivative, axis=1) ** 3, 1e-12)
+
+        # A floor keeps some points on the flat aft section
+        density = np.sqrt(curvature)
+        density += 0.25 * density.mean()
+        cumulative_density = np.concatenate(([0.0], np.cumsum(0.5 * (density[1:] + density[:-1]) * np.diff(fine_distances))))
+
+        return np.interp(parameters * cumulative_density[-1], cumulative_density, fine_distances)
+
 if __name__=="__main__":
+    logging.basicConfig(filename='airfoiltools.log', encoding='utf-8', level=logging.DEBUG)
+    from plotting import morph_animation
+
     # Test resampling
     numpoints = 20
     resampling_steps = 100
@@ -90,63 +276,8 @@ if __name__=="__main__":
     morphed_airfoil = airfoil_tools.morph_profile(resampled_airfoil, airfoil2, 0.5)
     morphed_airfoil._plot_airfoil("50% Morphed Airfoil (between 1 and 2)")
     
-    fig = go.Figure()
     morphed_steps = np.arange(0, 1.01, 1/resampling_steps)  # Include 1.0 in the range
 
-    # Create all traces but set them initially invisible
-    for i, step in enumerate(morphed_steps):
-        # Calculate morphed airfoil for this step first
-        morphed_airfoil = airfoil_tools.morph_profile(resampled_airfoil, airfoil2, step)
-        
-        # Add upper surface trace
-        fig.add_trace(go.Scatter(
-            x=[point[0] for point in morphed_airfoil.upper_surface],
-            y=[point[1] for point in morphed_airfoil.upper_surface],
-            mode="lines",
-            name=f"Upper {step:.1f}",
-            visible=(i==0)  # Only first step visible initially
-        ))
-        
-        # Add lower surface trace
-        fig.add_trace(go.Scatter(
-            x=[point[0] for point in morphed_airfoil.lower_surface],
-            y=[point[1] for point in morphed_airfoil.lower_surface],
-            mode="lines",
-            name=f"Lower {step:.1f}",
-            visible=(i==0)  # Only first step visible initially
-        ))
-
-    # Create steps for slider
-    steps = []
-    for i in range(len(morphed_steps)):
-        step = dict(
-            method="update",
-            args=[
-                {"visible": [False] * len(fig.data)},
-                {"title": f"Morphed Airfoil: {morphed_steps[i]:.1f}"}
-            ],
-        )
-        # Set the current pair of traces (upper and lower) to visible
-        step["args"][0]["visible"][i*2] = True      # Upper surface
-        step["args"][0]["visible"][i*2+1] = True    # Lower surface
-        steps.append(step)
-
-    sliders = [dict(
-        active=0,
-        currentvalue={"prefix": "Morph Percent: "},
-        pad={"t": 10},
-        steps=steps
-    )]
-
-    fig.update_layout(
-        sliders=sliders,
-        title="Airfoil Morphing",
-        xaxis_title="X",
-        yaxis_title="Y",
-        autosize=True
-    )
-    x_figure_range = np.array([-0.5, 1.5])
-    y_figure_range = np.array([-1, 1])*9/16
-    fig.update_layout(xaxis_range=x_figure_range,
-                        yaxis_range=y_figure_range*9/16)
-    fig.show()
\ No newline at end of file
+    # Calculate every morphed airfoil in one batch and animate them as frames of a single trace
+    morphed_upper_surfaces, morphed_lower_surfaces = airfoil_tools.morph_profiles(resampled_airfoil, airfoil2, morphed_steps)
+    morph_animation(morphed_upper_surfaces, morphed_lower_surfaces, morphed_steps).show()
@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+import numpy as np
+from airfoil import Airfoil
+from airfoilfamily import AirfoilFamily
+from airfoiltools import AirfoilTools
+from customfunctions import resample_path_with_endpoints
+from glider import Glider
+from naca import naca4_airfoil, naca4_surfaces, write_dat_file
+from panelmethod import solve_profiles
+
+# Every benchmark runs on synthetic NACA airfoils, so results only depend on the code and the machine.
+# Run "python benchmarks.py --save-baseline" once on a machine, then "python benchmarks.py" after each change.
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+POINT_COUNTS = (10**2, 10**3, 10**4, 10**5, 10**6)
+BATCH_SIZES = (10, 100, 1000, 5000)
+QUICK_POINT_COUNTS = (10**2, 10**3, 10**4)
+QUICK_BATCH_SIZES = (10, 100)
+
+
+class BenchmarkResult:
+    """Timing and memory of one benchmark case"""
+
+    def __init__(self, name: str, median_seconds: float, min_seconds: float, repeats: int, peak_bytes: int) -> None:
+        self.name: str = name
+        self.median_seconds: float = median_seconds
+        self.min_seconds: float = min_seconds
+        self.repeats: int = repeats
+        self.peak_bytes: int = peak_bytes
+
+    def to_dict(self) -> dict:
+        return {"median_seconds": self.median_seconds, "min_seconds": self.min_seconds, "repeats": self.repeats,
+                "peak_bytes": self.peak_bytes}
+
+
+def measure(name: str, function: Callable[[], object], min_time: float = 0.2, min_repeats: int = 3,
+            max_repeats: int = 50) -> BenchmarkResult:
+    """Times a function until min_time has passed, then measures its peak memory in a separate untimed call.
+
+    Args:
+        name (str): Case name
+        function (Callable[[], object]): The work to measure, called with no arguments
+        min_time (float): Total time in seconds to spend on timed calls
+        min_repeats (int): Smallest number of timed calls, so slow cases still report a median
+        max_repeats (int): Largest number of timed calls
+
+    Returns:
+        BenchmarkResult: Median and best time per call and peak traced allocation in bytes
+    """
+    function()  # Warm up caches and lazy imports
+    times: list[float] = []
+    total = 0.0
+    while (total < min_time or len(times) < min_repeats) and len(times) < max_repeats:
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+        total += times[-1]
+
+    # tracemalloc slows every allocation down, so memory is measured apart from the timing
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(name, statistics.median(times), min(times), len(times), peak_bytes)
+
+
+def benchmark_cases(directory: str, point_counts=POINT_COUNTS,
+                    batch_sizes=BATCH_SIZES) -> list[tuple[str, Callable[[], object]]]:
+    """Builds every benchmark case as (name, function), creating its input data up front.
+
+    Args:
+        directory (str): Directory for the generated .dat files
+        point_counts (tuple[int, ...]): Points per surface of the single airfoil cases
+        batch_sizes (tuple[int, ...]): Number of profiles of the batched cases
+
+    Returns:
+        list[tuple[str, Callable[[], object]]]: The cases, smallest first within each group
+    """
+    airfoil_tools = AirfoilTools()
+    cases: list[tuple[str, Callable[[], object]]] = []
+
+    for num_points in point_counts:
+        filepath = os.path.join(directory, f"naca2412-{num_points}.dat")
+        write_dat_file(filepath, "NACA 2412", *naca4_surfaces("2412", num_points))
+        cases.append((f"read_xflr_file/{num_points}", lambda filepath=filepath: Airfoil()._read_xflr_file(filepath)))
+
+    for num_points in point_counts:
+        upper_surface, _ = naca4_surfaces("2412", num_points)
+        cases.append((f"resample_path_with_endpoints/{num_points}",
+                      lambda surface=upper_surface, count=num_points: resample_path_with_endpoints(surface, count)))
+
+    for num_points in point_counts:
+        root_airfoil, tip_airfoil = naca4_airfoil("2412", num_points), naca4_airfoil("4415", num_points)
+        cases.append((f"morph_profile/{num_points}",
+                      lambda root=root_airfoil, tip=tip_airfoil: airfoil_tools.morph_profile(root, tip, 0.5)))
+
+    for num_points in point_counts:
+        airfoil = naca4_airfoil("2412", num_points)
+        # Alternating between two chords keeps the coordinates from drifting over many calls. The scaling is lazy, so
+        # the surfaces are read to include applying it.
+        chords = iter(np.resize([2.0, 1.0], 10**6))
+        cases.append((f"adjust_chord_length/{num_points}",
+                      lambda airfoil=airfoil, chords=chords: airfoil.adjust_chord_length(next(chords)).upper_surface))
+
+    root_airfoil, tip_airfoil = naca4_airfoil("2412", 100), naca4_airfoil("4415", 100)
+    for batch_size in batch_sizes:
+        percentages = np.linspace(0.0, 1.0, batch_size)
+        cases.append((f"morph_profiles/{batch_size}x100",
+                      lambda percentages=percentages: airfoil_tools.morph_profiles(root_airfoil, tip_airfoil, percentages)))
+
+    family = AirfoilFamily([root_airfoil, naca4_airfoil("3414", 100), tip_airfoil], [0.0, 0.5, 1.0], 100)
+    for batch_size in batch_sizes:
+        positions = np.linspace(0.0, 1.0, batch_size)
+        cases.append((f"family_profiles/{batch_size}x100", lambda positions=positions: family.profiles_at(positions)))
+
+    for batch_size in batch_sizes:
+        glider = Glider(root_airfoil, tip_airfoil, num_cells=batch_size, num_points=100, arc_radius=8.0)
+        cases.append((f"rib_profiles/{batch_size + 1}x100", glider.canopy_points))
+
+    # Every rib of a 40 cell wing over an angle of attack sweep
+    alphas = np.linspace(-5.0, 15.0, 41)
+    wing_profiles = Glider(root_airfoil, tip_airfoil, num_cells=40, num_points=100).unit_rib_profiles()
+    cases.append(("panel_method/41x100x41", lambda: solve_profiles(wing_profiles, alphas)))
+
+    return cases
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """Returns a message for every case that got slower or used more memory than its baseline allows.
+
+    Args:
+        results (dict[str, dict]): Current results by case name
+        baseline (dict[str, dict]): Baseline results by case name, cases missing from it are not compared
+        tolerance (float): Allowed relative increase, e.g. 0.25 for 25 %
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["median_seconds"] > reference["median_seconds"] * (1.0 + tolerance):
+            regressions.append(f"{name}: {result['median_seconds'] * 1e3:.3f} ms, baseline "
+                               f"{reference['median_seconds'] * 1e3:.3f} ms")
+        if result["peak_bytes"] > reference["peak_bytes"] * (1.0 + tolerance):
+            regressions.append(f"{name}: peak {result['peak_bytes'] / 2**20:.2f} MiB, baseline "
+                               f"{reference['peak_bytes'] / 2**20:.2f} MiB")
+    return regressions
+
+
+def run_benchmarks(quick: bool = False, pattern: str = "", min_time: float = 0.2) -> dict[str, dict]:
+    """Runs and prints every case whose name contains pattern.
+
+    Returns:
+        dict[str, dict]: Results by case name
+    """
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="airfoil-benchmarks-") as directory:
+        cases = benchmark_cases(directory, *((QUICK_POINT_COUNTS, QUICK_BATCH_SIZES) if quick
+                                             else (POINT_COUNTS, BATCH_SIZES)))
+        print(f"{'Case':<40}{'Median [ms]':>14}{'Best [ms]':>12}{'Runs':>6}{'Peak [MiB]':>12}")
+        for name, function in cases:
+            if pattern not in name:
+                continue
+            result = measure(name, function, min_time)
+            results[name] = result.to_dict()
+            print(f"{name:<40}{result.median_seconds * 1e3:>14.3f}{result.min_seconds * 1e3:>12.3f}"
+                  f"{result.repeats:>6}{result.peak_bytes / 2**20:>12.2f}")
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks airfoil parsing, resampling, morphing and rib generation.")
+    parser.add_argument("--quick", action="store_true", help="Only run the smaller point counts and batch sizes")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds of timed calls per case")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.quick, args.filter, args.min_time)
+
+    if args.save_baseline:
+        baseline = {"machine": platform.platform(), "python": platform.python_version(), "numpy": np.__version__,
+                    "results": results}
+        if os.path.exists(args.baseline):
+            # Keep the cases that were not run this time, e.g. after a --quick or --filter run
+            with open(args.baseline, "r", encoding="utf-8") as file:
+                baseline["results"] = {**json.load(file)["results"], **results}
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare with, run with --save-baseline first")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline["results"], args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import numpy as np
+from instrumentation import instrumented
+
+
+def grid_triangle_indices(num_ribs: int, num_points: int) -> np.ndarray:
+    """Returns the triangles joining neighbouring rib outlines, two per quad of the rib by point grid.
+
+    Triangles are wound counter clockwise seen from outside the canopy, for outlines running from the trailing edge
+    over the upper surface and back along the lower surface with ribs ordered from the left tip to the right tip.
+
+    Args:
+        num_ribs (int): Number of ribs
+        num_points (int): Number of points per rib outline
+
+    Returns:
+        np.ndarray: ((num_ribs - 1) * (num_points - 1) * 6,) uint32 index buffer
+    """
+    rib, point = np.meshgrid(np.arange(num_ribs - 1, dtype=np.uint32), np.arange(num_points - 1, dtype=np.uint32),
+                             indexing="ij")
+    corner = rib * num_points + point
+    next_rib = corner + num_points
+    return np.stack((corner, next_rib, corner + 1, corner + 1, next_rib, next_rib + 1), axis=-1).reshape(-1)
+
+
+def grid_vertex_normals(points: np.ndarray, ribs: np.ndarray | None = None) -> np.ndarray:
+    """Returns unit vertex normals of a rib by point grid from central differences along the span and the outline.
+
+    Args:
+        points (np.ndarray): (R, P, 3) rib outlines
+        ribs (np.ndarray | None): Indices of the ribs to compute normals for, every rib when None
+
+    Returns:
+        np.ndarray: (len(ribs), P, 3) outward unit normals
+    """
+    num_ribs = len(points)
+    ribs = np.arange(num_ribs) if ribs is None else np.asarray(ribs, dtype=np.intp)
+
+    # One sided differences at the tips, matching np.gradient up to scale, which the normalisation removes
+    span_tangents = points[np.minimum(ribs + 1, num_ribs - 1)] - points[np.maximum(ribs - 1, 0)]
+    outline_tangents = np.gradient(points[ribs], axis=1)
+    normals = np.cross(span_tangents, outline_tangents)
+    lengths = np.linalg.norm(normals, axis=-1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+
+class CanopyMesh:
+    """A triangle mesh of the canopy surface with buffers ready for upload to a GPU
+
+    Vertices are the rib outline points, rib after rib, so rib r owns the contiguous vertex range
+    [r * points_per_rib, (r + 1) * points_per_rib). The buffers are contiguous float32 vertices and normals, both
+    (V, 3), and a uint32 triangle index buffer that only depends on the grid size and is built once.
+
+    update_ribs() rewrites the vertices of the changed ribs and the normals of those ribs and their neighbours, and
+    records the vertex range touched in dirty_range so that a viewer only re-uploads that part of its buffers.
+    """
+
+    def __init__(self, rib_points) -> None:
+        rib_points = np.asarray(rib_points)
+        if rib_points.ndim != 3 or rib_points.shape[2] != 3 or len(rib_points) < 2:
+            raise ValueError("A canopy mesh needs at least 2 rib outlines as an (R, P, 3) array")
+        self.num_ribs: int = rib_points.shape[0]
+        self.points_per_rib: int = rib_points.shape[1]
+        self._points: np.ndarray = np.array(rib_points, dtype=np.float64)
+        self.vertices: np.ndarray = np.empty((self.num_ribs * self.points_per_rib, 3), dtype=np.float32)
+        self.normals: np.ndarray = np.empty_like(self.vertices)
+        self.indices: np.ndarray = grid_triangle_indices(self.num_ribs, self.points_per_rib)
+        self.dirty_range: tuple[int, int] = (0, 0)
+        self.update_ribs(np.arange(self.num_ribs), self._points)
+
+    @classmethod
+    def from_glider(cls, glider) -> "CanopyMesh":
+        """Builds the mesh of a glider's rib outlines."""
+        return cls(glider.canopy_points())
+
+    @property
+    def num_triangles(self) -> int:
+        return len(self.indices) // 3
+
+    @instrumented("canopymesh.update_ribs")
+    def update_ribs(self, rib_indices, rib_points) -> tuple[int, int]:
+        """Replaces the outlines of some ribs and refreshes the affected vertices and normals.
+
+        Args:
+            rib_indices (array_like): (K,) indices of the changed ribs
+            rib_points (array_like): (K, P, 3) new outlines of those ribs
+
+        Returns:
+            tuple[int, int]: Start and stop of the vertex range that changed, also stored in dirty_range
+        """
+        rib_indices = np.atleast_1d(np.asarray(rib_indices, dtype=np.intp))
+        if len(rib_indices) == 0:
+            self.dirty_range = (0, 0)
+            return self.dirty_range
+        self._points[rib_indices] = rib_points
+
+        # Normals depend on the neighbouring ribs through the span tangent
+        affected = np.unique(np.clip((rib_indices[:, None] + np.arange(-1, 2)).reshape(-1), 0, self.num_ribs - 1))
+        vertices = self.vertices.reshape(self.num_ribs, self.points_per_rib, 3)
+        normals = self.normals.reshape(self.num_ribs, self.points_per_rib, 3)
+        vertices[rib_indices] = self._points[rib_indices]
+        normals[affected] = grid_vertex_normals(self._points, affected)
+
+        self.dirty_range = (int(affected[0]) * self.points_per_rib, (int(affected[-1]) + 1) * self.points_per_rib)
+        return self.dirty_range
+
+    def update_from_glider(self, glider, rib_indices=None) -> tuple[int, int]:
+        """Refreshes the mesh from a glider, only blending and placing the given ribs.
+
+        The laws are still evaluated for the whole span, which is cheap, because the leading edges follow the largest
+        chord. Profiles are morphed and matrices built for the given ribs only.
+
+        Args:
+            glider (Glider): The wing the mesh was built from
+            rib_indices (array_like | None): Ribs that changed, every rib when None
+
+        Returns:
+            tuple[int, int]: Start and stop of the vertex range that changed
+        """
+        from transforms import place_profiles
+
+        if rib_indices is None:
+            rib_indices = np.arange(self.num_ribs)
+        rib_indices = np.atleast_1d(np.asarray(rib_indices, dtype=np.intp))
+        rib_points = place_profiles(glider.blended_profiles(glider.blends[rib_indices]),
+                                    glider.rib_transforms(rib_indices=rib_indices))
+        return self.update_ribs(rib_indices, rib_points)
+
+    def interleaved(self) -> np.ndarray:
+        """Returns a contiguous (V, 6) float32 buffer of position and normal per vertex, for a single interleaved VBO."""
+        return np.ascontiguousarray(np.concatenate((self.vertices, self.normals), axis=1))
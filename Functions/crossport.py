@@ -0,0 +1,318 @@
+import numpy as np
+from customfunctions import interp_rows
+from instrumentation import instrumented
+
+
+class Crossport:
+    """A crossport (vent hole) shape, stored as a closed polygon outline around its centre
+
+    Ellipses are polygons with num_vertices vertices, so every port is handled by the same polygon code.
+    """
+
+    def __init__(self, outline) -> None:
+        outline = np.asarray(outline, dtype=np.float64)
+        if outline.ndim != 2 or outline.shape[1] != 2 or len(outline) < 3:
+            raise ValueError("A crossport outline needs at least 3 (x, y) vertices")
+        self.outline: np.ndarray = outline
+
+    @classmethod
+    def ellipse(cls, width: float, height: float, num_vertices: int = 32, rotation: float = 0.0) -> "Crossport":
+        """Creates an elliptical port.
+
+        Args:
+            width (float): Full width along the chord
+            height (float): Full height across the rib
+            num_vertices (int): Number of polygon vertices approximating the ellipse
+            rotation (float): Rotation in degrees, counter clockwise
+
+        Returns:
+            Crossport: The port
+        """
+        return cls(ellipse_outlines(np.array(width), np.array(height), num_vertices, rotation))
+
+    @classmethod
+    def polygon(cls, vertices) -> "Crossport":
+        """Creates a polygonal port from vertices given relative to its centre."""
+        return cls(vertices)
+
+    @property
+    def area(self) -> float:
+        """Area enclosed by the outline"""
+        return float(polygon_areas(self.outline))
+
+    def placed(self, position) -> np.ndarray:
+        """Returns the outline moved to a position in rib coordinates."""
+        return self.outline + np.asarray(position, dtype=np.float64)
+
+
+def ellipse_outlines(widths, heights, num_vertices: int = 32, rotation: float = 0.0) -> np.ndarray:
+    """Returns polygon outlines of ellipses centred on the origin, one per width and height.
+
+    Args:
+        widths (array_like): (...,) full widths
+        heights (array_like): (...,) full heights
+        num_vertices (int): Number of vertices per ellipse
+        rotation (float): Rotation of every ellipse in degrees, counter clockwise
+
+    Returns:
+        np.ndarray: (..., num_vertices, 2) outlines, counter clockwise
+    """
+    angles = np.linspace(0.0, 2.0 * np.pi, num_vertices, endpoint=False)
+    unit_circle = np.stack((np.cos(angles), np.sin(angles)), axis=1)
+    if rotation:
+        theta = np.radians(rotation)
+        unit_rotation = np.array([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]])
+    else:
+        unit_rotation = np.eye(2)
+    semi_axes = 0.5 * np.stack(np.broadcast_arrays(widths, heights), axis=-1)
+
+    return (semi_axes[..., None, :] * unit_circle) @ unit_rotation.T
+
+
+def polygon_areas(outlines) -> np.ndarray:
+    """Returns the shoelace area of each polygon in a stack of (..., V, 2) outlines."""
+    outlines = np.asarray(outlines, dtype=np.float64)
+    x, y = outlines[..., 0], outlines[..., 1]
+    return 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y, axis=-1))
+
+
+def points_in_polygons(points, polygons) -> np.ndarray:
+    """Even-odd test of points against closed polygons.
+
+    Args:
+        points (array_like): (..., P, 2) points
+        polygons (array_like): (..., V, 2) polygon outlines, broadcast against points over the leading dimensions
+
+    Returns:
+        np.ndarray: (..., P) True where a point lies inside its polygon
+    """
+    points = np.asarray(points, dtype=np.float64)[..., :, None, :]
+    starts = np.asarray(polygons, dtype=np.float64)[..., None, :, :]
+    ends = np.roll(starts, -1, axis=-2)
+    x, y = points[..., 0], points[..., 1]
+    # Count the edges crossed by a ray from each point towards +x
+    spans = (starts[..., 1] > y) != (ends[..., 1] > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = (ends[..., 0] - starts[..., 0]) / (ends[..., 1] - starts[..., 1])
+        crossing_x = starts[..., 0] + (y - starts[..., 1]) * slopes
+    return np.count_nonzero(spans & (x < crossing_x), axis=-1) % 2 == 1
+
+
+def _point_segment_distances(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Returns the (..., P, S) distances from (..., P, 2) points to (..., S, 2) segments."""
+    vectors = (ends - starts)[..., None, :, :]
+    offsets = points[..., :, None, :] - starts[..., None, :, :]
+    lengths_squared = np.einsum("...d,...d->...", vectors, vectors)
+    projections = np.divide(np.einsum("...d,...d->...", offsets, vectors), lengths_squared,
+                            out=np.zeros(np.broadcast_shapes(offsets.shape[:-1], lengths_squared.shape)),
+                            where=lengths_squared > 0)
+    return np.linalg.norm(offsets - np.clip(projections, 0.0, 1.0)[..., None] * vectors, axis=-1)
+
+
+def outline_separations(first, second) -> np.ndarray:
+    """Returns the material width between pairs of closed outlines.
+
+    The width is the smallest distance between any edge of one outline and any edge of the other, and 0 where the
+    edges cross or one outline lies inside the other.
+
+    Args:
+        first (array_like): (..., V, 2) outlines
+        second (array_like): (..., W, 2) outlines, broadcast against first over the leading dimensions
+
+    Returns:
+        np.ndarray: (...) separations
+    """
+    first = np.asarray(first, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    first_ends, second_ends = np.roll(first, -1, axis=-2), np.roll(second, -1, axis=-2)
+
+    # Without crossing edges the closest approach of two segments is at an end point of one of them
+    distances = np.minimum(_point_segment_distances(first, second, second_ends).min(axis=(-2, -1)),
+                           _point_segment_distances(second, first, first_ends).min(axis=(-2, -1)))
+
+    def orientations(origins, directions, points):
+        # Sign of the cross product of each (V) edge of one outline with the (W) vertices of the other
+        edge_vectors = (directions - origins)[..., :, None, :]
+        offsets = points[..., None, :, :] - origins[..., :, None, :]
+        return np.sign(edge_vectors[..., 0] * offsets[..., 1] - edge_vectors[..., 1] * offsets[..., 0])
+
+    # Edge i of first crosses edge j of second when each edge separates the end points of the other
+    first_sides = orientations(first, first_ends, second)
+    second_sides = orientations(second, second_ends, first)
+    crosses = ((first_sides * np.roll(first_sides, -1, axis=-1) < 0)
+               & (second_sides * np.roll(second_sides, -1, axis=-1) < 0).swapaxes(-2, -1)).any(axis=(-2, -1))
+
+    # Without crossings one vertex decides whether an outline is nested inside the other
+    nested = (points_in_polygons(first[..., :1, :], second)[..., 0]
+              | points_in_polygons(second[..., :1, :], first)[..., 0])
+    return np.where(crosses | nested, 0.0, distances)
+
+
+def clip_crossports(profiles, num_points: int, outlines, margin: float) -> np.ndarray:
+    """Clips port outlines to the part of the rib that keeps margin of material to the surfaces.
+
+    Each vertex is clamped into the band between lower + margin and upper - margin at its own x, and into the chord
+    less margin at either end. This is exact at the vertices and close enough between them for the densely sampled
+    outlines used for ports, while staying a handful of array operations for every port of every rib.
+
+    Args:
+        profiles (array_like): (R, 2 * num_points, 2) rib profiles, upper surface (trailing to leading edge) first
+        num_points (int): Number of points per surface
+        outlines (array_like): (R, H, V, 2) placed port outlines in the coordinates of their rib
+        margin (float): Material width to keep to the surfaces
+
+    Returns:
+        np.ndarray: (R, H, V, 2) clipped outlines
+    """
+    profiles = np.asarray(profiles, dtype=np.float64)
+    clipped = np.array(outlines, dtype=np.float64)
+    num_ribs = len(profiles)
+    upper_surfaces, lower_surfaces = profiles[:, :num_points], profiles[:, num_points:]
+    vertices = clipped.reshape(num_ribs, -1, 2)
+
+    x_min = lower_surfaces[:, 0, 0][:, None] + margin
+    x_max = lower_surfaces[:, -1, 0][:, None] - margin
+    vertices[..., 0] = np.clip(vertices[..., 0], x_min, x_max)
+    # The vertical offset is stretched by the local slope so that the material left is margin wide normal to the surface
+    upper_x, upper_surface_y = upper_surfaces[:, ::-1, 0], upper_surfaces[:, ::-1, 1]
+    lower_x, lower_surface_y = lower_surfaces[..., 0], lower_surfaces[..., 1]
+    upper_slopes, lower_slopes = (
+        np.divide(np.gradient(y, axis=1), np.gradient(x, axis=1), out=np.zeros_like(y), where=np.gradient(x, axis=1) > 0)
+        for x, y in ((upper_x, upper_surface_y), (lower_x, lower_surface_y)))
+    upper_y = (interp_rows(vertices[..., 0], upper_x, upper_surface_y)
+               - margin * np.sqrt(1.0 + interp_rows(vertices[..., 0], upper_x, upper_slopes) ** 2))
+    lower_y = (interp_rows(vertices[..., 0], lower_x, lower_surface_y)
+               + margin * np.sqrt(1.0 + interp_rows(vertices[..., 0], lower_x, lower_slopes) ** 2))
+    # Where the rib is thinner than two margins the band is empty and the vertex collapses onto its centre line
+    vertices[..., 1] = np.where(upper_y > lower_y, np.clip(vertices[..., 1], lower_y, upper_y), 0.5 * (upper_y + lower_y))
+
+    return clipped
+
+
+@instrumented("crossport.validate_crossports")
+def validate_crossports(profiles, num_points: int, outlines, margin: float) -> tuple[np.ndarray, np.ndarray]:
+    """Checks that every port lies inside its rib with at least margin of material around it.
+
+    Clearance to the rib outline comes from a single SegmentIndex over the outline segments of every rib, each rib
+    shifted apart in x so that its segments never mix with another rib's. The search is exact however coarsely an
+    outline is sampled. Ports must also keep margin from each other, measured between their edges, and a port inside another
+    one is invalid.
+
+    Args:
+        profiles (array_like): (R, 2 * num_points, 2) rib profiles, upper surface (trailing to leading edge) first
+        num_points (int): Number of points per surface
+        outlines (array_like): (R, H, V, 2) placed port outlines in the coordinates of their rib
+        margin (float): Minimum material width between a port and the rib outline or another port
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (R, H) boolean validity and (R, H) clearance to the rib outline (negative
+            when a port crosses it)
+    """
+    from scipy.spatial import cKDTree
+    from airfoilquery import SegmentIndex
+
+    profiles = np.asarray(profiles, dtype=np.float64)
+    outlines = np.asarray(outlines, dtype=np.float64)
+    num_ribs, num_ports, num_vertices, _ = outlines.shape
+    upper_surfaces = profiles[:, :num_points]
+    lower_surfaces = profiles[:, num_points:]
+
+    # Clearance from every port vertex to the nearest point of its rib outline
+    contour = profiles
+    shift = 2.0 * (np.ptp(contour[..., 0]) + np.ptp(outlines[..., 0]) + margin + 1.0) * np.arange(num_ribs)
+    shifted_contour = contour.copy()
+    shifted_contour[..., 0] += shift[:, None]
+    shifted_vertices = outlines.reshape(num_ribs, -1, 2).copy()
+    shifted_vertices[..., 0] += shift[:, None]
+    query_points = shifted_vertices.reshape(-1, 2)
+
+    segment_index = SegmentIndex(shifted_contour[:, :-1], shifted_contour[:, 1:])
+    _, vertex_distances, _ = segment_index.nearest(query_points, workers=-1)
+
+    # Vertices outside the rib count as negative clearance
+    vertices = outlines.reshape(num_ribs, -1, 2)
+    upper_order = np.argsort(upper_surfaces[..., 0], axis=1, kind="stable")
+    lower_order = np.argsort(lower_surfaces[..., 0], axis=1, kind="stable")
+    upper_y = interp_rows(vertices[..., 0], np.take_along_axis(upper_surfaces[..., 0], upper_order, axis=1),
+                          np.take_along_axis(upper_surfaces[..., 1], upper_order, axis=1))
+    lower_y = interp_rows(vertices[..., 0], np.take_along_axis(lower_surfaces[..., 0], lower_order, axis=1),
+                          np.take_along_axis(lower_surfaces[..., 1], lower_order, axis=1))
+    x_min = np.minimum(upper_surfaces[..., 0].min(axis=1), lower_surfaces[..., 0].min(axis=1))[:, None]
+    x_max = np.maximum(upper_surfaces[..., 0].max(axis=1), lower_surfaces[..., 0].max(axis=1))[:, None]
+    inside = (vertices[..., 1] < upper_y) & (vertices[..., 1] > lower_y) & (vertices[..., 0] > x_min) & (vertices[..., 0] < x_max)
+    signed_distances = np.where(inside, vertex_distances.reshape(num_ribs, -1), -vertex_distances.reshape(num_ribs, -1))
+    clearance = signed_distances.reshape(num_ribs, num_ports, num_vertices).min(axis=2)
+
+    # Ports on the same rib must keep margin between their outlines and must not contain one another. The ribs are
+    # already shifted apart, so pairs found by one tree over every port never span two ribs.
+    valid = clearance >= margin
+    if num_ports > 1:
+        shifted_outlines = shifted_vertices.reshape(-1, num_vertices, 2)
+        # Edges closer than margin, or crossing, bring some pair of their vertices within margin plus the longest
+        # edge, so only port pairs with such vertices need the exact edge to edge separation
+        longest_edge = np.linalg.norm(np.roll(shifted_outlines, -1, axis=1) - shifted_outlines, axis=2).max()
+        close_pairs = cKDTree(query_points).query_pairs(margin + longest_edge, output_type="ndarray") // num_vertices
+        close_pairs = np.unique(np.sort(close_pairs[close_pairs[:, 0] != close_pairs[:, 1]], axis=1), axis=0)
+        separations = outline_separations(shifted_outlines[close_pairs[:, 0]], shifted_outlines[close_pairs[:, 1]])
+        valid.reshape(-1)[close_pairs[separations < margin].reshape(-1)] = False
+
+        # A port nested inside another can keep its vertices away from the outer edges, so one vertex of every pair
+        # with overlapping bounding circles is tested for containment
+        centres = shifted_outlines.mean(axis=1)
+        radii = np.linalg.norm(shifted_outlines - centres[:, None, :], axis=2).max(axis=1)
+        port_pairs = cKDTree(centres).query_pairs(radii.max(), output_type="ndarray")
+        first, second = shifted_outlines[port_pairs[:, 0]], shifted_outlines[port_pairs[:, 1]]
+        nested = points_in_polygons(first[:, :1], second)[:, 0] | points_in_polygons(second[:, :1], first)[:, 0]
+        valid.reshape(-1)[port_pairs[nested].reshape(-1)] = False
+
+    return valid, clearance
+
+
+def layout_crossports(glider, chord_fractions, height_fractions, width_fractions, thickness_fractions,
+                      margin: float, num_vertices: int = 32,
+                      clip: bool = False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Places elliptical ports on every rib of a glider at once and validates them.
+
+    Every port is defined relative to its rib, so one layout scales along the span. Arguments are (H,) for a layout
+    shared by every rib or (ribs, H) for per rib layouts.
+
+    Args:
+        glider (Glider): The wing
+        chord_fractions (array_like): Port centre position along the chord
+        height_fractions (array_like): Port centre height between the lower (0) and upper (1) surface
+        width_fractions (array_like): Port width as a fraction of the rib chord
+        thickness_fractions (array_like): Port height as a fraction of the local rib thickness
+        margin (float): Minimum material width around each port
+        num_vertices (int): Number of vertices per ellipse
+        clip (bool): Clip ports that reach into the margin instead of only flagging them
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: (ribs, H, V, 2) port outlines in untwisted rib coordinates,
+            (ribs, H) validity and (ribs, H) clearance
+    """
+    chords = glider.chords
+    num_points = glider.num_points
+    profiles = glider.unit_rib_profiles() * chords[:, None, None]
+    num_ribs = len(chords)
+
+    shape = np.broadcast_shapes(np.shape(chord_fractions), np.shape(height_fractions), np.shape(width_fractions),
+                                np.shape(thickness_fractions))
+    chord_fractions, height_fractions, width_fractions, thickness_fractions = (
+        np.broadcast_to(np.asarray(values, dtype=np.float64), (num_ribs,) + shape[-1:])
+        for values in (chord_fractions, height_fractions, width_fractions, thickness_fractions))
+
+    # Local surface heights at every port centre, one batched interpolation per surface
+    centre_x = chord_fractions * chords[:, None]
+    upper_surfaces, lower_surfaces = profiles[:, :num_points], profiles[:, num_points:]
+    upper_y = interp_rows(centre_x, upper_surfaces[:, ::-1, 0], upper_surfaces[:, ::-1, 1])
+    lower_y = interp_rows(centre_x, lower_surfaces[..., 0], lower_surfaces[..., 1])
+    centre_y = lower_y + height_fractions * (upper_y - lower_y)
+
+    outlines = ellipse_outlines(width_fractions * chords[:, None], thickness_fractions * (upper_y - lower_y), num_vertices)
+    outlines = outlines + np.stack((centre_x, centre_y), axis=-1)[..., None, :]
+    if clip:
+        # Clipping is exact at the vertices only, the extra percent keeps the material between them above margin
+        outlines = clip_crossports(profiles, num_points, outlines, 1.01 * margin)
+    valid, clearance = validate_crossports(profiles, num_points, outlines, margin)
+
+    return outlines, valid, clearance
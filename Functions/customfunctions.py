@@ -1,98 +1,174 @@
 import numpy as np
-from scipy.spatial.distance import euclidean
 
-def point_at_arc_length_percentage(list_of_points: list[np.ndarray], percentage: float):
+
+def cumulative_arc_length(points) -> np.ndarray:
+    """
+    Returns the cumulative arc length at every point of a path, or of a stack of paths.
+
+    Args:
+        points: (N, D) array of points along one path, or (..., N, D) stack of paths with the same point count
+
+    Returns:
+        (..., N) array of arc lengths measured from the first point of each path
+    """
+    points = np.asarray(points, dtype=np.float64)
+    segment_lengths = np.linalg.norm(np.diff(points, axis=-2), axis=-1)
+
+    cumulative_distances = np.zeros(points.shape[:-1])
+    np.cumsum(segment_lengths, axis=-1, out=cumulative_distances[..., 1:])
+
+    return cumulative_distances
+
+def points_at_arc_length_fractions(points, fractions, cumulative_distances=None) -> np.ndarray:
+    """
+    Returns the positions at any number of arc length fractions along a path, or along each path of a stack, in
+    one batched lookup.
+
+    Args:
+        points: (N, D) array of points along one path, or (..., N, D) stack of paths with the same point count
+        fractions: (K,) fractions between 0 and 1 shared by every path, or (..., K) fractions per path
+        cumulative_distances: Optional precomputed result of cumulative_arc_length(points)
+
+    Returns:
+        (..., K, D) array of positions
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim < 2 or points.shape[-2] < 2:
+        raise ValueError("A path needs at least 2 points")
+    if cumulative_distances is None:
+        cumulative_distances = cumulative_arc_length(points)
+
+    batch_shape = points.shape[:-2]
+    num_points, dimensions = points.shape[-2:]
+    fractions = np.asarray(fractions, dtype=np.float64)
+    num_fractions = fractions.shape[-1] if fractions.ndim else 1
+
+    # Flatten any stack of paths into (M, N, D) and give every path its own row of fractions
+    paths = points.reshape(-1, num_points, dimensions)
+    num_paths = paths.shape[0]
+    fractions = np.broadcast_to(fractions, batch_shape + (num_fractions,)).reshape(num_paths, num_fractions)
+
+    cumulative_distances = np.asarray(cumulative_distances, dtype=np.float64).reshape(num_paths, num_points)
+    target_distances = fractions * cumulative_distances[:, -1:]
+
+    if num_paths == 1:
+        # A single path searches its own table directly, O(K log N) with nothing rebuilt per call
+        segment_index = np.searchsorted(cumulative_distances[0], target_distances[0])[None, :] - 1
+    else:
+        # Offsetting each path by twice the length of the paths before it keeps the flattened table sorted, so a
+        # single searchsorted covers every path (fractions up to 2 stay within their own path)
+        path_spans = 2.0 * cumulative_distances[:, -1:] + 1.0
+        offsets = np.cumsum(path_spans, axis=0) - path_spans
+        segment_index = np.searchsorted((cumulative_distances + offsets).ravel(), (target_distances + offsets).ravel())
+        segment_index = segment_index.reshape(num_paths, num_fractions) - 1 - num_points * np.arange(num_paths)[:, None]
+    segment_index = np.clip(segment_index, 0, num_points - 2)
+
+    # Calculate how far along each segment the targets are
+    path_index = np.arange(num_paths)[:, None]
+    segment_start_distance = cumulative_distances[path_index, segment_index]
+    segment_length = cumulative_distances[path_index, segment_index + 1] - segment_start_distance
+    segment_percentage = np.divide(target_distances - segment_start_distance, segment_length,
+                                   out=np.zeros_like(target_distances), where=segment_length > 0)
+
+    # Interpolate between the points
+    start_points = paths[path_index, segment_index]
+    end_points = paths[path_index, segment_index + 1]
+    positions = start_points + segment_percentage[..., None] * (end_points - start_points)
+
+    return positions.reshape(batch_shape + (num_fractions, dimensions))
+
+def point_at_arc_length_percentage(list_of_points, percentage: float):
     """
     Returns the position vector at a given percentage along a path defined by points.
-    
+
     Args:
-        points: List of points (each point is a tuple or array of coordinates)
+        points: (N, D) array or list of points (each point is a tuple or array of coordinates)
         percentage: Float between 0 and 1 representing the percentage along the path
-    
+
     Returns:
         Position vector (coordinates) at the given percentage
     """
-    
-    # Calculate distances between consecutive points
-    distances = [euclidean(list_of_points[i], list_of_points[i+1]) for i in range(len(list_of_points)-1)]
-    
-    # Calculate cumulative distances (arc lengths)
-    cumulative_distances = np.cumsum([0] + distances)
-    
-    # Total path length
-    total_length = cumulative_distances[-1]
-    
-    # Target distance along the path
-    target_distance = percentage * total_length
-    
-    # Find the segment that contains the target distance
-    segment_index = np.searchsorted(cumulative_distances, target_distance) - 1
-    segment_index = max(0, min(segment_index, len(list_of_points)-2))  # Ensure valid index
-    
-    # Calculate how far along the segment the target is
-    segment_start_distance = cumulative_distances[segment_index]
-    segment_length = distances[segment_index]
-    segment_percentage = (target_distance - segment_start_distance) / segment_length if segment_length > 0 else 0
-    
-    # Interpolate between the points
-    start_point = np.array(list_of_points[segment_index])
-    end_point = np.array(list_of_points[segment_index + 1])
-    position = start_point + segment_percentage * (end_point - start_point)
-    
-    return position
 
-def resample_path_with_endpoints(list_of_points: list[np.ndarray], num_samples: int):
+    return points_at_arc_length_fractions(list_of_points, [percentage])[..., 0, :]
+
+def resample_path_with_endpoints(list_of_points, num_samples: int, cumulative_distances=None):
     """
     Resamples a path defined by points to have exactly num_samples points,
     guaranteeing that the first and last original points are included.
-    
+
     Args:
-        points: List of points (each point is a tuple or array of coordinates)
+        points: (N, D) array or list of points, or a (..., N, D) stack of paths which are resampled together
         num_samples: Number of points in the output (must be >= 2)
-    
+        cumulative_distances: Optional precomputed result of cumulative_arc_length(points)
+
     Returns:
-        List of resampled points with exactly num_samples points
+        (num_samples, D) array of resampled points, or (..., num_samples, D) for a stack of paths
     """
     if num_samples < 2:
         raise ValueError("Number of samples must be at least 2")
-    
-    # Calculate distances between consecutive points
-    distances = [euclidean(list_of_points[i], list_of_points[i+1]) for i in range(len(list_of_points)-1)]
-    
-    # Calculate cumulative distances (arc lengths)
-    cumulative_distances = np.cumsum([0] + distances)
-    
-    # Total path length
-    total_length = cumulative_distances[-1]
-    
-    # Initialize result with the first point
-    resampled_points = [np.array(list_of_points[0])]
-    
-    # Calculate internal points (everything except first and last)
-    if num_samples > 2:
-        # Create percentages that exclude 0 and 1
-        percentages = np.linspace(0, 1, num_samples)[1:-1]
-        
-        for percentage in percentages:
-            target_distance = percentage * total_length
-            
-            # Find the segment that contains the target distance
-            segment_index = np.searchsorted(cumulative_distances, target_distance) - 1
-            segment_index = max(0, min(segment_index, len(list_of_points)-2))
-            
-            # Calculate how far along the segment the target is
-            segment_start_distance = cumulative_distances[segment_index]
-            segment_length = distances[segment_index]
-            segment_percentage = (target_distance - segment_start_distance) / segment_length if segment_length > 0 else 0
-            
-            # Interpolate between the points
-            start_point = np.array(list_of_points[segment_index])
-            end_point = np.array(list_of_points[segment_index + 1])
-            position = start_point + segment_percentage * (end_point - start_point)
-            
-            resampled_points.append(position)
-    
-    # Add the last point
-    resampled_points.append(np.array(list_of_points[-1]))
-    
-    return resampled_points
\ No newline at end of file
+
+    points = np.asarray(list_of_points, dtype=np.float64)
+    resampled_points = points_at_arc_length_fractions(points, np.linspace(0, 1, num_samples), cumulative_distances)
+
+    # Pin the end points exactly rather than relying on the interpolation round trip
+    resampled_points[..., 0, :] = points[..., 0, :]
+    resampled_points[..., -1, :] = points[..., -1, :]
+
+    return resampled_points
+
+def distance_to_polyline(points, polyline) -> np.ndarray:
+    """
+    Returns the shortest distance from each point to a polyline.
+
+    Args:
+        points: (M, D) array of query points
+        polyline: (N, D) array of polyline vertices (N >= 2)
+
+    Returns:
+        (M,) array of distances
+    """
+    points = np.asarray(points, dtype=np.float64)
+    polyline = np.asarray(polyline, dtype=np.float64)
+    segment_starts = polyline[:-1]
+    segment_vectors = np.diff(polyline, axis=0)
+    segment_lengths_squared = np.einsum("ij,ij->i", segment_vectors, segment_vectors)
+
+    # Project every point onto every segment at once, (M, N - 1)
+    offsets = points[:, None, :] - segment_starts[None, :, :]
+    projections = np.divide(np.einsum("mnd,nd->mn", offsets, segment_vectors), segment_lengths_squared,
+                            out=np.zeros(offsets.shape[:2]), where=segment_lengths_squared > 0)
+    projections = np.clip(projections, 0.0, 1.0)
+    closest_offsets = offsets - projections[..., None] * segment_vectors[None, :, :]
+
+    return np.sqrt(np.einsum("mnd,mnd->mn", closest_offsets, closest_offsets).min(axis=1))
+
+def interp_rows(x, xp, fp) -> np.ndarray:
+    """
+    Batched np.interp: interpolates each row of a stack of 1D functions in one call.
+
+    Args:
+        x: (S,) query positions shared by every row, or (M, S) positions per row
+        xp: (M, N) sample positions, increasing along each row
+        fp: (M, N) sample values
+
+    Returns:
+        (M, S) array of interpolated values, clamped to the end values outside each row
+    """
+    xp = np.asarray(xp, dtype=np.float64)
+    fp = np.asarray(fp, dtype=np.float64)
+    num_rows, num_samples = xp.shape
+    x = np.broadcast_to(np.asarray(x, dtype=np.float64), (num_rows, np.shape(x)[-1]))
+
+    # Clamp to each row's range, then shift rows apart so that one searchsorted covers the whole stack
+    x = np.clip(x, xp[:, :1], xp[:, -1:])
+    row_spans = xp[:, -1:] - xp[:, :1] + 1.0
+    offsets = np.cumsum(row_spans, axis=0) - row_spans - xp[:, :1]
+    segment_index = np.searchsorted((xp + offsets).ravel(), (x + offsets).ravel(), side="right").reshape(x.shape)
+    segment_index = np.clip(segment_index - 1 - num_samples * np.arange(num_rows)[:, None], 0, num_samples - 2)
+
+    rows = np.arange(num_rows)[:, None]
+    x0, x1 = xp[rows, segment_index], xp[rows, segment_index + 1]
+    f0, f1 = fp[rows, segment_index], fp[rows, segment_index + 1]
+    weights = np.divide(x - x0, x1 - x0, out=np.zeros(x.shape), where=x1 > x0)
+
+    return f0 + weights * (f1 - f0)
@@ -0,0 +1,271 @@
+import logging
+from typing import Callable
+import numpy as np
+from airfoil import Airfoil
+from airfoilfamily import AirfoilFamily
+from airfoiltools import AirfoilTools
+from instrumentation import instrumented
+from rib import Rib
+from transforms import compose, place_profiles, rotation_matrices, scale_matrices, translation_matrices
+
+logger = logging.getLogger(__name__)
+
+
+class EllipticalChordLaw:
+    """A chord law that blends from root_chord to tip_chord along a quarter ellipse
+
+    Laws are plain callables of the normalised span position (0 at the centre, 1 at the tip). They are kept as
+    module-level classes and functions rather than lambdas so that a Glider can be sent to worker processes.
+    """
+
+    def __init__(self, root_chord: float, tip_chord: float) -> None:
+        self.root_chord: float = root_chord
+        self.tip_chord: float = tip_chord
+
+    def __call__(self, eta: np.ndarray) -> np.ndarray:
+        return self.tip_chord + (self.root_chord - self.tip_chord) * np.sqrt(np.clip(1.0 - eta**2, 0.0, 1.0))
+
+
+def zero_twist_law(eta: np.ndarray) -> np.ndarray:
+    """No twist anywhere along the span"""
+    return np.zeros_like(eta)
+
+
+def linear_blend_law(eta: np.ndarray) -> np.ndarray:
+    """Blends linearly from the root airfoil at the centre to the tip airfoil at the tips"""
+    return eta
+
+
+class ScaledBlendLaw:
+    """Scales another blend law, e.g. to sweep how far the wing morphs towards the tip airfoil"""
+
+    def __init__(self, blend_law: Callable[[np.ndarray], np.ndarray], scale: float) -> None:
+        self.blend_law: Callable[[np.ndarray], np.ndarray] = blend_law
+        self.scale: float = scale
+
+    def __call__(self, eta: np.ndarray) -> np.ndarray:
+        return self.scale * self.blend_law(eta)
+
+
+class Glider:
+    """A paraglider wing defined by span laws evaluated at its rib stations
+
+    Ribs are spaced evenly across the flat span, num_cells + 1 of them. Every law is a vectorised function of the
+    normalised span position eta = |y| / (span / 2), so the wing is symmetric about its centre:
+
+    - chord_law(eta): chord length
+    - twist_law(eta): twist in degrees, positive nose up
+    - blend_law(eta): morph fraction from the root airfoil (0) to the tip airfoil (1)
+
+    With an AirfoilFamily set through set_airfoil_family(), the blend value is instead the family position, so any
+    number of key airfoils between the root (0) and the tip (1) is blended at the cost of a root to tip morph.
+
+    Rib profiles are generated for all ribs at once as a (ribs, 2 * num_points, 2) array, upper surface first, using
+    one batched morph of the resampled root and tip airfoils.
+
+    In 3D the span positions are measured along the arc. With an arc_radius the ribs sit on a circular arc in the
+    y-z plane, each rolled to stay perpendicular to it. Leading edges are offset in x so that the quarter chord line
+    is straight.
+    """
+
+    def __init__(self, root_airfoil: Airfoil, tip_airfoil: Airfoil | None = None, span: float = 10.0,
+                 num_cells: int = 40, num_points: int = 100, chord_law: Callable[[np.ndarray], np.ndarray] | None = None,
+                 twist_law: Callable[[np.ndarray], np.ndarray] | None = None,
+                 blend_law: Callable[[np.ndarray], np.ndarray] | None = None, arc_radius: float | None = None,
+                 name: str = "Generic Glider") -> None:
+        if num_cells < 1:
+            raise ValueError("A glider needs at least one cell")
+        self.name: str = name
+        self.root_airfoil: Airfoil = root_airfoil
+        self.tip_airfoil: Airfoil = tip_airfoil if tip_airfoil is not None else root_airfoil
+        self.span: float = span
+        self.num_cells: int = num_cells
+        self.num_points: int = num_points
+        self.chord_law: Callable[[np.ndarray], np.ndarray] = chord_law or EllipticalChordLaw(2.5, 0.6)
+        self.twist_law: Callable[[np.ndarray], np.ndarray] = twist_law or zero_twist_law
+        self.blend_law: Callable[[np.ndarray], np.ndarray] = blend_law or linear_blend_law
+        self.arc_radius: float | None = arc_radius
+
+        self._airfoil_tools = AirfoilTools()
+        self._resampled_airfoils: tuple[Airfoil, Airfoil] | None = None
+        self.airfoil_family: AirfoilFamily | None = None
+
+    @property
+    def num_ribs(self) -> int:
+        return self.num_cells + 1
+
+    @property
+    def span_positions(self) -> np.ndarray:
+        """(ribs,) span position y of every rib, from the left tip to the right tip"""
+        return np.linspace(-0.5 * self.span, 0.5 * self.span, self.num_ribs)
+
+    @property
+    def eta(self) -> np.ndarray:
+        """(ribs,) normalised span position of every rib, 0 at the centre and 1 at the tips"""
+        return np.abs(self.span_positions) / (0.5 * self.span)
+
+    @property
+    def chords(self) -> np.ndarray:
+        """(ribs,) chord of every rib"""
+        return np.broadcast_to(np.asarray(self.chord_law(self.eta), dtype=np.float64), (self.num_ribs,))
+
+    @property
+    def twists(self) -> np.ndarray:
+        """(ribs,) twist of every rib in degrees"""
+        return np.broadcast_to(np.asarray(self.twist_law(self.eta), dtype=np.float64), (self.num_ribs,))
+
+    @property
+    def blends(self) -> np.ndarray:
+        """(ribs,) morph fraction from the root to the tip airfoil of every rib"""
+        return np.clip(np.broadcast_to(np.asarray(self.blend_law(self.eta), dtype=np.float64), (self.num_ribs,)), 0.0, 1.0)
+
+    @property
+    def arc_angles(self) -> np.ndarray:
+        """(ribs,) angle of every rib around the arc in radians, positive on the right wing"""
+        if self.arc_radius is None:
+            return np.zeros(self.num_ribs)
+        return self.span_positions / self.arc_radius
+
+    @property
+    def leading_edge_positions(self) -> np.ndarray:
+        """(ribs, 3) world position of every rib leading edge"""
+        return self.leading_edge_positions_for(self.chords)
+
+    def leading_edge_positions_for(self, chords: np.ndarray) -> np.ndarray:
+        """Returns the (ribs, 3) leading edge positions that keep the quarter chord line straight for (ribs,) chords."""
+        positions = np.empty((self.num_ribs, 3))
+        positions[:, 0] = 0.25 * (chords.max() - chords)
+        if self.arc_radius is None:
+            positions[:, 1] = self.span_positions
+            positions[:, 2] = 0.0
+        else:
+            angles = self.arc_angles
+            positions[:, 1] = self.arc_radius * np.sin(angles)
+            positions[:, 2] = self.arc_radius * (np.cos(angles) - 1.0)
+        return positions
+
+    @property
+    def rib_rotations(self) -> np.ndarray:
+        """(ribs, 3) roll, twist and yaw of every rib in degrees, as stored on Rib.rotation"""
+        rotations = np.zeros((self.num_ribs, 3))
+        rotations[:, 0] = -np.degrees(self.arc_angles)
+        rotations[:, 1] = self.twists
+        return rotations
+
+    @instrumented("glider.rib_transforms")
+    def rib_transforms(self, chords: np.ndarray | None = None, twists: np.ndarray | None = None,
+                       rib_indices=None) -> np.ndarray:
+        """Returns the matrices placing every unit chord rib profile in the world.
+
+        Each matrix scales by the chord, twists about the span axis, rolls onto the arc and translates to the leading
+        edge position.
+
+        Args:
+            chords (np.ndarray | None): (ribs,) chords used instead of the chord law
+            twists (np.ndarray | None): (ribs,) twists in degrees used instead of the twist law
+            rib_indices (array_like | None): (K,) ribs whose matrices are built, every rib when None. The leading edges
+                still follow the largest chord of the whole span.
+
+        Returns:
+            np.ndarray: (ribs, 4, 4) or (K, 4, 4) homogeneous matrices
+        """
+        chords = self.chords if chords is None else chords
+        twists = self.twists if twists is None else twists
+        leading_edge_positions = self.leading_edge_positions_for(chords)
+        arc_angles = self.arc_angles
+        if rib_indices is not None:
+            rib_indices = np.atleast_1d(np.asarray(rib_indices, dtype=np.intp))
+            chords, twists = chords[rib_indices], twists[rib_indices]
+            leading_edge_positions, arc_angles = leading_edge_positions[rib_indices], arc_angles[rib_indices]
+        return compose(translation_matrices(leading_edge_positions), rotation_matrices(-arc_angles, "x"),
+                       rotation_matrices(np.radians(twists), "y"), scale_matrices(chords))
+
+    @instrumented("glider.canopy_points")
+    def canopy_points(self) -> np.ndarray:
+        """Returns the outline of every rib in world coordinates with one batched matrix multiply.
+
+        Returns:
+            np.ndarray: Contiguous (ribs, 2 * num_points, 3) point cloud, upper surface first
+        """
+        return place_profiles(self.unit_rib_profiles(), self.rib_transforms())
+
+    def set_airfoils(self, root_airfoil: Airfoil, tip_airfoil: Airfoil | None = None) -> None:
+        """Replaces the root and tip airfoils, discarding their resampled copies."""
+        self.root_airfoil = root_airfoil
+        self.tip_airfoil = tip_airfoil if tip_airfoil is not None else root_airfoil
+        self._resampled_airfoils = None
+        self.airfoil_family = None
+
+    def set_airfoil_family(self, airfoil_family: AirfoilFamily | None) -> None:
+        """Blends the ribs from an airfoil family instead of the root and tip airfoils, or back from them with None.
+
+        Raises:
+            ValueError: If the family does not share num_points or its stations do not cover blends 0 to 1
+        """
+        if airfoil_family is not None:
+            if airfoil_family.num_points != self.num_points:
+                raise ValueError(f"The airfoil family has {airfoil_family.num_points} points per surface, the glider "
+                                 f"{self.num_points}")
+            if airfoil_family.stations[0] > 0.0 or airfoil_family.stations[-1] < 1.0:
+                raise ValueError("The airfoil family stations must cover blends from 0 to 1")
+        self.airfoil_family = airfoil_family
+
+    @instrumented("glider.unit_rib_profiles")
+    def unit_rib_profiles(self) -> np.ndarray:
+        """Returns the unit chord profile of every rib, blended but not scaled or twisted.
+
+        Returns:
+            np.ndarray: (ribs, 2 * num_points, 2) profiles, upper surface (trailing to leading edge) first
+        """
+        return self.blended_profiles(self.blends)
+
+    def blended_profiles(self, blends: np.ndarray) -> np.ndarray:
+        """Returns unit chord profiles for any (K,) blend values, from the airfoil family when one is set.
+
+        Returns:
+            np.ndarray: (K, 2 * num_points, 2) profiles, upper surface first
+        """
+        if self.airfoil_family is not None:
+            return self.airfoil_family.profiles_at(blends)
+
+        if self._resampled_airfoils is None or len(self._resampled_airfoils[0].upper_surface) != self.num_points:
+            # Resampling is the only per-airfoil step and happens once per airfoil pair
+            self._resampled_airfoils = (self._airfoil_tools._arc_length_resample(self.root_airfoil, self.num_points),
+                                        self._airfoil_tools._arc_length_resample(self.tip_airfoil, self.num_points))
+
+        upper_surfaces, lower_surfaces = self._airfoil_tools.morph_profiles(*self._resampled_airfoils, blends)
+
+        return np.concatenate((upper_surfaces, lower_surfaces), axis=1)
+
+    @instrumented("glider.generate_rib_profiles")
+    def generate_rib_profiles(self) -> np.ndarray:
+        """Returns the profile of every rib scaled to its chord and twisted about the origin, which is the leading edge
+        of normalised airfoils.
+
+        Returns:
+            np.ndarray: (ribs, 2 * num_points, 2) profiles in rib coordinates, upper surface first
+        """
+        twists = np.radians(self.twists)
+        cos_twist, sin_twist = np.cos(twists), np.sin(twists)
+
+        # Chord scaling and a nose up rotation about the leading edge as one (ribs, 2, 2) matrix stack
+        matrices = self.chords[:, None, None] * np.stack((np.stack((cos_twist, sin_twist), axis=1),
+                                                          np.stack((-sin_twist, cos_twist), axis=1)), axis=1)
+
+        return self.unit_rib_profiles() @ matrices.transpose(0, 2, 1)
+
+    def ribs(self) -> list[Rib]:
+        """Builds Rib objects for every station, each wrapping a view into one generated profile array.
+
+        Returns:
+            list[Rib]: One Rib per station from the left tip to the right tip
+        """
+        profiles = self.generate_rib_profiles()
+        rotations = self.rib_rotations
+        # The generated profiles already carry the chord and twist, so each Rib only adds roll and position
+        rotations[:, 1] = 0.0
+        return [Rib(position=position, rotation=rotation,
+                    airfoil=Airfoil(airfoil_name=f"{self.name} rib {i}", chord_length=chord,
+                                    upper_surface=profiles[i, :self.num_points],
+                                    lower_surface=profiles[i, self.num_points:]))
+                for i, (position, rotation, chord) in enumerate(zip(self.leading_edge_positions, rotations, self.chords))]
@@ -0,0 +1,183 @@
+import logging
+import os
+import numpy as np
+from airfoil import Airfoil
+from glider import Glider
+from instrumentation import count, instrumented
+from lineplan import LinePlan, lower_surface_points
+from transforms import place_profiles
+
+logger = logging.getLogger(__name__)
+
+
+class GliderModel:
+    """Incremental evaluation of a glider and its line plan, recomputing only what an edit affects
+
+    The pipeline runs from airfoil files to the resampled root and tip airfoils, one unit profile per rib, one
+    placement matrix per rib, the rib outlines in the world, the attachment points and finally the line lengths. Every
+    stage keeps its last result with the key it was computed from:
+
+    - loaded airfoils: file path, size and modification time
+    - resampled airfoils: the root, tip and family objects and the point count
+    - unit profile of a rib: its blend value
+    - placement of a rib: its matrix, built from the rib's chord and twist
+    - rib outline: the rib's profile and placement
+    - attachment point: the outline of its rib and its chord fraction
+
+    The per rib keys are scalars or 4x4 matrices, so update() rebuilds and compares all of them in O(ribs) and then only
+    recomputes the rows whose key changed, plus everything downstream of those rows. Line lengths follow through
+    LinePlan.set_node_positions(), which only touches the lines at the moved attachments and the path lengths above
+    them. Changing one rib's blend therefore re-morphs and re-places one rib and updates a handful of lines.
+
+    blends, chords and twists hold one editable value per rib, seeded from the glider's laws. Replace airfoils through
+    set_airfoil_files() or Glider.set_airfoils(); edits made to an Airfoil in place are not detected, call invalidate()
+    after those.
+    """
+
+    def __init__(self, glider: Glider, line_plan: LinePlan | None = None, airfoil_cache=None) -> None:
+        """
+        Args:
+            glider (Glider): The wing, its laws seed the per rib values
+            line_plan (LinePlan | None): Compiled line plan whose attachments sit on the glider's ribs
+            airfoil_cache (AirfoilCache | None): Parses airfoil files through the on-disk cache when given
+        """
+        self.glider: Glider = glider
+        self.line_plan: LinePlan | None = line_plan
+        self.airfoil_cache = airfoil_cache
+        self._loaded_airfoils: dict[str, tuple[tuple[int, int], Airfoil]] = {}
+        self.reset_from_laws()
+        self.invalidate()
+
+    def reset_from_laws(self) -> None:
+        """Sets every per rib value from the glider's laws again, e.g. after changing a law or the number of cells.
+
+        Only the ribs whose values actually change are recomputed by the next update().
+        """
+        self.blends: np.ndarray = np.array(self.glider.blends)
+        self.chords: np.ndarray = np.array(self.glider.chords)
+        self.twists: np.ndarray = np.array(self.glider.twists)
+
+    def invalidate(self) -> None:
+        """Discards every stored key, so the next update() recomputes the whole model."""
+        num_ribs, num_points = self.glider.num_ribs, self.glider.num_points
+        self._airfoils_key: tuple | None = None
+        self._profile_blends: np.ndarray = np.full(num_ribs, np.nan)
+        self._attachments_key: tuple | None = None
+        self.profiles: np.ndarray = np.empty((num_ribs, 2 * num_points, 2))
+        self.transforms: np.ndarray = np.full((num_ribs, 4, 4), np.nan)
+        self.points: np.ndarray = np.empty((num_ribs, 2 * num_points, 3))
+        self.last_update: dict[str, np.ndarray] = {}
+
+    def load_airfoil(self, filepath: str) -> Airfoil:
+        """Returns the airfoil of a file, the same object as long as the file's size and modification time hold."""
+        filepath = os.path.abspath(filepath)
+        source_stat = os.stat(filepath)
+        key = (source_stat.st_size, source_stat.st_mtime_ns)
+        loaded = self._loaded_airfoils.get(filepath)
+        if loaded is not None and loaded[0] == key:
+            return loaded[1]
+
+        if self.airfoil_cache is not None:
+            airfoil = self.airfoil_cache.load(filepath)
+        else:
+            airfoil = Airfoil()
+            airfoil.generate_upper_lower_surfaces(filepath)
+        self._loaded_airfoils[filepath] = (key, airfoil)
+        return airfoil
+
+    def set_airfoil_files(self, root_filepath: str, tip_filepath: str | None = None) -> None:
+        """Loads the root and tip airfoils, leaving the glider untouched when neither file changed."""
+        root_airfoil = self.load_airfoil(root_filepath)
+        tip_airfoil = self.load_airfoil(tip_filepath) if tip_filepath is not None else root_airfoil
+        if root_airfoil is not self.glider.root_airfoil or tip_airfoil is not self.glider.tip_airfoil:
+            self.glider.set_airfoils(root_airfoil, tip_airfoil)
+
+    def set_rib_blend(self, ribs, blend: float) -> None:
+        """Sets the morph fraction of one rib or an array of ribs."""
+        self.blends[ribs] = np.clip(blend, 0.0, 1.0)
+
+    def set_rib_chord(self, ribs, chord: float) -> None:
+        """Sets the chord of one rib or an array of ribs."""
+        self.chords[ribs] = chord
+
+    def set_rib_twist(self, ribs, twist: float) -> None:
+        """Sets the twist in degrees of one rib or an array of ribs."""
+        self.twists[ribs] = twist
+
+    def set_trim(self, line_name: str, trim: float) -> None:
+        """Changes the trim of one line, which only updates the path lengths of the lines above it."""
+        self.line_plan.set_trim(line_name, trim)
+
+    @instrumented("glidermodel.update")
+    def update(self) -> dict[str, np.ndarray]:
+        """Recomputes the stale part of the model.
+
+        Returns:
+            dict[str, np.ndarray]: Indices of what was recomputed, also stored in last_update: "profiles",
+                "transforms" and "points" hold rib indices, "attachments" attachment indices and "lines" the lines
+                whose design length changed. Pass "points" to CanopyMesh.update_ribs() to refresh a mesh.
+        """
+        glider = self.glider
+        if len(self.blends) != glider.num_ribs:
+            raise ValueError("The number of ribs changed, call reset_from_laws() and invalidate() first")
+        if self.profiles.shape[1] != 2 * glider.num_points:
+            self.invalidate()
+
+        # Airfoils and resampling: Glider keeps the resampled pair, a new pair or family changes every profile
+        airfoils_key = (glider.root_airfoil, glider.tip_airfoil, glider.airfoil_family)
+        if self._airfoils_key is None or any(new is not old for new, old in zip(airfoils_key, self._airfoils_key)):
+            self._airfoils_key = airfoils_key
+            self._profile_blends[:] = np.nan
+
+        profile_ribs = np.flatnonzero(self.blends != self._profile_blends)
+        if len(profile_ribs):
+            self.profiles[profile_ribs] = glider.blended_profiles(self.blends[profile_ribs])
+            self._profile_blends[profile_ribs] = self.blends[profile_ribs]
+            count("glidermodel.ribs_morphed", len(profile_ribs))
+
+        # Rebuilding every matrix is cheaper than tracking which chord or twist changed, and a changed maximum chord
+        # moves every leading edge
+        transforms = glider.rib_transforms(self.chords, self.twists)
+        transform_ribs = np.flatnonzero(np.any(transforms != self.transforms, axis=(1, 2)))
+        self.transforms[transform_ribs] = transforms[transform_ribs]
+
+        point_ribs = np.union1d(profile_ribs, transform_ribs)
+        if len(point_ribs):
+            self.points[point_ribs] = place_profiles(self.profiles[point_ribs], self.transforms[point_ribs])
+            count("glidermodel.ribs_placed", len(point_ribs))
+
+        attachments = np.empty(0, dtype=np.intp)
+        lines = np.empty(0, dtype=np.intp)
+        if self.line_plan is not None and self.line_plan.attachment_nodes:
+            line_plan = self.line_plan
+            attachment_ribs = np.asarray(line_plan.attachment_ribs, dtype=np.intp)
+            attachments_key = (tuple(line_plan.attachment_nodes), tuple(line_plan.attachment_ribs),
+                               tuple(line_plan.attachment_fractions))
+            if attachments_key != self._attachments_key:
+                self._attachments_key = attachments_key
+                attachments = np.arange(len(attachment_ribs))
+            else:
+                attachments = np.flatnonzero(np.isin(attachment_ribs, point_ribs))
+
+            if len(attachments):
+                ribs = attachment_ribs[attachments]
+                fractions = np.asarray(line_plan.attachment_fractions, dtype=np.float64)[attachments]
+                positions = lower_surface_points(self.profiles[ribs], glider.num_points, fractions,
+                                                 self.transforms[ribs])
+                nodes = np.asarray(line_plan.attachment_nodes, dtype=np.intp)[attachments]
+                lines = line_plan.set_node_positions(nodes, positions)
+                count("glidermodel.attachments_moved", len(attachments))
+
+        self.last_update = {"profiles": profile_ribs, "transforms": transform_ribs, "points": point_ribs,
+                            "attachments": attachments, "lines": lines}
+        return self.last_update
+
+    def canopy_points(self) -> np.ndarray:
+        """Returns the (ribs, 2 * num_points, 3) rib outlines in the world after bringing the model up to date."""
+        self.update()
+        return self.points
+
+    def attachment_path_lengths(self) -> np.ndarray:
+        """Returns the riser to attachment path lengths after bringing the model up to date."""
+        self.update()
+        return self.line_plan.attachment_path_lengths()
@@ -0,0 +1,84 @@
+import os
+import statistics
+import subprocess
+import sys
+
+# Import time each module may add on top of numpy, in milliseconds. Batch workers import these in every process, so
+# the geometry modules must not pull in plotting, scipy or other heavy packages until they are used.
+IMPORT_BUDGETS_MS = {
+    "customfunctions": 5.0,
+    "transforms": 5.0,
+    "instrumentation": 15.0,
+    "airfoil": 25.0,
+    "airfoiltools": 30.0,
+    "airfoilfamily": 35.0,
+    "airfoilcache": 45.0,
+    "airfoillibrary": 40.0,
+    "airfoilsearch": 45.0,
+    "crossport": 15.0,
+    "rib": 35.0,
+    "canopymesh": 15.0,
+    "glider": 40.0,
+    "glidermodel": 45.0,
+    "panelmethod": 35.0,
+    "lineplan": 20.0,
+    "trimsweep": 60.0,
+}
+
+# Packages that must only load on first use
+LAZY_PACKAGES = ("plotly", "scipy", "pandas", "matplotlib")
+
+_PROBE = """
+import numpy
+import sys
+import {module}
+print(",".join(sorted({{name.split(".")[0] for name in sys.modules}} & {lazy_packages})))
+"""
+
+
+def measure_import(module: str, repeats: int = 5) -> tuple[float, list[str]]:
+    """Measures the time to import a module in fresh interpreters, numpy being imported beforehand.
+
+    Args:
+        module (str): Module name, imported from this directory
+        repeats (int): Number of fresh interpreters, the median time is reported
+
+    Returns:
+        tuple[float, list[str]]: Median cumulative import time in milliseconds and the lazy packages that were loaded
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    probe = _PROBE.format(module=module, lazy_packages=set(LAZY_PACKAGES))
+    times = []
+    loaded: list[str] = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=directory, capture_output=True,
+                                text=True, check=True)
+        # -X importtime writes "import time: self [us] | cumulative | imported package" for every import to stderr
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                times.append(int(fields[1]) / 1000.0)
+        loaded = [name for name in result.stdout.strip().split(",") if name]
+
+    return statistics.median(times), loaded
+
+
+def check_import_budgets(budgets: dict[str, float] | None = None, repeats: int = 5) -> bool:
+    """Prints the import time of every module against its budget.
+
+    Returns:
+        bool: True if every module is within budget and loads none of the lazy packages
+    """
+    budgets = budgets or IMPORT_BUDGETS_MS
+    within_budget = True
+    print(f"{'Module':<16}{'Import [ms]':>12}{'Budget [ms]':>12}  Eager packages")
+    for module, budget in budgets.items():
+        import_time, loaded = measure_import(module, repeats)
+        passed = import_time <= budget and not loaded
+        within_budget &= passed
+        print(f"{module:<16}{import_time:>12.1f}{budget:>12.1f}  {', '.join(loaded) or '-'}{'' if passed else '  OVER'}")
+    return within_budget
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_import_budgets() else 1)
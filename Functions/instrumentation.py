@@ -0,0 +1,199 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+# Opt-in timing spans and counters for the hot paths. Nothing is recorded until enable() is called or the
+# INSTRUMENTATION_ENV_VAR environment variable is set, and a disabled span or counter costs one attribute check.
+# Every process records on its own. Process pool workers hand theirs back with each result through take_records(),
+# and the parent adds them to its own with merge_records(), so one trace shows the spans of every process. Counter
+# updates are kept as increments, since merged ones arrive out of time order, and the trace export sums them in time
+# order into one running total per counter.
+
+INSTRUMENTATION_ENV_VAR = "PGLINETRIM_INSTRUMENTATION"
+
+
+class Recorder:
+    """Collected spans and counters of this process"""
+
+    def __init__(self) -> None:
+        self.enabled: bool = False
+        self.origin_ns: int = time.perf_counter_ns()
+        # (name, start ns, duration ns, process id, thread id, args) per finished span
+        self.spans: list[tuple[str, int, int, int, int, dict]] = []
+        # (name, time ns, increment) per counter update, in the order they were recorded or merged
+        self.counter_events: list[tuple[str, int, float]] = []
+        self.counters: dict[str, float] = {}
+
+
+_recorder = Recorder()
+
+
+def enable() -> None:
+    """Starts recording spans and counters."""
+    _recorder.enabled = True
+
+
+def disable() -> None:
+    """Stops recording, keeping what was recorded so far."""
+    _recorder.enabled = False
+
+
+def is_enabled() -> bool:
+    return _recorder.enabled
+
+
+def reset() -> None:
+    """Discards every recorded span and counter."""
+    _recorder.spans.clear()
+    _recorder.counter_events.clear()
+    _recorder.counters.clear()
+    _recorder.origin_ns = time.perf_counter_ns()
+
+
+@contextmanager
+def _recorded_span(name: str, args: dict) -> Iterator[None]:
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _recorder.spans.append((name, start, time.perf_counter_ns() - start, os.getpid(), threading.get_ident(), args))
+
+
+class _NullSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args):
+    """Times a block of code while instrumentation is enabled.
+
+    Args:
+        name (str): Span name, dotted by stage, e.g. "lineplan.path_lengths"
+        **args: Extra values stored with the span and shown in the trace viewer
+
+    Returns:
+        A context manager
+    """
+    if not _recorder.enabled:
+        return _NULL_SPAN
+    return _recorded_span(name, args)
+
+
+def count(name: str, value: float = 1) -> None:
+    """Adds value to a counter while instrumentation is enabled, e.g. the number of points processed."""
+    if not _recorder.enabled:
+        return
+    _recorder.counters[name] = _recorder.counters.get(name, 0) + value
+    _recorder.counter_events.append((name, time.perf_counter_ns(), value))
+
+
+def instrumented(name: str) -> Callable:
+    """Decorates a function so every call is a span and counts towards "<name>.calls".
+
+    Args:
+        name (str): Span name
+    """
+    def decorator(function: Callable) -> Callable:
+        calls_counter = f"{name}.calls"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _recorder.enabled:
+                return function(*args, **kwargs)
+            count(calls_counter)
+            with _recorded_span(name, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def take_records() -> dict:
+    """Returns the spans and counter updates recorded since the last call and clears them.
+
+    Called in a process pool worker at the end of a task, the records travel back with its result and
+    merge_records() adds them to the parent's. perf_counter_ns() reads the same monotonic clock in every process on
+    Linux, so the spans line up in the parent's trace.
+
+    Returns:
+        dict: Picklable "spans" and "counter_increments", (name, time ns, increment) per counter update
+    """
+    records = {"spans": list(_recorder.spans), "counter_increments": list(_recorder.counter_events)}
+    _recorder.spans.clear()
+    _recorder.counter_events.clear()
+    _recorder.counters.clear()
+    return records
+
+
+def merge_records(records: dict) -> None:
+    """Adds records from take_records() in another process to this process' spans and counters.
+
+    The counter updates of a worker overlap in time with those of this process and of the other workers. They are
+    appended as they are, export_chrome_trace() orders them by time.
+    """
+    _recorder.spans.extend(records["spans"])
+    for name, timestamp, increment in records["counter_increments"]:
+        _recorder.counters[name] = _recorder.counters.get(name, 0) + increment
+        _recorder.counter_events.append((name, timestamp, increment))
+
+
+def summary() -> list[dict]:
+    """Aggregates the recorded spans by name.
+
+    Returns:
+        list[dict]: One row per span name with calls, total_ms, mean_ms and max_ms, slowest total first
+    """
+    rows: dict[str, dict] = {}
+    for name, _, duration, _, _, _ in _recorder.spans:
+        row = rows.setdefault(name, {"name": name, "calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        row["calls"] += 1
+        row["total_ms"] += duration / 1e6
+        row["max_ms"] = max(row["max_ms"], duration / 1e6)
+    for row in rows.values():
+        row["mean_ms"] = row["total_ms"] / row["calls"]
+    return sorted(rows.values(), key=lambda row: row["total_ms"], reverse=True)
+
+
+def format_summary() -> str:
+    """Returns the span summary and the counter totals as a text table."""
+    lines = [f"{'Span':<48}{'Calls':>8}{'Total [ms]':>12}{'Mean [ms]':>12}{'Max [ms]':>12}"]
+    for row in summary():
+        lines.append(f"{row['name']:<48}{row['calls']:>8}{row['total_ms']:>12.3f}{row['mean_ms']:>12.3f}"
+                     f"{row['max_ms']:>12.3f}")
+    if _recorder.counters:
+        lines.append("")
+        lines.append(f"{'Counter':<48}{'Total':>14}")
+        for name, total in sorted(_recorder.counters.items()):
+            lines.append(f"{name:<48}{total:>14g}")
+    return "\n".join(lines)
+
+
+def export_chrome_trace(filepath: str) -> None:
+    """Writes the recorded spans and counters as a Chrome trace, viewable in chrome://tracing or Perfetto.
+
+    Each counter is one series of running totals, summed over the updates of every process in time order.
+    """
+    process_id = os.getpid()
+    events = [{"name": name, "ph": "X", "ts": (start - _recorder.origin_ns) / 1e3, "dur": duration / 1e3,
+               "pid": span_process_id, "tid": thread_id, "args": args}
+              for name, start, duration, span_process_id, thread_id, args in _recorder.spans]
+    running_totals: dict[str, float] = {}
+    for name, timestamp, increment in sorted(_recorder.counter_events, key=lambda event: event[1]):
+        running_totals[name] = running_totals.get(name, 0) + increment
+        events.append({"name": name, "ph": "C", "ts": (timestamp - _recorder.origin_ns) / 1e3, "pid": process_id,
+                       "args": {"value": running_totals[name]}})
+    with open(filepath, "w", encoding="utf-8") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+if os.environ.get(INSTRUMENTATION_ENV_VAR, "") not in ("", "0"):
+    enable()
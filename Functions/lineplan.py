@@ -0,0 +1,322 @@
+import logging
+import numpy as np
+from customfunctions import interp_rows
+from instrumentation import count, instrumented
+from transforms import place_profiles
+
+logger = logging.getLogger(__name__)
+
+
+def lower_surface_points(unit_profiles: np.ndarray, num_points: int, chord_fractions: np.ndarray,
+                         transforms: np.ndarray) -> np.ndarray:
+    """Places points on the lower surface of unit chord profiles in the world.
+
+    Args:
+        unit_profiles (np.ndarray): (K, 2 * num_points, 2) profiles, upper surface first
+        num_points (int): Points per surface
+        chord_fractions (np.ndarray): (K,) position along the chord of every point
+        transforms (np.ndarray): (K, 4, 4) matrices placing each profile
+
+    Returns:
+        np.ndarray: (K, 3) world points
+    """
+    # Lower surfaces run from the leading edge to the trailing edge, so x is increasing along each row
+    lower_surfaces = unit_profiles[:, num_points:]
+    y = interp_rows(chord_fractions[:, None], lower_surfaces[..., 0], lower_surfaces[..., 1])
+    profile_points = np.stack((chord_fractions[:, None], y), axis=2)
+    return place_profiles(profile_points, transforms)[:, 0]
+
+
+class LinePlan:
+    """A suspension line cascade from the canopy attachment points down to the risers
+
+    Nodes are attachment points on the ribs, knots where lines join, and riser ends. Every line runs from an upper
+    node to a lower node, and every node other than a riser has exactly one line below it, so the lines form a tree
+    per riser.
+
+    After compile() the lines are stored in depth-first order from the risers. The lines above any line then form a
+    contiguous slice, so changing one trim value only touches that slice of the cached path lengths.
+
+    Lengths:
+
+    - design length: straight distance between the nodes of a line
+    - trim: adjustment added to the design length of a line, e.g. a loop or shackle setting
+    - path length: riser offset plus the trimmed lengths of every line between the riser and a line's upper node
+    """
+
+    ATTACHMENT = "attachment"
+    KNOT = "knot"
+    RISER = "riser"
+
+    def __init__(self) -> None:
+        self.node_names: list[str] = []
+        self.node_kinds: list[str] = []
+        self.node_positions: np.ndarray = np.empty((0, 3))
+        self.attachment_nodes: list[int] = []
+        self.attachment_ribs: list[int] = []
+        self.attachment_fractions: list[float] = []
+        self.riser_nodes: list[int] = []
+        self.riser_offsets: np.ndarray = np.empty(0)
+
+        self._line_specs: list[tuple[str, int, int, float]] = []
+        self._line_spec_names: set[str] = set()
+        self._compiled: bool = False
+        self._design_lengths: np.ndarray | None = None
+        self._path_lengths: np.ndarray | None = None
+
+    def add_attachment(self, name: str, rib_index: int, chord_fraction: float) -> int:
+        """Adds an attachment point on the lower surface of a rib.
+
+        Args:
+            name (str): Unique node name, e.g. "A3"
+            rib_index (int): Index of the rib in the glider, left tip first
+            chord_fraction (float): Position along the chord, 0 at the leading edge and 1 at the trailing edge
+
+        Returns:
+            int: The node index
+        """
+        node = self._add_node(name, self.ATTACHMENT, np.full(3, np.nan))
+        self.attachment_nodes.append(node)
+        self.attachment_ribs.append(rib_index)
+        self.attachment_fractions.append(chord_fraction)
+        return node
+
+    def add_knot(self, name: str, position) -> int:
+        """Adds a knot joining the lines above it to the single line below it.
+
+        Returns:
+            int: The node index
+        """
+        return self._add_node(name, self.KNOT, position)
+
+    def add_riser(self, name: str, position, offset: float = 0.0) -> int:
+        """Adds a riser end, the root of one line tree.
+
+        Args:
+            name (str): Unique node name, e.g. "A riser"
+            position (array_like): (3,) world position of the riser end
+            offset (float): Riser length offset added to every path through this riser
+
+        Returns:
+            int: The node index
+        """
+        node = self._add_node(name, self.RISER, position)
+        self.riser_nodes.append(node)
+        self.riser_offsets = np.append(self.riser_offsets, offset)
+        return node
+
+    def add_line(self, name: str, upper_node: int, lower_node: int, trim: float = 0.0) -> None:
+        """Adds a line between two nodes, upper_node being the one closer to the canopy."""
+        if name in self._line_spec_names:
+            raise ValueError(f"Line name {name} is already used")
+        self._line_spec_names.add(name)
+        self._line_specs.append((name, upper_node, lower_node, trim))
+        self._compiled = False
+
+    @instrumented("lineplan.compile")
+    def compile(self) -> None:
+        """Validates the cascade and builds the depth-first line arrays."""
+        lines_below: dict[int, int] = {}
+        lines_above: dict[int, list[int]] = {}
+        for spec_index, (name, upper_node, lower_node, _) in enumerate(self._line_specs):
+            if upper_node in lines_below:
+                raise ValueError(f"Node {self.node_names[upper_node]} has more than one line below it")
+            if self.node_kinds[upper_node] == self.RISER:
+                raise ValueError(f"Line {name} hangs below riser {self.node_names[upper_node]}")
+            lines_below[upper_node] = spec_index
+            lines_above.setdefault(lower_node, []).append(spec_index)
+
+        for node, kind in enumerate(self.node_kinds):
+            if kind != self.RISER and node not in lines_below:
+                raise ValueError(f"Node {self.node_names[node]} is not connected to a riser")
+
+        # Depth-first from every riser so that each subtree is a contiguous slice
+        order: list[int] = []
+        parents: list[int] = []
+        depths: list[int] = []
+        risers: list[int] = []
+        subtree_ends: list[int] = []
+        riser_ranges: list[tuple[int, int]] = []
+
+        def visit(spec_index: int, parent: int, depth: int, riser: int) -> None:
+            position = len(order)
+            order.append(spec_index)
+            parents.append(parent)
+            depths.append(depth)
+            risers.append(riser)
+            subtree_ends.append(-1)
+            for above in lines_above.get(self._line_specs[spec_index][1], []):
+                visit(above, position, depth + 1, riser)
+            subtree_ends[position] = len(order)
+
+        for riser_index, riser_node in enumerate(self.riser_nodes):
+            start = len(order)
+            for spec_index in lines_above.get(riser_node, []):
+                visit(spec_index, -1, 0, riser_index)
+            riser_ranges.append((start, len(order)))
+
+        if len(order) != len(self._line_specs):
+            raise ValueError("Some lines are part of a loop and never reach a riser")
+
+        self.line_names: list[str] = [self._line_specs[i][0] for i in order]
+        self.line_index: dict[str, int] = {name: i for i, name in enumerate(self.line_names)}
+        self.line_upper: np.ndarray = np.array([self._line_specs[i][1] for i in order], dtype=np.intp)
+        self.line_lower: np.ndarray = np.array([self._line_specs[i][2] for i in order], dtype=np.intp)
+        self.trims: np.ndarray = np.array([self._line_specs[i][3] for i in order], dtype=np.float64)
+        self.line_parent: np.ndarray = np.array(parents, dtype=np.intp)
+        self.line_depth: np.ndarray = np.array(depths, dtype=np.intp)
+        self.line_riser: np.ndarray = np.array(risers, dtype=np.intp)
+        self.subtree_end: np.ndarray = np.array(subtree_ends, dtype=np.intp)
+        self.riser_line_ranges: list[tuple[int, int]] = riser_ranges
+        self.levels: list[np.ndarray] = [np.flatnonzero(self.line_depth == depth)
+                                         for depth in range(self.line_depth.max() + 1 if len(order) else 0)]
+        line_of_spec = {spec_index: line for line, spec_index in enumerate(order)}
+        self.attachment_lines: np.ndarray = np.array([line_of_spec[lines_below[node]] for node in self.attachment_nodes],
+                                                     dtype=np.intp)
+        self._line_order: list[int] = order
+
+        self._compiled = True
+        self._design_lengths = None
+        self._path_lengths = None
+
+    @instrumented("lineplan.update_attachment_positions")
+    def update_attachment_positions(self, glider) -> None:
+        """Places every attachment point on the lower surface of its rib in one batched pass.
+
+        Args:
+            glider (Glider): The wing whose ribs carry the attachment points
+        """
+        if not self.attachment_nodes:
+            return
+        rib_indices = np.asarray(self.attachment_ribs, dtype=np.intp)
+        self.node_positions[self.attachment_nodes] = lower_surface_points(
+            glider.unit_rib_profiles()[rib_indices], glider.num_points,
+            np.asarray(self.attachment_fractions, dtype=np.float64), glider.rib_transforms()[rib_indices])
+        self._design_lengths = None
+        self._path_lengths = None
+
+    def move_node(self, node: int, position) -> None:
+        """Moves a knot or riser end and invalidates the lengths that depend on it."""
+        self.node_positions[node] = position
+        self._design_lengths = None
+        self._path_lengths = None
+
+    def set_node_positions(self, nodes, positions) -> np.ndarray:
+        """Moves nodes, updating the cached design lengths of only the lines touching them and the path lengths of
+        the lines above those.
+
+        Args:
+            nodes (array_like): (K,) node indices
+            positions (array_like): (K, 3) new world positions
+
+        Returns:
+            np.ndarray: Indices of the lines whose design length was updated, empty when nothing was cached
+        """
+        nodes = np.atleast_1d(np.asarray(nodes, dtype=np.intp))
+        self.node_positions[nodes] = positions
+        if not self._compiled or self._design_lengths is None:
+            self._design_lengths = None
+            self._path_lengths = None
+            return np.empty(0, dtype=np.intp)
+
+        lines = np.flatnonzero(np.isin(self.line_upper, nodes) | np.isin(self.line_lower, nodes))
+        upper_positions = self.node_positions[self.line_upper[lines]]
+        lengths = np.linalg.norm(upper_positions - self.node_positions[self.line_lower[lines]], axis=1)
+        deltas = lengths - self._design_lengths[lines]
+        self._design_lengths[lines] = lengths
+        if self._path_lengths is not None:
+            for line, delta in zip(lines, deltas):
+                self._path_lengths[line:self.subtree_end[line]] += delta
+        return lines
+
+    def design_lengths(self) -> np.ndarray:
+        """Returns the straight length of every line between its nodes, in depth-first line order."""
+        self._require_compiled()
+        if self._design_lengths is None:
+            if np.isnan(self.node_positions).any():
+                raise ValueError("Attachment positions are not set, call update_attachment_positions first")
+            self._design_lengths = np.linalg.norm(
+                self.node_positions[self.line_upper] - self.node_positions[self.line_lower], axis=1)
+        return self._design_lengths
+
+    def trimmed_lengths(self) -> np.ndarray:
+        """Returns design length plus trim for every line."""
+        return self.design_lengths() + self.trims
+
+    def path_lengths(self) -> np.ndarray:
+        """Returns the length from the riser end to the upper node of every line, one vectorised pass per level."""
+        self._require_compiled()
+        if self._path_lengths is None:
+            count("lineplan.path_length_rebuilds")
+            trimmed_lengths = self.trimmed_lengths()
+            path_lengths = np.empty(len(self.line_names))
+            for level, lines in enumerate(self.levels):
+                below = self.riser_offsets[self.line_riser[lines]] if level == 0 else path_lengths[self.line_parent[lines]]
+                path_lengths[lines] = below + trimmed_lengths[lines]
+            self._path_lengths = path_lengths
+        return self._path_lengths
+
+    def attachment_path_lengths(self) -> np.ndarray:
+        """Returns the total length from the riser end to every attachment point, in attachment order."""
+        return self.path_lengths()[self.attachment_lines]
+
+    def set_trim(self, line_name: str, trim: float) -> None:
+        """Changes the trim of one line, updating only the path lengths of the lines above it."""
+        self._require_compiled()
+        line = self.line_index[line_name]
+        delta = trim - self.trims[line]
+        self.trims[line] = trim
+        name, upper_node, lower_node, _ = self._line_specs[self._line_order[line]]
+        self._line_specs[self._line_order[line]] = (name, upper_node, lower_node, trim)
+        if self._path_lengths is not None:
+            self._path_lengths[line:self.subtree_end[line]] += delta
+
+    def set_riser_offset(self, riser_name: str, offset: float) -> None:
+        """Changes a riser offset, updating only the path lengths of the lines on that riser."""
+        self._require_compiled()
+        riser_index = self.riser_nodes.index(self.node_names.index(riser_name))
+        delta = offset - self.riser_offsets[riser_index]
+        self.riser_offsets[riser_index] = offset
+        if self._path_lengths is not None:
+            start, end = self.riser_line_ranges[riser_index]
+            self._path_lengths[start:end] += delta
+
+    def trim_deltas(self, measured_lengths: dict[str, float]) -> np.ndarray:
+        """Compares measured line lengths with the trimmed design lengths.
+
+        Args:
+            measured_lengths (dict[str, float]): Measured length by line name, lines may be missing
+
+        Returns:
+            np.ndarray: Measured minus trimmed length per line in depth-first order, NaN for unmeasured lines
+        """
+        measured = np.full(len(self.line_names), np.nan)
+        for name, length in measured_lengths.items():
+            measured[self.line_index[name]] = length
+        return measured - self.trimmed_lengths()
+
+    def path_deltas(self, measured_lengths: dict[str, float]) -> np.ndarray:
+        """Accumulates the measured deviations from the riser to every attachment point, unmeasured lines counting
+        as on target.
+
+        Returns:
+            np.ndarray: Total deviation at every attachment point, in attachment order
+        """
+        deltas = np.nan_to_num(self.trim_deltas(measured_lengths))
+        accumulated = np.empty_like(deltas)
+        for level, lines in enumerate(self.levels):
+            accumulated[lines] = deltas[lines] + (0.0 if level == 0 else accumulated[self.line_parent[lines]])
+        return accumulated[self.attachment_lines]
+
+    def _add_node(self, name: str, kind: str, position) -> int:
+        if name in self.node_names:
+            raise ValueError(f"Node name {name} is already used")
+        self.node_names.append(name)
+        self.node_kinds.append(kind)
+        self.node_positions = np.vstack((self.node_positions, np.asarray(position, dtype=np.float64).reshape(1, 3)))
+        self._compiled = False
+        return len(self.node_names) - 1
+
+    def _require_compiled(self) -> None:
+        if not self._compiled:
+            raise RuntimeError("The line plan changed, call compile() first")
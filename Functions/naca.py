@@ -0,0 +1,58 @@
+import numpy as np
+from airfoil import Airfoil
+
+
+def naca4_surfaces(code: str, num_points: int = 100, closed_trailing_edge: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """Generates the surfaces of a NACA four digit airfoil with unit chord.
+
+    Stations are cosine spaced, so they cluster at the leading and trailing edges like most published .dat files.
+
+    Args:
+        code (str): Four digit designation, e.g. "2412"
+        num_points (int): Number of points per surface, both surfaces include the leading edge
+        closed_trailing_edge (bool): Use the modified thickness coefficient that closes the trailing edge at (1, 0)
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (num_points, 2) upper surface from the trailing edge to the leading edge and
+            (num_points, 2) lower surface from the leading edge to the trailing edge
+    """
+    if len(code) != 4 or not code.isdigit():
+        raise ValueError(f"A NACA four digit code needs 4 digits, got {code!r}")
+    max_camber, max_camber_location, thickness = int(code[0]) / 100, int(code[1]) / 10, int(code[2:]) / 100
+
+    x = 0.5 * (1.0 - np.cos(np.linspace(0.0, np.pi, num_points)))
+    last_coefficient = -0.1036 if closed_trailing_edge else -0.1015
+    half_thickness = 5.0 * thickness * (0.2969 * np.sqrt(x) - 0.1260 * x - 0.3516 * x**2 + 0.2843 * x**3
+                                        + last_coefficient * x**4)
+
+    camber = np.zeros_like(x)
+    camber_slope = np.zeros_like(x)
+    if max_camber > 0.0 and max_camber_location > 0.0:
+        front = x < max_camber_location
+        p = max_camber_location
+        camber = np.where(front, max_camber / p**2 * (2 * p * x - x**2),
+                          max_camber / (1 - p)**2 * (1 - 2 * p + 2 * p * x - x**2))
+        camber_slope = np.where(front, 2 * max_camber / p**2 * (p - x), 2 * max_camber / (1 - p)**2 * (p - x))
+    theta = np.arctan(camber_slope)
+
+    upper_surface = np.column_stack((x - half_thickness * np.sin(theta), camber + half_thickness * np.cos(theta)))
+    lower_surface = np.column_stack((x + half_thickness * np.sin(theta), camber - half_thickness * np.cos(theta)))
+
+    return np.ascontiguousarray(upper_surface[::-1]), lower_surface
+
+
+def naca4_airfoil(code: str, num_points: int = 100, closed_trailing_edge: bool = True) -> Airfoil:
+    """Generates a NACA four digit Airfoil without reading a file."""
+    upper_surface, lower_surface = naca4_surfaces(code, num_points, closed_trailing_edge)
+    return Airfoil(airfoil_name=f"NACA {code}", upper_surface=upper_surface, lower_surface=lower_surface)
+
+
+def write_dat_file(filepath: str, airfoil_name: str, upper_surface: np.ndarray, lower_surface: np.ndarray) -> None:
+    """Writes surfaces to a Selig .dat file that read_dat_file and Airfoil.generate_upper_lower_surfaces can read.
+
+    The leading edge point is written once when both surfaces share it.
+    """
+    if np.array_equal(upper_surface[-1], lower_surface[0]):
+        lower_surface = lower_surface[1:]
+    points = np.concatenate((upper_surface, lower_surface))
+    np.savetxt(filepath, points, fmt="%.7f", header=airfoil_name, comments="")
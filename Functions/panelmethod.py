@@ -0,0 +1,180 @@
+import logging
+import numpy as np
+from airfoil import Airfoil
+from airfoiltools import AirfoilTools
+from instrumentation import count, instrumented
+
+logger = logging.getLogger(__name__)
+
+# Inviscid linear-strength vortex panel method (Kuethe & Chow) for stacks of profiles sharing a point count. The
+# influence matrix of a profile does not depend on the angle of attack and the freestream enters the right hand side
+# linearly through cos(alpha) and sin(alpha), so every profile is solved once for the 0 and 90 degree freestreams
+# and any angle of attack is the matching combination of those two vortex distributions.
+
+# Profiles per batched solve, keeping the (batch, panels, panels) influence terms to a few hundred MB at most
+DEFAULT_BATCH_SIZE = 64
+
+
+class PanelSolution:
+    """Pressure distribution and section coefficients of a stack of profiles over a sweep of angles of attack
+
+    Arrays lead with the profile index, then the angle of attack where it applies. Coefficients use the chord from
+    the leading edge (the most forward node) to the trailing edge and the moment is about the quarter chord point,
+    positive nose up.
+    """
+
+    __slots__ = ("alphas", "control_points", "cp", "cl", "cd", "cm", "zero_lift_angle", "cm0", "lift_slope")
+
+    def __init__(self, alphas, control_points, cp, cl, cd, cm, zero_lift_angle, cm0, lift_slope) -> None:
+        self.alphas: np.ndarray = alphas  # (A,) degrees
+        self.control_points: np.ndarray = control_points  # (B, M, 2) panel midpoints
+        self.cp: np.ndarray = cp  # (B, A, M) pressure coefficient at every control point
+        self.cl: np.ndarray = cl  # (B, A) lift coefficient from the pressure integral
+        self.cd: np.ndarray = cd  # (B, A) pressure drag, zero up to discretisation error
+        self.cm: np.ndarray = cm  # (B, A) quarter chord moment coefficient
+        self.zero_lift_angle: np.ndarray = zero_lift_angle  # (B,) degrees
+        self.cm0: np.ndarray = cm0  # (B,) quarter chord moment coefficient at zero lift
+        self.lift_slope: np.ndarray = lift_slope  # (B,) per radian, about the zero lift angle
+
+
+def _influence_matrices(nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Assembles the normal and tangential influence matrices of a stack of clockwise panel contours.
+
+    Args:
+        nodes (np.ndarray): (B, M + 1, 2) panel end points, clockwise from the trailing edge along the lower surface
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: (B, M + 1, M + 1) normal influence matrices with the Kutta
+            condition as the last row, (B, M, M + 1) tangential influence matrices and (B, M) panel angles
+    """
+    num_panels = nodes.shape[1] - 1
+    points = nodes[..., 0] + 1j * nodes[..., 1]
+    panels = np.diff(points, axis=1)
+    lengths = np.abs(panels)
+    directions = panels / lengths
+    control_points = points[:, :-1] + 0.5 * panels
+
+    # With z the control point i (axis 1) in the frame of panel j (axis 2), its start at the origin and the panel
+    # along the real axis, and L = log((z - S) / z), the Kuethe & Chow coefficients of the panel's start and end node
+    # reduce to (Cn1 + i Ct1, Cn2 + i Ct2) = e^(i (theta_i - theta_j)) (L - 1 - z L / S, 1 + z L / S). Complex
+    # arithmetic on the (B, M, M) arrays replaces a few dozen real passes with trigonometric functions.
+    z = (control_points[:, :, None] - points[:, None, :-1]) * directions.conj()[:, None, :]
+    s = lengths[:, None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logarithms = np.log1p(-s / z)
+    end_terms = z * logarithms
+    end_terms /= s
+    end_terms += 1.0
+    start_terms = logarithms - end_terms
+    rotations = directions[:, :, None] * directions.conj()[:, None, :]
+    start_terms *= rotations
+    end_terms *= rotations
+
+    diagonal = np.arange(num_panels)
+    start_terms[:, diagonal, diagonal] = -1.0 + 0.5j * np.pi
+    end_terms[:, diagonal, diagonal] = 1.0 + 0.5j * np.pi
+
+    # Node j carries the end of panel j - 1 and the start of panel j
+    batch_size = len(nodes)
+    normal = np.zeros((batch_size, num_panels + 1, num_panels + 1))
+    normal[:, :-1, :-1] = start_terms.real
+    normal[:, :-1, 1:] += end_terms.real
+    normal[:, -1, 0] = normal[:, -1, -1] = 1.0
+    tangent = np.zeros((batch_size, num_panels, num_panels + 1))
+    tangent[:, :, :-1] = start_terms.imag
+    tangent[:, :, 1:] += end_terms.imag
+
+    return normal, tangent, np.angle(directions)
+
+
+def _solve_batch(profiles: np.ndarray, alphas: np.ndarray) -> tuple:
+    # Reversing upper (trailing to leading edge) then lower (leading to trailing edge) gives the clockwise order of
+    # the method, and the duplicated leading edge point is dropped
+    num_points = profiles.shape[1] // 2
+    nodes = np.concatenate((profiles[:, :num_points], profiles[:, num_points + 1:]), axis=1)[:, ::-1]
+    normal, tangent, angles = _influence_matrices(nodes)
+
+    # One factorisation per profile, solved for the 0 and 90 degree freestreams together
+    right_hand_sides = np.zeros((len(nodes), nodes.shape[1], 2))
+    right_hand_sides[:, :-1, 0] = np.sin(angles)
+    right_hand_sides[:, :-1, 1] = -np.cos(angles)
+    basis_strengths = np.linalg.solve(normal, right_hand_sides)
+
+    # Tangential velocity over the freestream speed at every control point for every angle of attack
+    basis_velocities = tangent @ basis_strengths
+    basis_velocities[..., 0] += np.cos(angles)
+    basis_velocities[..., 1] += np.sin(angles)
+    alpha_radians = np.radians(alphas)
+    freestream = np.stack((np.cos(alpha_radians), np.sin(alpha_radians)))
+    cp = 1.0 - np.einsum("bmk,ka->bam", basis_velocities, freestream)**2
+
+    # Pressure forces, the outward normal lies to the left of a clockwise panel
+    panel_vectors = np.diff(nodes, axis=1)
+    lengths = np.linalg.norm(panel_vectors, axis=-1)
+    outward_normals = np.stack((-panel_vectors[..., 1], panel_vectors[..., 0]), axis=-1)
+    control_points = nodes[:, :-1] + 0.5 * panel_vectors
+
+    leading_edges = nodes[np.arange(len(nodes)), np.argmin(nodes[..., 0], axis=1)]
+    trailing_edges = 0.5 * (nodes[:, 0] + nodes[:, -1])
+    chords = np.linalg.norm(trailing_edges - leading_edges, axis=1)
+    quarter_chords = leading_edges + 0.25 * (trailing_edges - leading_edges)
+
+    forces = -np.einsum("bam,bmk->bak", cp, outward_normals) / chords[:, None, None]
+    cos_alpha, sin_alpha = np.cos(alpha_radians), np.sin(alpha_radians)
+    cl = forces[..., 1] * cos_alpha - forces[..., 0] * sin_alpha
+    cd = forces[..., 0] * cos_alpha + forces[..., 1] * sin_alpha
+    arms = control_points - quarter_chords[:, None, :]
+    # Nose up is clockwise with the chord along +x, hence the sign of the cross product
+    moment_arms = arms[..., 0] * outward_normals[..., 1] - arms[..., 1] * outward_normals[..., 0]
+    cm = np.einsum("bam,bm->ba", cp, moment_arms) / chords[:, None]**2
+
+    # Circulation lift is linear in cos(alpha) and sin(alpha), which gives the zero lift angle in closed form
+    panel_strengths = 0.5 * (basis_strengths[:, :-1] + basis_strengths[:, 1:])
+    lift_basis = 4.0 * np.pi * np.einsum("bmk,bm->bk", panel_strengths, lengths) / chords[:, None]
+    zero_lift_radians = np.arctan2(-lift_basis[:, 0], lift_basis[:, 1])
+    lift_slope = np.hypot(lift_basis[:, 0], lift_basis[:, 1])
+
+    zero_lift_velocities = basis_velocities @ np.stack((np.cos(zero_lift_radians), np.sin(zero_lift_radians)),
+                                                       axis=1)[:, :, None]
+    cm0 = np.einsum("bm,bm->b", 1.0 - zero_lift_velocities[..., 0]**2, moment_arms) / chords**2
+
+    return control_points, cp, cl, cd, cm, np.degrees(zero_lift_radians), cm0, lift_slope
+
+
+@instrumented("panelmethod.solve_profiles")
+def solve_profiles(profiles, alphas, batch_size: int = DEFAULT_BATCH_SIZE) -> PanelSolution:
+    """Solves the inviscid flow around a stack of profiles for a sweep of angles of attack.
+
+    Profiles are taken as they are, so pass untwisted profiles such as Glider.unit_rib_profiles() and add the rib
+    twist to the angle of attack. Every profile is factorised once however many angles are swept.
+
+    Args:
+        profiles (array_like): (2 * N, 2) profile or (B, 2 * N, 2) stack, upper surface (trailing to leading edge)
+            first, both surfaces sharing the leading edge point
+        alphas (array_like): (A,) angles of attack in degrees
+        batch_size (int): Profiles assembled and solved together, bounding the memory of the influence terms
+
+    Returns:
+        PanelSolution: Pressure distributions and coefficients of every profile and angle
+    """
+    profiles = np.asarray(profiles, dtype=np.float64)
+    if profiles.ndim == 2:
+        profiles = profiles[None]
+    if profiles.ndim != 3 or profiles.shape[2] != 2 or profiles.shape[1] % 2 != 0:
+        raise ValueError("Profiles must be a (B, 2 * N, 2) stack with both surfaces of equal length")
+    alphas = np.atleast_1d(np.asarray(alphas, dtype=np.float64))
+
+    batches = [_solve_batch(profiles[start:start + batch_size], alphas)
+               for start in range(0, len(profiles), batch_size)]
+    count("panelmethod.panels_solved", len(profiles) * (profiles.shape[1] - 2))
+    return PanelSolution(alphas, *(np.concatenate(parts) for parts in zip(*batches)))
+
+
+def solve_airfoils(airfoils: list[Airfoil], alphas, num_points: int = 100,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> PanelSolution:
+    """Resamples airfoils to num_points per surface and solves them as one stack, see solve_profiles()."""
+    airfoil_tools = AirfoilTools()
+    resampled_airfoils = [airfoil_tools._arc_length_resample(airfoil, num_points) for airfoil in airfoils]
+    profiles = np.stack([np.concatenate((airfoil.upper_surface, airfoil.lower_surface))
+                         for airfoil in resampled_airfoils])
+    return solve_profiles(profiles, alphas, batch_size)
@@ -0,0 +1,137 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Profiles are drawn as one closed outline per airfoil: the upper surface runs from the trailing edge to the leading
+# edge and the lower surface back again, so concatenating them traces the whole contour with a single trace.
+# Arrays are handed to plotly as float32 NumPy arrays, which it embeds as compact typed arrays instead of JSON lists.
+
+X_FIGURE_RANGE = np.array([-0.5, 1.5])
+Y_FIGURE_RANGE = np.array([-1, 1]) * 9 / 16 * 9 / 16
+
+
+def decimate(points, max_points: int | None) -> np.ndarray:
+    """Keeps at most max_points evenly spaced points along the second to last axis, always including both ends.
+
+    Args:
+        points (array_like): (..., N, D) points
+        max_points (int | None): Largest number of points to keep, None keeps them all
+
+    Returns:
+        np.ndarray: (..., M, D) points, a view when nothing is removed
+    """
+    points = np.asarray(points)
+    num_points = points.shape[-2]
+    if max_points is None or num_points <= max_points:
+        return points
+    if max_points < 2:
+        raise ValueError("Decimation needs to keep at least 2 points")
+    keep = np.unique(np.round(np.linspace(0, num_points - 1, max_points)).astype(np.intp))
+    return points[..., keep, :]
+
+
+def profile_outlines(upper_surfaces, lower_surfaces, max_points: int | None = None) -> np.ndarray:
+    """Joins upper and lower surfaces into closed outlines ready to plot.
+
+    Args:
+        upper_surfaces (array_like): (..., N, 2) upper surfaces, trailing edge to leading edge
+        lower_surfaces (array_like): (..., M, 2) lower surfaces, leading edge to trailing edge
+        max_points (int | None): Largest number of points kept per surface
+
+    Returns:
+        np.ndarray: (..., N + M, 2) float32 outlines
+    """
+    return np.concatenate((decimate(upper_surfaces, max_points), decimate(lower_surfaces, max_points)),
+                          axis=-2).astype(np.float32)
+
+
+def plot_airfoil(airfoil, title: str = "", max_points: int | None = None) -> go.Figure:
+    """Builds a figure of one airfoil outline.
+
+    Args:
+        airfoil (Airfoil): The airfoil to draw
+        title (str): Figure title
+        max_points (int | None): Largest number of points drawn per surface
+
+    Returns:
+        go.Figure: The figure
+    """
+    outline = profile_outlines(airfoil.upper_surface, airfoil.lower_surface, max_points)
+    fig = go.Figure(go.Scattergl(x=outline[:, 0], y=outline[:, 1], mode="lines", name=airfoil.airfoil_name))
+    fig.update_layout(xaxis_range=X_FIGURE_RANGE, yaxis_range=Y_FIGURE_RANGE, title=title)
+    return fig
+
+
+def morph_animation(upper_surfaces, lower_surfaces, percentages, title: str = "Airfoil Morphing",
+                    max_points: int | None = None, max_frames: int | None = None) -> go.Figure:
+    """Builds an animated figure stepping through a stack of morphed profiles.
+
+    The figure holds a single trace. Each morph step is an animation frame that only replaces that trace's x and y,
+    and the slider jumps between frames, so the file grows by one outline per step rather than one trace per step.
+
+    Args:
+        upper_surfaces (array_like): (K, N, 2) upper surfaces, e.g. from AirfoilTools.morph_profiles
+        lower_surfaces (array_like): (K, N, 2) lower surfaces
+        percentages (array_like): (K,) morph fraction of every step
+        title (str): Figure title
+        max_points (int | None): Largest number of points drawn per surface
+        max_frames (int | None): Largest number of frames, steps are decimated evenly beyond this
+
+    Returns:
+        go.Figure: The animated figure
+    """
+    percentages = np.asarray(percentages, dtype=np.float64)
+    outlines = profile_outlines(upper_surfaces, lower_surfaces, max_points)
+    if max_frames is not None and len(outlines) > max_frames:
+        keep = np.unique(np.round(np.linspace(0, len(outlines) - 1, max_frames)).astype(np.intp))
+        outlines, percentages = outlines[keep], percentages[keep]
+
+    frame_names = [f"{percentage:.3f}" for percentage in percentages]
+    frames = [go.Frame(data=[go.Scattergl(x=outline[:, 0], y=outline[:, 1])], name=name)
+              for outline, name in zip(outlines, frame_names)]
+    steps = [dict(method="animate", label=name,
+                  args=[[name], dict(mode="immediate", frame=dict(duration=0, redraw=True), transition=dict(duration=0))])
+             for name in frame_names]
+
+    fig = go.Figure(data=[go.Scattergl(x=outlines[0, :, 0], y=outlines[0, :, 1], mode="lines", name="Morphed")],
+                    frames=frames)
+    fig.update_layout(
+        sliders=[dict(active=0, currentvalue={"prefix": "Morph Percent: "}, pad={"t": 10}, steps=steps)],
+        updatemenus=[dict(type="buttons", showactive=False, buttons=[
+            dict(label="Play", method="animate",
+                 args=[None, dict(frame=dict(duration=30, redraw=True), transition=dict(duration=0), fromcurrent=True)]),
+            dict(label="Pause", method="animate",
+                 args=[[None], dict(mode="immediate", frame=dict(duration=0, redraw=False))])])],
+        title=title,
+        xaxis_title="X",
+        yaxis_title="Y",
+        xaxis_range=X_FIGURE_RANGE,
+        yaxis_range=Y_FIGURE_RANGE,
+        autosize=True,
+    )
+    return fig
+
+
+def plot_wing(canopy_points, title: str = "", max_points: int | None = None) -> go.Figure:
+    """Builds a 3D figure of every rib outline of a wing as a single WebGL trace.
+
+    The closed rib outlines are joined with NaN gaps, so a 60 rib wing is one trace rather than sixty.
+
+    Args:
+        canopy_points (array_like): (ribs, P, 3) rib outlines, e.g. from Glider.canopy_points
+        title (str): Figure title
+        max_points (int | None): Largest number of points drawn per rib
+
+    Returns:
+        go.Figure: The figure
+    """
+    outlines = decimate(canopy_points, max_points)
+    num_ribs = len(outlines)
+    # Close each outline, then add a NaN row that breaks the line before the next rib
+    points = np.full((num_ribs, outlines.shape[1] + 2, 3), np.nan, dtype=np.float32)
+    points[:, :-2] = outlines
+    points[:, -2] = outlines[:, 0]
+    points = points.reshape(-1, 3)
+
+    fig = go.Figure(go.Scatter3d(x=points[:, 0], y=points[:, 1], z=points[:, 2], mode="lines", name="Ribs"))
+    fig.update_layout(title=title, scene=dict(aspectmode="data"))
+    return fig
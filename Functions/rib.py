@@ -1,25 +1,95 @@
 from airfoil import Airfoil
 import numpy as np
-import scipy as sp
+from crossport import Crossport, outline_separations, polygon_areas
+from transforms import compose, place_profiles, rotation_matrices, scale_matrices, translation_matrices
 
 
 class Rib:
-    """A standard paragliding rib containing an airfoil and port holes to allow for """
-    def __init__(self, position=None, rotation=None, airfoil: Airfoil = None) -> None:
+    """A standard paragliding rib containing an airfoil and port holes to allow for 
+
+    position is the world position of the leading edge. rotation holds the arc roll (about x), twist (about y,
+    positive nose up) and yaw (about z) in degrees, applied to the airfoil in the order twist, roll, yaw. scale is
+    applied first and is 1.0 when the airfoil is already sized to the rib chord.
+
+    cross_ports holds the placed outline of every port cut out of the rib, in airfoil coordinates.
+    """
+
+    DEFAULT_CROSSPORT_MARGIN = 0.01
+
+    def __init__(self, position=None, rotation=None, airfoil: Airfoil = None, scale: float = 1.0) -> None:
         self.airfoil: Airfoil | None = airfoil
-        self.position = position
-        self.rotation = rotation
-        self.cross_ports = []
+        self.position: np.ndarray = np.zeros(3) if position is None else np.asarray(position, dtype=np.float64)
+        self.rotation: np.ndarray = np.zeros(3) if rotation is None else np.asarray(rotation, dtype=np.float64)
+        self.scale: float = scale
+        self.cross_ports: list[np.ndarray] = []
+
+    def transform_matrix(self) -> np.ndarray:
+        """Returns the 4x4 matrix placing rib coordinates in the world."""
+        roll, twist, yaw = np.radians(self.rotation)
+        return compose(translation_matrices(self.position), rotation_matrices(yaw, "z"), rotation_matrices(roll, "x"),
+                       rotation_matrices(twist, "y"), scale_matrices(self.scale))[0]
+
+    def world_points(self) -> np.ndarray:
+        """Returns the airfoil outline of the rib in world coordinates.
+
+        Returns:
+            np.ndarray: (P, 3) points, upper surface first
+        """
+        profile = np.concatenate((self.airfoil.upper_surface, self.airfoil.lower_surface))
+        return place_profiles(profile[None], self.transform_matrix()[None])[0]
+
+    def insert_crossport(self, position, shape: Crossport, margin: float = DEFAULT_CROSSPORT_MARGIN) -> np.ndarray:
+        """Cuts a port out of the rib after checking it keeps margin of material to the surfaces and other ports.
+
+        Clearance to the surfaces uses the airfoil's spatial index, so checking a port costs one KD-tree query for its
+        vertices.
+
+        Args:
+            position (array_like): (2,) centre of the port in airfoil coordinates
+            shape (Crossport): The port outline around its centre
+            margin (float): Minimum material width around the port
+
+        Raises:
+            ValueError: If the port leaves the rib, comes closer than margin to a surface or another port, or overlaps
+                or contains another port
+
+        Returns:
+            np.ndarray: (V, 2) placed outline, also appended to cross_ports
+        """
+        outline = shape.placed(position)
+        upper_y = self.airfoil.y_at_x(outline[:, 0], "upper")
+        lower_y = self.airfoil.y_at_x(outline[:, 0], "lower")
+        x_min = min(self.airfoil.upper_surface[:, 0].min(), self.airfoil.lower_surface[:, 0].min())
+        x_max = max(self.airfoil.upper_surface[:, 0].max(), self.airfoil.lower_surface[:, 0].max())
+        inside = (outline[:, 1] < upper_y) & (outline[:, 1] > lower_y) & (outline[:, 0] > x_min) & (outline[:, 0] < x_max)
+        if not inside.all():
+            raise ValueError(f"Crossport at {tuple(position)} extends outside the rib")
+
+        _, distances, _ = self.airfoil.nearest_surface_points(outline)
+        if distances.min() < margin:
+            raise ValueError(f"Crossport at {tuple(position)} leaves {distances.min():.4g} of material to the surface, "
+                             f"less than the margin of {margin}")
+
+        for existing in self.cross_ports:
+            # Zero when the outlines cross or one port sits inside the other
+            if outline_separations(outline, existing) < margin:
+                raise ValueError(f"Crossport at {tuple(position)} overlaps or is closer than {margin} to another port")
+
+        self.cross_ports.append(outline)
+        return outline
+
+    def material_area(self) -> float:
+        """Returns the area of the rib left after cutting out its ports."""
+        port_area = sum(float(polygon_areas(outline)) for outline in self.cross_ports)
+        return self.airfoil.area - port_area
 
-    def insert_crossport(self, position, shape):
-        raise NotImplementedError()
-        
-    
 
 class HRib:
     # To Do
-    raise NotImplementedError()
+    def __init__(self, *args, **kwargs) -> None:
+        raise NotImplementedError()
 
 class VRib:
     # To Do
-    raise NotImplementedError()
\ No newline at end of file
+    def __init__(self, *args, **kwargs) -> None:
+        raise NotImplementedError()
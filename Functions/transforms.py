@@ -0,0 +1,106 @@
+import numpy as np
+
+# World axes: x runs chordwise from the leading edge towards the trailing edge, y along the span to the right and z up.
+# A 2D profile point (x, y) lies in the rib plane at (x, 0, y).
+
+
+def identity_matrices(count: int) -> np.ndarray:
+    """Returns a stack of count 4x4 identity matrices."""
+    return np.tile(np.eye(4), (count, 1, 1))
+
+
+def scale_matrices(scales) -> np.ndarray:
+    """Returns uniform scaling matrices.
+
+    Args:
+        scales (array_like): (R,) scale factors, e.g. rib chords
+
+    Returns:
+        np.ndarray: (R, 4, 4) homogeneous matrices
+    """
+    scales = np.atleast_1d(np.asarray(scales, dtype=np.float64))
+    matrices = identity_matrices(len(scales))
+    matrices[:, 0, 0] = matrices[:, 1, 1] = matrices[:, 2, 2] = scales
+    return matrices
+
+
+def rotation_matrices(angles, axis: str) -> np.ndarray:
+    """Returns right-handed rotation matrices about one of the world axes.
+
+    Args:
+        angles (array_like): (R,) rotation angles in radians
+        axis (str): "x", "y" or "z"
+
+    Returns:
+        np.ndarray: (R, 4, 4) homogeneous matrices
+    """
+    angles = np.atleast_1d(np.asarray(angles, dtype=np.float64))
+    if axis not in ("x", "y", "z"):
+        raise ValueError(f"Axis must be 'x', 'y' or 'z', got {axis!r}")
+    first, second = {"x": (1, 2), "y": (2, 0), "z": (0, 1)}[axis]
+    cos_angles, sin_angles = np.cos(angles), np.sin(angles)
+
+    matrices = identity_matrices(len(angles))
+    matrices[:, first, first] = cos_angles
+    matrices[:, first, second] = -sin_angles
+    matrices[:, second, first] = sin_angles
+    matrices[:, second, second] = cos_angles
+    return matrices
+
+
+def translation_matrices(offsets) -> np.ndarray:
+    """Returns translation matrices.
+
+    Args:
+        offsets (array_like): (R, 3) translations
+
+    Returns:
+        np.ndarray: (R, 4, 4) homogeneous matrices
+    """
+    offsets = np.atleast_2d(np.asarray(offsets, dtype=np.float64))
+    matrices = identity_matrices(len(offsets))
+    matrices[:, :3, 3] = offsets
+    return matrices
+
+
+def compose(*matrices: np.ndarray) -> np.ndarray:
+    """Composes stacks of transforms. compose(A, B, C) applies C first and A last, like A @ B @ C.
+
+    Returns:
+        np.ndarray: (R, 4, 4) composed matrices
+    """
+    result = matrices[0]
+    for matrix in matrices[1:]:
+        result = result @ matrix
+    return result
+
+
+def apply_transforms(points, matrices) -> np.ndarray:
+    """Applies one transform per rib to every point of that rib.
+
+    Args:
+        points (array_like): (R, P, 3) points
+        matrices (array_like): (R, 4, 4) homogeneous matrices
+
+    Returns:
+        np.ndarray: (R, P, 3) transformed points
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    return np.asarray(points, dtype=np.float64) @ matrices[:, :3, :3].transpose(0, 2, 1) + matrices[:, None, :3, 3]
+
+
+def place_profiles(profiles, matrices) -> np.ndarray:
+    """Places 2D rib profiles in 3D with one batched matrix multiply.
+
+    The profiles are embedded in the rib plane as (x, 0, y), so only the x and z columns of each matrix contribute.
+
+    Args:
+        profiles (array_like): (R, P, 2) profiles in rib coordinates
+        matrices (array_like): (R, 4, 4) homogeneous matrices
+
+    Returns:
+        np.ndarray: Contiguous (R, P, 3) world points
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    planar_columns = matrices[:, :3, [0, 2]]
+    return np.asarray(profiles, dtype=np.float64) @ planar_columns.transpose(0, 2, 1) + matrices[:, None, :3, 3]
@@ -0,0 +1,226 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Iterator
+import numpy as np
+from glider import Glider, ScaledBlendLaw
+import instrumentation
+from instrumentation import count, span
+from lineplan import LinePlan
+
+logger = logging.getLogger(__name__)
+
+# Per-process copies of the sweep inputs, set once by _init_worker instead of being sent with every task
+_worker_state: dict = {}
+
+
+def _init_worker(glider: Glider, line_plan: LinePlan, riser_axes: list[int], riser_values: tuple[np.ndarray, ...],
+                 output_dir: str) -> None:
+    _worker_state.update(glider=glider, line_plan=line_plan, base_blend_law=glider.blend_law, riser_axes=riser_axes,
+                         riser_values=riser_values, fixed_riser_offsets=line_plan.riser_offsets.copy(),
+                         output_dir=output_dir, blend_scale=None)
+
+
+def _init_pool_worker(instrumentation_enabled: bool, *initargs) -> None:
+    # A forked worker starts with a copy of the parent's records, which must not be sent back a second time
+    instrumentation.reset()
+    if instrumentation_enabled:
+        instrumentation.enable()
+    _init_worker(*initargs)
+
+
+def _run_pool_chunk(task: tuple[int, float, int, int]) -> tuple[str, dict]:
+    """Runs _run_chunk() in a pool worker and returns the chunk file name with the spans and counters it recorded."""
+    chunk_name = _run_chunk(task)
+    return chunk_name, instrumentation.take_records()
+
+
+def _run_chunk(task: tuple[int, float, int, int]) -> str:
+    """Evaluates one chunk of riser offset combinations at one blend scale and writes it to disk.
+
+    Returns:
+        str: The chunk file name
+    """
+    blend_index, blend_scale, start, stop = task
+    with span("trimsweep.run_chunk", blend_scale=blend_scale, start=start, stop=stop):
+        return _evaluate_chunk(blend_index, blend_scale, start, stop)
+
+
+def _evaluate_chunk(blend_index: int, blend_scale: float, start: int, stop: int) -> str:
+    riser_values = _worker_state["riser_values"]
+    glider: Glider = _worker_state["glider"]
+    line_plan: LinePlan = _worker_state["line_plan"]
+
+    # Geometry only depends on the blend, so consecutive chunks at the same blend reuse it
+    if _worker_state["blend_scale"] != blend_scale:
+        glider.blend_law = ScaledBlendLaw(_worker_state["base_blend_law"], blend_scale)
+        line_plan.update_attachment_positions(glider)
+        line_plan.riser_offsets[:] = 0.0
+        _worker_state["base_path_lengths"] = line_plan.attachment_path_lengths().copy()
+        _worker_state["blend_scale"] = blend_scale
+
+    # Every riser offset combination of the chunk at once, (C, risers)
+    combination_index = np.unravel_index(np.arange(start, stop), [len(values) for values in riser_values])
+    riser_offsets = np.tile(_worker_state["fixed_riser_offsets"], (stop - start, 1))
+    for axis, (riser_index, values) in enumerate(zip(_worker_state["riser_axes"], riser_values)):
+        riser_offsets[:, riser_index] = values[combination_index[axis]]
+
+    attachment_risers = line_plan.line_riser[line_plan.attachment_lines]
+    path_lengths = _worker_state["base_path_lengths"][None, :] + riser_offsets[:, attachment_risers]
+    parameters = np.column_stack([np.full(stop - start, blend_scale)] +
+                                 [values[index] for values, index in zip(riser_values, combination_index)])
+
+    count("trimsweep.combinations", stop - start)
+    chunk_name = TrimSweep.chunk_name(blend_index, start)
+    output_dir = _worker_state["output_dir"]
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            np.savez(file, parameters=parameters, path_lengths=path_lengths)
+        os.replace(temporary_path, os.path.join(output_dir, chunk_name))
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+    return chunk_name
+
+
+class TrimSweep:
+    """A grid sweep of riser offsets and airfoil blend over a glider and its line plan
+
+    The grid is the Cartesian product of the blend scales (applied to the glider blend law) and one axis of offsets
+    per swept riser, e.g. the A, B, C, D and brake risers. Risers that are not swept keep their line plan offset.
+    Each blend scale changes the wing geometry, so the attachment points are placed once per blend. All riser offset
+    combinations at that blend are then evaluated as one array operation, chunk_size combinations at a time.
+
+    Chunks are spread over a process pool and each is written to its own .npz file in output_dir as soon as it is
+    done, holding a (C, 1 + risers) parameters array and the (C, attachments) riser-to-attachment path lengths.
+    Finished chunks are skipped when a sweep is run again, so an interrupted sweep resumes where it stopped. The
+    manifest stores a fingerprint of the glider and line plan, and resuming with changed inputs is refused.
+    Results are read back lazily with iter_results().
+    """
+
+    MANIFEST_FILENAME = "manifest.json"
+
+    def __init__(self, glider: Glider, line_plan: LinePlan, output_dir: str, riser_offsets: dict[str, np.ndarray],
+                 blend_scales=(1.0,), chunk_size: int = 4096) -> None:
+        self.glider: Glider = glider
+        self.line_plan: LinePlan = line_plan
+        self.output_dir: str = output_dir
+        self.riser_names: list[str] = list(riser_offsets)
+        self.riser_values: tuple[np.ndarray, ...] = tuple(np.asarray(values, dtype=np.float64)
+                                                          for values in riser_offsets.values())
+        self.blend_scales: np.ndarray = np.asarray(blend_scales, dtype=np.float64)
+        self.chunk_size: int = chunk_size
+        self.riser_axes: list[int] = [line_plan.riser_nodes.index(line_plan.node_names.index(name))
+                                      for name in self.riser_names]
+
+    @property
+    def parameter_names(self) -> list[str]:
+        """Column names of the parameters array in every chunk"""
+        return ["blend_scale"] + self.riser_names
+
+    @property
+    def num_combinations(self) -> int:
+        """Number of riser offset combinations per blend scale"""
+        return int(np.prod([len(values) for values in self.riser_values]))
+
+    @staticmethod
+    def chunk_name(blend_index: int, start: int) -> str:
+        return f"chunk-{blend_index:05d}-{start:012d}.npz"
+
+    def tasks(self) -> list[tuple[int, float, int, int]]:
+        """Returns every chunk of the sweep as (blend index, blend scale, start, stop)."""
+        return [(blend_index, float(blend_scale), start, min(start + self.chunk_size, self.num_combinations))
+                for blend_index, blend_scale in enumerate(self.blend_scales)
+                for start in range(0, self.num_combinations, self.chunk_size)]
+
+    def completed_chunks(self) -> set[str]:
+        """Returns the names of the chunk files already on disk."""
+        if not os.path.isdir(self.output_dir):
+            return set()
+        return {name for name in os.listdir(self.output_dir) if name.startswith("chunk-") and name.endswith(".npz")}
+
+    def run(self, max_workers: int | None = None) -> None:
+        """Runs every chunk that is not on disk yet.
+
+        Args:
+            max_workers (int | None): Number of worker processes, 1 runs serially in this process
+        """
+        self._write_manifest()
+        completed = self.completed_chunks()
+        pending = [task for task in self.tasks() if self.chunk_name(task[0], task[2]) not in completed]
+        logger.info(f"Sweep of {len(self.tasks())} chunks, {len(pending)} remaining")
+        if not pending:
+            return
+
+        # Workers get their own copies, the caller's glider and line plan are left untouched
+        initargs = (copy.deepcopy(self.glider), copy.deepcopy(self.line_plan), self.riser_axes, self.riser_values,
+                    self.output_dir)
+        max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        if max_workers == 1:
+            _init_worker(*initargs)
+            for task in pending:
+                logger.debug(f"Wrote {_run_chunk(task)}")
+            return
+
+        # Spans and counters recorded in the workers come back with every chunk and join this process' records
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_pool_worker,
+                                 initargs=(instrumentation.is_enabled(), *initargs)) as executor:
+            for chunk_name, records in executor.map(_run_pool_chunk, pending):
+                instrumentation.merge_records(records)
+                logger.debug(f"Wrote {chunk_name}")
+
+    def input_fingerprint(self) -> str:
+        """Returns a SHA-256 hash of the glider and line plan state the chunks are computed from.
+
+        The glider enters through its unit rib profiles and rib transforms, which cover the airfoils or airfoil family,
+        the laws and the point count. The line plan enters through its node positions, trims, line topology, riser
+        offsets and attachment stations.
+        """
+        line_plan = self.line_plan
+        arrays = [self.glider.unit_rib_profiles(), self.glider.rib_transforms(), line_plan.node_positions,
+                  line_plan.trims, line_plan.line_upper, line_plan.line_lower, line_plan.riser_offsets,
+                  line_plan.attachment_nodes, line_plan.attachment_ribs, line_plan.attachment_fractions]
+        digest = hashlib.sha256()
+        for array in arrays:
+            array = np.ascontiguousarray(array, dtype=np.float64)
+            digest.update(repr(array.shape).encode("ascii"))
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def iter_results(self) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Yields (parameters, path_lengths) for every finished chunk in grid order, one chunk in memory at a time."""
+        completed = self.completed_chunks()
+        for task in self.tasks():
+            chunk_name = self.chunk_name(task[0], task[2])
+            if chunk_name in completed:
+                with np.load(os.path.join(self.output_dir, chunk_name)) as data:
+                    yield data["parameters"], data["path_lengths"]
+
+    def _write_manifest(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest = {
+            "parameter_names": self.parameter_names,
+            "blend_scales": self.blend_scales.tolist(),
+            "riser_values": [values.tolist() for values in self.riser_values],
+            "chunk_size": self.chunk_size,
+            "attachments": [self.line_plan.node_names[node] for node in self.line_plan.attachment_nodes],
+            "input_fingerprint": self.input_fingerprint(),
+        }
+        manifest_path = os.path.join(self.output_dir, self.MANIFEST_FILENAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as file:
+                existing_manifest = json.load(file)
+            if existing_manifest.get("input_fingerprint") != manifest["input_fingerprint"]:
+                raise ValueError(f"{self.output_dir} holds a sweep of a different glider or line plan, use a new "
+                                 f"output directory")
+            if existing_manifest != manifest:
+                raise ValueError(f"{self.output_dir} holds a different sweep, use a new output directory")
+            return
+        with open(manifest_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
@@ -0,0 +1,45 @@
+import os
+import sys
+import pytest
+
+# The modules in Functions import each other by bare name, as when run from that directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Functions"))
+
+import instrumentation  # noqa: E402
+from glider import Glider  # noqa: E402
+from lineplan import LinePlan  # noqa: E402
+from naca import naca4_airfoil  # noqa: E402
+
+
+@pytest.fixture
+def glider():
+    return Glider(naca4_airfoil("2412", 100), naca4_airfoil("0012", 100), num_cells=8, num_points=50, arc_radius=6.0)
+
+
+@pytest.fixture
+def line_plan(glider):
+    """A and B risers on either side, each carrying two knots with two attachments each, compiled and placed"""
+    line_plan = LinePlan()
+    for row, chord_fraction, riser_x in (("A", 0.1, 0.3), ("B", 0.4, 0.6)):
+        for side in (-1, 1):
+            riser = line_plan.add_riser(f"{row}{side}", [riser_x, 0.2 * side, -7.0])
+            ribs = [rib for rib in range(glider.num_ribs) if (rib - glider.num_cells // 2) * side > 0]
+            for k in range(0, len(ribs), 2):
+                knot = line_plan.add_knot(f"{row}{side}k{k}", [riser_x, side * (1.0 + k), -4.0])
+                line_plan.add_line(f"{row}{side}m{k}", knot, riser)
+                for rib in ribs[k:k + 2]:
+                    attachment = line_plan.add_attachment(f"{row}{side}a{rib}", rib, chord_fraction)
+                    line_plan.add_line(f"{row}{side}u{rib}", attachment, knot)
+    line_plan.compile()
+    line_plan.update_attachment_positions(glider)
+    return line_plan
+
+
+@pytest.fixture
+def counters():
+    """Records instrumentation counters for one test, e.g. to check that an update was incremental"""
+    instrumentation.reset()
+    instrumentation.enable()
+    yield instrumentation._recorder.counters
+    instrumentation.disable()
+    instrumentation.reset()
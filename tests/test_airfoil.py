@@ -0,0 +1,178 @@
+import os
+import numpy as np
+import pytest
+from airfoil import Airfoil, AirfoilFileError, read_dat_file, surfaces_from_points
+from customfunctions import distance_to_polyline
+from naca import naca4_airfoil
+
+AIRFOIL_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Airfoils", "NACA 2412.dat")
+
+
+def write_lines(path, lines) -> str:
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+@pytest.fixture
+def airfoil():
+    airfoil = Airfoil()
+    airfoil.generate_upper_lower_surfaces(AIRFOIL_FILE)
+    return airfoil
+
+
+def test_surfaces_are_contiguous_arrays(airfoil):
+    for surface in (airfoil.upper_surface, airfoil.lower_surface):
+        assert surface.dtype == np.float64
+        assert surface.ndim == 2 and surface.shape[1] == 2
+        assert surface.flags.c_contiguous
+    np.testing.assert_array_equal(airfoil.upper_surface[0], [1.0, 0.0])
+    np.testing.assert_array_equal(airfoil.lower_surface[-1], [1.0, 0.0])
+    np.testing.assert_array_equal(airfoil.upper_surface[-1], airfoil.lower_surface[0])
+
+
+def test_list_surfaces_are_accepted_and_viewed(airfoil):
+    points = [np.array([1.0, 0.0]), np.array([0.0, 0.0]), np.array([1.0, -0.1])]
+    listed = Airfoil(upper_surface=points[:2], lower_surface=points[1:])
+    assert listed.upper_surface.shape == (2, 2)
+    assert isinstance(airfoil.upper_surface_list, list)
+    np.testing.assert_array_equal(np.array(airfoil.upper_surface_list), airfoil.upper_surface)
+
+    with pytest.raises(ValueError, match="shape"):
+        Airfoil(upper_surface=np.zeros((3, 3)))
+
+
+def test_selig_file(airfoil):
+    name, points = read_dat_file(AIRFOIL_FILE)
+    assert name == airfoil.airfoil_name == "NACA 2412"
+    assert len(airfoil.upper_surface) + len(airfoil.lower_surface) == len(points) + 1
+    assert airfoil.upper_surface[:, 0].min() == airfoil.upper_surface[-1, 0] == points[:, 0].min()
+
+
+def test_lednicer_file_matches_selig(tmp_path):
+    _, points = read_dat_file(AIRFOIL_FILE)
+    upper_surface, lower_surface = surfaces_from_points(points)
+    lines = ["NACA 2412 Lednicer", f"{len(upper_surface)}. {len(lower_surface)}."]
+    lines += [f"{x:.7f} {y:.7f}" for x, y in upper_surface[::-1]]
+    lines += [""]
+    lines += [f"{x:.7f} {y:.7f}" for x, y in lower_surface]
+    filepath = write_lines(tmp_path / "lednicer.dat", lines)
+
+    name, lednicer_points = read_dat_file(filepath)
+    assert name == "NACA 2412 Lednicer"
+    lednicer_upper, lednicer_lower = surfaces_from_points(lednicer_points)
+    np.testing.assert_allclose(lednicer_upper, upper_surface, atol=1e-7)
+    np.testing.assert_allclose(lednicer_lower, lower_surface, atol=1e-7)
+
+
+def test_file_without_name_line(tmp_path):
+    filepath = write_lines(tmp_path / "nameless.dat", ["1.0 0.0", "0.5 0.05", "0.0 0.0", "0.5 -0.05", "1.0 0.0"])
+    name, points = read_dat_file(filepath)
+    assert name == "nameless"
+    assert points.shape == (5, 2)
+
+
+@pytest.mark.parametrize("lines, message", [
+    (["Name", "1.0 0.0", "0.5 abc", "0.0 0.0"], "non-numeric"),
+    (["Name", "1.0 0.0", "0.5", "0.0 0.0"], "odd number"),
+    (["Name", "3. 3.", "0.0 0.0", "1.0 0.1", "0.0 0.0", "1.0 -0.1"], "Lednicer header"),
+    (["Name", "1.0 0.0", "0.0 0.0"], "at least 3 points"),
+])
+def test_malformed_files_raise(tmp_path, lines, message):
+    filepath = write_lines(tmp_path / "malformed.dat", lines)
+    with pytest.raises(AirfoilFileError, match=message):
+        read_dat_file(filepath)
+
+
+def test_leading_edge_at_an_end_raises(tmp_path):
+    filepath = write_lines(tmp_path / "reversed.dat", ["Name", "0.0 0.0", "0.5 0.05", "1.0 0.0"])
+    with pytest.raises(AirfoilFileError, match="Selig order"):
+        Airfoil().generate_upper_lower_surfaces(filepath)
+    with pytest.raises(FileNotFoundError):
+        Airfoil().generate_upper_lower_surfaces(str(tmp_path / "missing.dat"))
+
+
+def test_arc_length_cache_follows_the_geometry(airfoil):
+    upper_arc_length = airfoil.upper_arc_length
+    assert airfoil.upper_arc_length is upper_arc_length
+
+    airfoil.adjust_chord_length(2.0)
+    np.testing.assert_allclose(airfoil.upper_arc_length, 2.0 * upper_arc_length)
+    np.testing.assert_allclose(airfoil.point_at_fraction(0.0), [2.0, 0.0])
+
+    airfoil.upper_surface = airfoil.upper_surface[::2]
+    assert len(airfoil.upper_arc_length) == len(airfoil.upper_surface)
+
+    airfoil.lower_surface[:, 1] *= 2.0
+    airfoil.invalidate_cache()
+    lower_length = np.linalg.norm(np.diff(airfoil.lower_surface, axis=0), axis=1).sum()
+    np.testing.assert_allclose(airfoil.lower_arc_length[-1], lower_length)
+
+
+def test_query_index_follows_the_geometry(airfoil):
+    thickness = airfoil.thickness_at_x(0.3)
+    airfoil.scale(2.0)
+    np.testing.assert_allclose(airfoil.thickness_at_x(0.6), 2.0 * thickness)
+
+    airfoil.lower_surface = airfoil.lower_surface + [0.0, -0.1]
+    np.testing.assert_allclose(airfoil.thickness_at_x(0.6), 2.0 * thickness + 0.1)
+
+    queries = np.array([[1.0, 2.0], [0.6, -0.5], [-0.1, 0.0]])
+    _, distances, surfaces = airfoil.nearest_surface_points(queries)
+    upper_distances = distance_to_polyline(queries, airfoil.upper_surface)
+    lower_distances = distance_to_polyline(queries, airfoil.lower_surface)
+    np.testing.assert_allclose(distances, np.minimum(upper_distances, lower_distances))
+    np.testing.assert_array_equal(surfaces[:2], [0, 1])
+
+
+def test_nearest_points_are_exact_on_mixed_densities():
+    # A 5 point upper surface over a 200 point lower one, the nearest vertices are often on the wrong surface
+    upper_surface = naca4_airfoil("2412", 5).upper_surface
+    lower_surface = naca4_airfoil("2412", 200).lower_surface
+    airfoil = Airfoil(upper_surface=upper_surface, lower_surface=lower_surface)
+    queries = np.random.default_rng(0).uniform([-0.2, -0.3], [1.2, 0.3], (5000, 2))
+
+    closest, distances, surfaces = airfoil.nearest_surface_points(queries)
+    upper_distances = distance_to_polyline(queries, upper_surface)
+    lower_distances = distance_to_polyline(queries, lower_surface)
+    np.testing.assert_allclose(distances, np.minimum(upper_distances, lower_distances), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(np.linalg.norm(closest - queries, axis=1), distances, rtol=0, atol=1e-12)
+    ties = np.isclose(upper_distances, lower_distances, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(surfaces[~ties], (lower_distances < upper_distances)[~ties])
+
+
+def test_section_properties_follow_the_geometry(airfoil):
+    area, centroid, max_thickness = airfoil.area, airfoil.centroid.copy(), airfoil.max_thickness
+    assert max_thickness == pytest.approx(0.12, abs=2e-3)
+    assert airfoil.max_camber == pytest.approx(0.02, abs=2e-3)
+
+    airfoil.scale(3.0)
+    assert airfoil.area == pytest.approx(9.0 * area)
+    np.testing.assert_allclose(airfoil.centroid, 3.0 * centroid)
+    assert airfoil.max_thickness == pytest.approx(3.0 * max_thickness)
+
+    airfoil.translate(1.0, 0.5)
+    np.testing.assert_allclose(airfoil.centroid, 3.0 * centroid + [1.0, 0.5])
+
+
+def test_chained_transforms_apply_once_and_spare_given_arrays():
+    airfoil = naca4_airfoil("2412", 50)
+    given_upper_surface = airfoil.upper_surface
+    original = given_upper_surface.copy()
+
+    airfoil.scale(2.0).rotate(90.0).translate(1.0, 0.0).flip("y")
+    assert airfoil.chord_length == 2.0
+    np.testing.assert_array_equal(given_upper_surface, original)
+
+    # Scale by 2, a 90 degree nose up turn maps (x, y) to (y, -x), shift by 1 and mirror x
+    expected = np.column_stack((-(2.0 * original[:, 1] + 1.0), -2.0 * original[:, 0]))
+    np.testing.assert_allclose(airfoil.upper_surface, expected, atol=1e-12)
+    np.testing.assert_array_equal(airfoil.pending_transform, np.eye(3))
+
+
+def test_reload_after_scale_resets_the_chord(airfoil):
+    airfoil.scale(2.0)
+    airfoil.generate_upper_lower_surfaces(AIRFOIL_FILE)
+    assert airfoil.chord_length == 1.0
+
+    airfoil.adjust_chord_length(1.0)
+    assert np.ptp(airfoil.upper_surface[:, 0]) == pytest.approx(1.0)
@@ -0,0 +1,29 @@
+import os
+import shutil
+from airfoilcache import AirfoilCache
+
+AIRFOIL_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Airfoils", "NACA 2412.dat")
+
+
+def test_eviction_uses_access_times_of_earlier_sessions(tmp_path):
+    filepaths = []
+    for i in range(4):
+        filepath = str(tmp_path / f"f{i}.dat")
+        shutil.copyfile(AIRFOIL_FILE, filepath)
+        filepaths.append(os.path.abspath(filepath))
+    cache_dir = str(tmp_path / "cache")
+
+    with AirfoilCache(cache_dir) as cache:
+        for filepath in filepaths[:3]:
+            cache.load(filepath)
+        entry_bytes = cache.size_bytes() // 3
+
+    # A session with nothing but a cache hit
+    with AirfoilCache(cache_dir) as cache:
+        cache.load(filepaths[0])
+
+    with AirfoilCache(cache_dir, max_bytes=3 * entry_bytes) as cache:
+        cache.load(filepaths[3])
+
+    cache = AirfoilCache(cache_dir)
+    assert sorted(cache._entries) == [filepaths[0], filepaths[2], filepaths[3]]
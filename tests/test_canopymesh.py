@@ -0,0 +1,29 @@
+import numpy as np
+from canopymesh import CanopyMesh
+
+
+def test_update_from_glider_matches_a_rebuild(glider, counters):
+    mesh = CanopyMesh.from_glider(glider)
+    glider.twist_law = lambda eta: 4.0 * eta
+    glider.blend_law = lambda eta: 0.5 * eta
+
+    counters.clear()
+    start, stop = mesh.update_from_glider(glider, [2, 3])
+    assert counters["airfoiltools.profiles_morphed"] == 2
+    assert (start, stop) == (1 * mesh.points_per_rib, 5 * mesh.points_per_rib)
+
+    # Only the given ribs follow the new laws
+    rebuilt = CanopyMesh.from_glider(glider)
+    vertices = mesh.vertices.reshape(glider.num_ribs, mesh.points_per_rib, 3)
+    rebuilt_vertices = rebuilt.vertices.reshape(glider.num_ribs, mesh.points_per_rib, 3)
+    np.testing.assert_allclose(vertices[[2, 3]], rebuilt_vertices[[2, 3]], rtol=0, atol=1e-6)
+    assert not np.allclose(vertices[5], rebuilt_vertices[5])
+
+    mesh.update_from_glider(glider)
+    np.testing.assert_allclose(mesh.vertices, rebuilt.vertices, rtol=0, atol=1e-6)
+    np.testing.assert_allclose(mesh.normals, rebuilt.normals, rtol=0, atol=1e-6)
+
+
+def test_rib_transforms_of_selected_ribs(glider):
+    glider.chord_law = lambda eta: 3.0 - eta
+    np.testing.assert_array_equal(glider.rib_transforms(rib_indices=[0, 4]), glider.rib_transforms()[[0, 4]])
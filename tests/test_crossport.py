@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from crossport import Crossport, outline_separations, validate_crossports
+from customfunctions import distance_to_polyline
+from naca import naca4_airfoil
+from rib import Rib
+
+
+@pytest.fixture
+def airfoil():
+    airfoil = naca4_airfoil("2412", 100)
+    airfoil.adjust_chord_length(2.0)
+    return airfoil
+
+
+def test_outline_separations():
+    square = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]])
+    assert outline_separations(square, square + [2.0, 0.0]) == pytest.approx(1.0)
+    assert outline_separations(square, square + [0.5, 0.5]) == 0.0
+    assert outline_separations(square, 0.2 * square + 0.4) == 0.0
+    assert outline_separations(0.2 * square + 0.4, square) == 0.0
+
+
+def test_nested_crossport_is_rejected(airfoil):
+    rib = Rib(airfoil=airfoil)
+    rib.insert_crossport((0.8, 0.06), Crossport.ellipse(0.3, 0.12))
+
+    with pytest.raises(ValueError, match="overlaps"):
+        rib.insert_crossport((0.84, 0.06), Crossport.ellipse(0.04, 0.03))
+    assert len(rib.cross_ports) == 1
+
+
+def test_nested_crossports_are_invalid(airfoil):
+    profiles = np.concatenate((airfoil.upper_surface, airfoil.lower_surface))[None]
+    outlines = np.stack((Crossport.ellipse(0.3, 0.12).placed((0.8, 0.06)),
+                         Crossport.ellipse(0.04, 0.03).placed((0.84, 0.06))))[None]
+
+    valid, _ = validate_crossports(profiles, 100, outlines, 0.01)
+    assert not valid.any()
+
+    # Moved apart, both ports fit
+    outlines[0, 1] += [0.5, 0.0]
+    valid, _ = validate_crossports(profiles, 100, outlines, 0.01)
+    assert valid.all()
+
+
+def test_clearance_is_exact_next_to_a_sparse_contour():
+    # The upper surface jumps from x = 0.9 to x = 0.1 in one segment over a densely sampled lower surface, so the
+    # vertices nearest to a port below that segment all lie on the lower surface
+    upper_x = np.concatenate((np.linspace(1.0, 0.9, 50), np.linspace(0.1, 0.0, 50)))
+    lower_x = np.linspace(0.0, 1.0, 100)
+    upper_surface = np.column_stack((upper_x, 0.1 * np.sin(np.pi * upper_x)))
+    lower_surface = np.column_stack((lower_x, -0.02 * np.sin(np.pi * lower_x)))
+    profiles = np.concatenate((upper_surface, lower_surface))[None]
+    outlines = Crossport.ellipse(0.02, 0.02).placed((0.5, 0.0159))[None, None]
+
+    valid, clearance = validate_crossports(profiles, 100, outlines, 0.008)
+    expected = distance_to_polyline(outlines[0, 0], profiles[0]).min()
+    assert clearance[0, 0] == pytest.approx(expected, abs=1e-12)
+    assert clearance[0, 0] < 0.008
+    assert not valid.any()
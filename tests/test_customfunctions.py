@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from customfunctions import (cumulative_arc_length, point_at_arc_length_percentage, points_at_arc_length_fractions,
+                             resample_path_with_endpoints)
+
+
+def baseline_point_at_percentage(points, percentage):
+    """The per-sample loop the vectorised engine replaced"""
+    distances = [np.linalg.norm(points[i] - points[i + 1]) for i in range(len(points) - 1)]
+    cumulative_distances = np.cumsum([0] + distances)
+    target_distance = percentage * cumulative_distances[-1]
+    segment_index = np.searchsorted(cumulative_distances, target_distance) - 1
+    segment_index = max(0, min(segment_index, len(points) - 2))
+    segment_length = distances[segment_index]
+    segment_percentage = ((target_distance - cumulative_distances[segment_index]) / segment_length
+                          if segment_length > 0 else 0)
+    return points[segment_index] + segment_percentage * (points[segment_index + 1] - points[segment_index])
+
+
+def baseline_resample(points, num_samples):
+    percentages = np.linspace(0, 1, num_samples)[1:-1]
+    return np.array([points[0]] + [baseline_point_at_percentage(points, p) for p in percentages] + [points[-1]])
+
+
+@pytest.fixture
+def paths():
+    # Uneven spacing and a repeated point, which gives a zero length segment
+    rng = np.random.default_rng(7)
+    paths = np.cumsum(rng.uniform(0.0, 1.0, (4, 30, 2)), axis=1)
+    paths[:, 10] = paths[:, 9]
+    return paths
+
+
+@pytest.mark.parametrize("num_samples", [2, 3, 57, 200])
+def test_resampling_matches_baseline(paths, num_samples):
+    for path in paths:
+        expected = baseline_resample(path, num_samples)
+        np.testing.assert_allclose(resample_path_with_endpoints(path, num_samples), expected, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(resample_path_with_endpoints(list(path), num_samples), expected, rtol=0, atol=1e-12)
+
+
+def test_stacked_resampling_matches_single_paths(paths):
+    stacked = resample_path_with_endpoints(paths.reshape(2, 2, 30, 2), 41)
+    assert stacked.shape == (2, 2, 41, 2)
+    for path, resampled in zip(paths, stacked.reshape(4, 41, 2)):
+        np.testing.assert_allclose(resampled, resample_path_with_endpoints(path, 41), rtol=0, atol=1e-12)
+
+
+def test_points_at_fractions_match_baseline(paths):
+    fractions = np.array([0.0, 0.1, 0.3333, 0.5, 0.97, 1.0])
+    positions = points_at_arc_length_fractions(paths, fractions, cumulative_arc_length(paths))
+    for path, path_positions in zip(paths, positions):
+        expected = np.array([baseline_point_at_percentage(path, fraction) for fraction in fractions])
+        np.testing.assert_allclose(path_positions, expected, rtol=0, atol=1e-12)
+        np.testing.assert_allclose(point_at_arc_length_percentage(path, 0.42),
+                                   baseline_point_at_percentage(path, 0.42), rtol=0, atol=1e-12)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        resample_path_with_endpoints(np.zeros((5, 2)), 1)
+    with pytest.raises(ValueError):
+        points_at_arc_length_fractions(np.zeros((1, 2)), [0.5])
@@ -0,0 +1,76 @@
+import copy
+import numpy as np
+import pytest
+from glidermodel import GliderModel
+from lineplan import lower_surface_points
+from naca import naca4_airfoil
+from transforms import place_profiles
+
+
+def full_recompute(model):
+    """Rib outlines and attachment path lengths computed from scratch with the model's per rib values"""
+    glider, line_plan = copy.deepcopy(model.glider), copy.deepcopy(model.line_plan)
+    glider.set_airfoils(model.glider.root_airfoil, model.glider.tip_airfoil)
+    profiles = glider.blended_profiles(model.blends)
+    transforms = glider.rib_transforms(model.chords, model.twists)
+
+    ribs = np.asarray(line_plan.attachment_ribs)
+    positions = lower_surface_points(profiles[ribs], glider.num_points, np.asarray(line_plan.attachment_fractions),
+                                     transforms[ribs])
+    line_plan.node_positions[line_plan.attachment_nodes] = positions
+    # Compiling again drops every cached length
+    line_plan.compile()
+    return place_profiles(profiles, transforms), line_plan.attachment_path_lengths()
+
+
+def assert_matches_full_recompute(model):
+    points, path_lengths = full_recompute(model)
+    np.testing.assert_allclose(model.canopy_points(), points, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(model.attachment_path_lengths(), path_lengths, rtol=0, atol=1e-12)
+
+
+@pytest.fixture
+def model(glider, line_plan):
+    model = GliderModel(glider, line_plan)
+    model.attachment_path_lengths()
+    return model
+
+
+def test_first_update_computes_everything(model):
+    assert len(model.last_update["profiles"]) == model.glider.num_ribs
+    assert len(model.last_update["attachments"]) == len(model.line_plan.attachment_nodes)
+    assert_matches_full_recompute(model)
+
+    assert all(len(indices) == 0 for indices in model.update().values())
+
+
+def test_rib_edits_recompute_only_their_ribs(model, counters):
+    model.set_rib_blend(6, 0.7)
+    changes = model.update()
+    np.testing.assert_array_equal(changes["profiles"], [6])
+    np.testing.assert_array_equal(changes["points"], [6])
+    assert counters["glidermodel.ribs_morphed"] == 1
+    assert sorted(model.line_plan.line_names[line] for line in changes["lines"]) == ["A1u6", "B1u6"]
+    assert_matches_full_recompute(model)
+
+    model.set_rib_twist([2, 3], 3.0)
+    changes = model.update()
+    assert len(changes["profiles"]) == 0
+    np.testing.assert_array_equal(changes["transforms"], [2, 3])
+    assert_matches_full_recompute(model)
+
+    # A larger maximum chord moves every leading edge
+    model.set_rib_chord(4, 5.0)
+    changes = model.update()
+    assert len(changes["transforms"]) == model.glider.num_ribs
+    assert_matches_full_recompute(model)
+
+
+def test_trim_and_airfoil_changes(model):
+    model.set_trim("A-1m2", 0.05)
+    assert_matches_full_recompute(model)
+
+    model.glider.set_airfoils(naca4_airfoil("4415", 100), model.glider.tip_airfoil)
+    changes = model.update()
+    assert len(changes["profiles"]) == model.glider.num_ribs
+    assert_matches_full_recompute(model)
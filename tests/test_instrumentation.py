@@ -0,0 +1,30 @@
+import json
+import instrumentation
+from instrumentation import count, span
+
+
+def test_records_merge_into_another_recorder(tmp_path):
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        with span("worker.task"):
+            count("worker.items", 3)
+        count("worker.items", 2)
+        records = instrumentation.take_records()
+        assert instrumentation.summary() == []
+
+        # As if the parent process had counted before and now receives the worker's records
+        count("worker.items", 10)
+        instrumentation.merge_records(records)
+        assert [row["name"] for row in instrumentation.summary()] == ["worker.task"]
+        assert instrumentation._recorder.counters["worker.items"] == 15
+
+        # The worker counted before the parent, so its updates come first in the trace however late they arrived
+        instrumentation.export_chrome_trace(str(tmp_path / "trace.json"))
+        with open(tmp_path / "trace.json", encoding="utf-8") as file:
+            events = json.load(file)["traceEvents"]
+        counter_events = sorted((event for event in events if event["ph"] == "C"), key=lambda event: event["ts"])
+        assert [event["args"]["value"] for event in counter_events] == [3, 5, 15]
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
@@ -0,0 +1,57 @@
+import copy
+import numpy as np
+import pytest
+from lineplan import LinePlan
+
+
+def test_duplicate_line_name_is_rejected():
+    line_plan = LinePlan()
+    riser = line_plan.add_riser("A riser", [0.0, 0.0, -7.0])
+    first = line_plan.add_attachment("A1", 0, 0.1)
+    second = line_plan.add_attachment("A2", 1, 0.1)
+    line_plan.add_line("A", first, riser)
+
+    with pytest.raises(ValueError, match="already used"):
+        line_plan.add_line("A", second, riser)
+
+
+def full_recompute(line_plan):
+    """Path lengths of a copy whose caches are rebuilt from scratch"""
+    reference = copy.deepcopy(line_plan)
+    reference.compile()
+    return reference.attachment_path_lengths()
+
+
+def test_set_trim_updates_lines_above(line_plan, counters):
+    path_lengths = line_plan.attachment_path_lengths().copy()
+    line_plan.set_trim("A1m0", 0.05)
+    line_plan.set_trim("A1u5", -0.02)
+
+    updated = line_plan.attachment_path_lengths()
+    assert counters["lineplan.path_length_rebuilds"] == 1
+    np.testing.assert_allclose(updated, full_recompute(line_plan), rtol=0, atol=1e-12)
+    changed = [line_plan.node_names[node] for node in np.asarray(line_plan.attachment_nodes)[updated != path_lengths]]
+    assert sorted(changed) == ["A1a5", "A1a6"]
+
+
+def test_set_riser_offset_updates_its_lines(line_plan, counters):
+    path_lengths = line_plan.attachment_path_lengths().copy()
+    line_plan.set_riser_offset("B-1", 0.1)
+
+    updated = line_plan.attachment_path_lengths()
+    assert counters["lineplan.path_length_rebuilds"] == 1
+    np.testing.assert_allclose(updated, full_recompute(line_plan), rtol=0, atol=1e-12)
+    risers = line_plan.line_riser[line_plan.attachment_lines]
+    riser_name = [line_plan.node_names[line_plan.riser_nodes[riser]] for riser in risers]
+    np.testing.assert_allclose(updated - path_lengths, [0.1 if name == "B-1" else 0.0 for name in riser_name],
+                               atol=1e-12)
+
+
+def test_set_node_positions_matches_full_recompute(line_plan, counters):
+    line_plan.attachment_path_lengths()
+    knot = line_plan.node_names.index("A1k0")
+    lines = line_plan.set_node_positions([knot], [[0.3, 1.5, -4.5]])
+    assert sorted(line_plan.line_names[line] for line in lines) == ["A1m0", "A1u5", "A1u6"]
+    np.testing.assert_allclose(line_plan.attachment_path_lengths(), full_recompute(line_plan), rtol=0, atol=1e-12)
+    # One rebuild for the first lookup, one in the reference copy
+    assert counters["lineplan.path_length_rebuilds"] == 2
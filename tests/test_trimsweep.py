@@ -0,0 +1,56 @@
+import json
+import os
+import instrumentation
+import numpy as np
+import pytest
+from trimsweep import TrimSweep
+
+
+def test_resume_with_changed_inputs_is_refused(glider, line_plan, tmp_path):
+    riser_offsets = {"A1": np.linspace(-0.05, 0.05, 3), "B1": np.linspace(-0.05, 0.05, 3)}
+    sweep = TrimSweep(glider, line_plan, str(tmp_path), riser_offsets, blend_scales=[0.5, 1.0], chunk_size=4)
+    sweep.run(max_workers=1)
+    assert len(sweep.completed_chunks()) == len(sweep.tasks())
+
+    # The same inputs resume, the chunks are kept
+    TrimSweep(glider, line_plan, str(tmp_path), riser_offsets, blend_scales=[0.5, 1.0], chunk_size=4).run(1)
+
+    line_plan.set_trim("A1m0", 0.02)
+    with pytest.raises(ValueError, match="different glider or line plan"):
+        sweep.run(max_workers=1)
+
+    line_plan.set_trim("A1m0", 0.0)
+    glider.twist_law = lambda eta: np.full_like(eta, 2.0)
+    with pytest.raises(ValueError, match="different glider or line plan"):
+        sweep.run(max_workers=1)
+
+
+def test_chunks_match_the_line_plan(glider, line_plan, tmp_path):
+    riser_offsets = {"A-1": np.array([0.0, 0.1]), "B1": np.array([-0.05, 0.05])}
+    sweep = TrimSweep(glider, line_plan, str(tmp_path), riser_offsets, chunk_size=3)
+    sweep.run(max_workers=1)
+
+    parameters, path_lengths = map(np.concatenate, zip(*sweep.iter_results()))
+    assert parameters.shape == (4, 3)
+    for row, (_, a_offset, b_offset) in enumerate(parameters):
+        line_plan.set_riser_offset("A-1", a_offset)
+        line_plan.set_riser_offset("B1", b_offset)
+        np.testing.assert_allclose(path_lengths[row], line_plan.attachment_path_lengths())
+
+
+def test_pool_workers_send_back_their_records(glider, line_plan, tmp_path, counters):
+    riser_offsets = {"A1": np.linspace(-0.05, 0.05, 3), "B1": np.linspace(-0.05, 0.05, 3)}
+    sweep = TrimSweep(glider, line_plan, str(tmp_path / "sweep"), riser_offsets, blend_scales=[0.5, 1.0], chunk_size=4)
+    sweep.run(max_workers=2)
+
+    chunk_spans = [span for span in instrumentation._recorder.spans if span[0] == "trimsweep.run_chunk"]
+    assert len(chunk_spans) == len(sweep.tasks())
+    assert os.getpid() not in {process_id for _, _, _, process_id, _, _ in chunk_spans}
+    assert counters["trimsweep.combinations"] == 2 * 3 * 3
+
+    instrumentation.export_chrome_trace(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json", encoding="utf-8") as file:
+        events = json.load(file)["traceEvents"]
+    totals = [event["args"]["value"] for event in sorted(events, key=lambda event: event["ts"])
+              if event["ph"] == "C" and event["name"] == "trimsweep.combinations"]
+    assert totals == sorted(totals) and totals[-1] == 2 * 3 * 3